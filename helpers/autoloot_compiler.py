@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+autoloot_compiler.py
+
+Compile item lists (or item facet queries) into @alootid2 commands for all
+10 autoloot slots at once, using as few command lines as possible.
+
+Uses the same limits as generateCommands() in js/autoloot.js: per-line item
+limits from getLineLimit (20/15/12/7/6/5) and MAX_CHARS_PER_LINE. Autoloot
+lists are unordered, so instead of filling lines in list order the compiler
+fills each line with the shortest remaining IDs, which packs the most items
+into every line whenever the character limit is what binds.
+
+Spec file format (JSON), one entry per slot:
+    {
+      "1": [501, 502, 503],
+      "2": {"name": "card"},
+      "3": {"name": "ore", "desc": "refine"}
+    }
+Query entries match items whose name/desc contain every given substring
+(case-insensitive). Queries matching more than MAX_ITEMS_PER_SLOT items spill
+into the following unused slots.
+
+USAGE:
+    python autoloot_compiler.py spec.json
+    python autoloot_compiler.py --bench
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ITEMS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_items.json"
+
+# Mirrors AUTOLOOT_CONFIG in js/autoloot.js
+MAX_CHARS_PER_LINE = 255
+MAX_SLOTS = 10
+MAX_ITEMS_PER_SLOT = 100
+COMMANDS_WITH_SLOTS = {"save", "reset", "load", "clear", "add", "remove"}
+
+def get_line_limit(index):
+    """Item limit for the index-th save line (getLineLimit in js/autoloot.js)"""
+    if index == 0:
+        return 20
+    if index == 1:
+        return 15
+    if index == 2:
+        return 12
+    if index < 7:
+        return 7
+    if index < 9:
+        return 6
+    return 5
+
+# ============================================================================
+# PACKING
+# ============================================================================
+
+def pack_lines(ids, prefix):
+    """Split IDs into save lines, fewest lines first (shortest IDs fill each line)"""
+    pending = sorted({int(i) for i in ids}, key=lambda i: (len(str(i)), i))
+    lines = []
+    pos = 0
+    while pos < len(pending):
+        limit = get_line_limit(len(lines))
+        length = len(prefix)
+        chunk = []
+        while pos < len(pending) and len(chunk) < limit:
+            id_str = str(pending[pos])
+            cost = len(id_str) + (1 if chunk else 0)
+            if length + cost > MAX_CHARS_PER_LINE:
+                break
+            chunk.append(id_str)
+            length += cost
+            pos += 1
+        if not chunk:
+            raise ValueError(f"Item ID {pending[pos]} does not fit on a command line")
+        lines.append(chunk)
+    return lines
+
+def generate_commands(slot, ids):
+    """Commands for one slot: reset, packed save lines, load"""
+    if not ids:
+        return []
+    prefix = f"@alootid2 save {slot} "
+    saves = [prefix + " ".join(chunk) for chunk in pack_lines(ids, prefix)]
+    return [f"@alootid2 reset {slot}"] + saves + [f"@alootid2 load {slot}"]
+
+def generate_commands_greedy(slot, ids):
+    """Port of generateCommands() in js/autoloot.js (list order, greedy), for comparison"""
+    if not ids:
+        return []
+    prefix = f"@alootid2 save {slot} "
+    blocks = []
+    chunk = []
+    length = len(prefix)
+    for item_id in ids:
+        id_str = str(item_id)
+        cost = (1 if chunk else 0) + len(id_str)
+        if len(chunk) >= get_line_limit(len(blocks)) or length + cost > MAX_CHARS_PER_LINE:
+            blocks.append(prefix + " ".join(chunk))
+            chunk = []
+            length = len(prefix)
+        chunk.append(id_str)
+        length += len(id_str) if len(chunk) == 1 else 1 + len(id_str)
+    if chunk:
+        blocks.append(prefix + " ".join(chunk))
+    return [f"@alootid2 reset {slot}"] + blocks + [f"@alootid2 load {slot}"]
+
+def parse_aloot_commands(text):
+    """Port of parseAlootCommands() in js/autoloot.js"""
+    ids = set()
+    for line in text.splitlines():
+        line = line.strip()
+        if not line.lower().startswith("@alootid2"):
+            continue
+        parts = line.split()[1:]
+        i = 0
+        while i < len(parts):
+            token = parts[i].lower()
+            if token in COMMANDS_WITH_SLOTS:
+                i += 2  # Skip slot number
+                continue
+            if token.isdigit():
+                ids.add(int(token))
+            i += 1
+    return ids
+
+# ============================================================================
+# SLOT COMPILATION
+# ============================================================================
+
+def match_query(items, query):
+    """Item IDs whose fields contain every substring in the query"""
+    needles = {field: str(value).lower() for field, value in query.items()}
+    matches = []
+    for item_id, item in items.items():
+        if all(needle in str(item.get(field, "")).lower() for field, needle in needles.items()):
+            matches.append(int(item_id))
+    return sorted(matches)
+
+def resolve_spec(spec, items):
+    """Spec dict -> {slot: [ids]}, spilling oversized entries into unused slots"""
+    requested = {int(slot): entry for slot, entry in spec.items()}
+    for slot in requested:
+        if not 1 <= slot <= MAX_SLOTS:
+            raise ValueError(f"Slot {slot} out of range 1-{MAX_SLOTS}")
+
+    free = [s for s in range(1, MAX_SLOTS + 1) if s not in requested]
+    slots = {}
+    for slot in sorted(requested):
+        entry = requested[slot]
+        ids = match_query(items, entry) if isinstance(entry, dict) else sorted({int(i) for i in entry})
+
+        chunks = [ids[i:i + MAX_ITEMS_PER_SLOT] for i in range(0, len(ids), MAX_ITEMS_PER_SLOT)] or [[]]
+        slots[slot] = chunks[0]
+        for n, chunk in enumerate(chunks[1:], start=1):
+            if not free:
+                dropped = sum(len(c) for c in chunks[n:])
+                print(f"⚠️  Slot {slot}: {len(ids)} items, no free slots left - {dropped} items dropped")
+                break
+            spill = free.pop(0)
+            print(f"→ Slot {slot}: overflow continues in slot {spill}")
+            slots[spill] = chunk
+    return dict(sorted(slots.items()))
+
+def compile_slots(slots):
+    """{slot: [ids]} -> {slot: [commands]}; verifies each slot round-trips"""
+    compiled = {}
+    for slot, ids in slots.items():
+        commands = generate_commands(slot, ids)
+        if parse_aloot_commands("\n".join(commands)) != set(ids):
+            raise AssertionError(f"Slot {slot} commands do not round-trip")
+        compiled[slot] = commands
+    return compiled
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def run_benchmark():
+    random.seed(42)
+    print("\nAutoloot packing benchmark (save lines, optimal vs in-order greedy)")
+    print(f"  {'ids':>6} {'id digits':>10} {'greedy':>8} {'optimal':>8} {'time':>10}")
+
+    for count in (100, 1000, 5000, 20000):
+        for label, low, high in (("3-5", 100, 99999), ("5-7", 10000, 9999999)):
+            ids = random.sample(range(low, high), count)
+            greedy = len(generate_commands_greedy(1, ids)) - 2
+
+            start = time.perf_counter()
+            commands = generate_commands(1, ids)
+            elapsed = time.perf_counter() - start
+
+            assert parse_aloot_commands("\n".join(commands)) == set(ids)
+            print(f"  {count:>6} {label:>10} {greedy:>8} {len(commands) - 2:>8} {elapsed * 1000:>8.2f}ms")
+
+    # Full 10-slot batch from a real item list
+    if ITEMS_FILE.exists():
+        with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        all_ids = sorted(int(i) for i in items)
+        slots = {s: all_ids[(s - 1) * MAX_ITEMS_PER_SLOT:s * MAX_ITEMS_PER_SLOT] for s in range(1, MAX_SLOTS + 1)}
+        start = time.perf_counter()
+        compiled = compile_slots(slots)
+        elapsed = time.perf_counter() - start
+        total = sum(len(c) for c in compiled.values())
+        print(f"\n  10 slots x {MAX_ITEMS_PER_SLOT} items: {total} commands in {elapsed * 1000:.2f}ms (round-trip verified)\n")
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile @alootid2 commands for all slots")
+    parser.add_argument("spec", nargs="?", help="Slot spec JSON file")
+    parser.add_argument("--bench", action="store_true", help="Run the packing benchmark")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark()
+        return
+    if not args.spec:
+        parser.print_help()
+        sys.exit(2)
+
+    with open(args.spec, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+
+    items = {}
+    if any(isinstance(entry, dict) for entry in spec.values()):
+        with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+            items = json.load(f)
+
+    slots = resolve_spec(spec, items)
+    compiled = compile_slots(slots)
+
+    greedy_total = 0
+    for slot, commands in compiled.items():
+        greedy_total += len(generate_commands_greedy(slot, slots[slot]))
+        print(f"# Slot {slot}: {len(slots[slot])} items, {len(commands)} commands")
+        for command in commands:
+            print(command)
+        print()
+
+    total = sum(len(c) for c in compiled.values())
+    print(f"✓ {total} commands across {len(compiled)} slots (in-order greedy: {greedy_total})")
+
+if __name__ == "__main__":
+    main()
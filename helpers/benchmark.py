@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+benchmark.py
+
+Benchmark suite for the build helpers, on synthetic data at multiples of
+today's size (item, icon and quest/shop counts are read from data/).
+
+Generators (deterministic, seeded):
+    - itemInfo Lub/Lua files in the client format both converters parse
+    - item icon sets: pink-keyed 8-bit BMPs and 24x24 RGBA PNGs
+    - quest/shop graphs in the osromr_quests.json / osromr_shops.json format
+Generated inputs are cached in helpers/.bench_data/ per scale.
+
+Each stage runs in a fresh process, so its peak memory (max RSS growth over
+the interpreter + imports) isn't skewed by earlier stages. Results are
+compared with helpers/benchmark_baseline.json (written by --save-baseline);
+a stage fails when wall time or peak memory grows more than --threshold.
+
+Stages:
+    iteminfo_mrhr   convert_iteminfo-mrhr.py   convert_lub_to_json + dump
+    iteminfo_revo   convert_iteminfo-revo.py   convert_lua_to_json + dump
+    search_index    generate_search_index.py   name/desc indices + dump
+    quest_index     generate_quest_search_index.py
+    quest_solver    quest_solver.py            build matrix + evaluate inventory
+    bmp_to_png      convert_bmp_to_png.py      per-pixel keying + PNG save
+    sprite          generate_sprite.py         full sprite sheet + map
+
+Icon stages are limited to 10x (100x would be a 1.7 GB sprite canvas).
+
+USAGE:
+    python benchmark.py                         # all stages at 1x
+    python benchmark.py --scales 1,10,100 --stages search_index,quest_index
+    python benchmark.py --save-baseline         # record results as the baseline
+    python benchmark.py --threshold 0.25 --repeat 3
+"""
+
+import io
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import importlib.util
+from pathlib import Path
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: peak memory not measured
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR / ".." / "data"
+WORK_DIR = SCRIPT_DIR / ".bench_data"
+BASELINE_FILE = SCRIPT_DIR / "benchmark_baseline.json"
+
+GENERATOR_VERSION = 1
+SEED = 1234
+DEFAULT_THRESHOLD = 0.20
+
+# Below these, differences are noise rather than regressions
+MIN_WALL_DELTA = 0.05   # seconds
+MIN_MEM_DELTA = 5.0     # MB
+
+# Fallback sizes if data/ is not available
+DEFAULT_SIZES = {"items": 17911, "icons": 7677, "quests": 557, "shops": 622}
+
+# ============================================================================
+# BASE SIZES
+# ============================================================================
+
+def count_entries(path, list_key):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return sum(len(sub.get(list_key, [])) for group in data.get("groups", []) for sub in group.get("subgroups", []))
+
+def base_sizes():
+    """Today's item, icon, quest and shop counts"""
+    sizes = dict(DEFAULT_SIZES)
+    try:
+        with open(DATA_DIR / "osromr_items.json", "r", encoding="utf-8") as f:
+            sizes["items"] = len(json.load(f))
+        with open(DATA_DIR / "osromr_item_icons.json", "r", encoding="utf-8") as f:
+            sizes["icons"] = len(json.load(f))
+        sizes["quests"] = count_entries(DATA_DIR / "osromr_quests.json", "quests")
+        sizes["shops"] = count_entries(DATA_DIR / "osromr_shops.json", "shops")
+    except (OSError, ValueError):
+        pass
+    return sizes
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+SYLLABLES = ["ra", "ko", "mi", "zen", "tor", "el", "va", "run", "dra", "sil", "gan", "po", "tion",
+             "her", "ba", "lis", "cro", "wn", "ar", "mor", "bow", "ki", "sha", "dow", "ner", "qui"]
+COLORS = ["0000FF", "009900", "777777", "FF0000", "FFFFFF", "CC00CC", "FF9900"]
+CLASSES = ["Restorative", "Weapon", "Armor", "Card", "Headgear", "Etc", "Usable", "Costume"]
+REQ_TYPES = ["item"] * 7 + ["zeny", "gold", "credit", "activity_points", "vote_points"]
+
+def make_word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+
+def gen_items(count, seed=SEED):
+    """{id: {name, desc, slot?, res}} with realistic name/description shapes"""
+    rng = random.Random(seed)
+    vocab = [make_word(rng) for _ in range(max(500, count // 4))]
+    items = {}
+    item_id = 500
+    for _ in range(count):
+        item_id += rng.randint(1, 3)
+        name = " ".join(rng.choice(vocab).capitalize() for _ in range(rng.randint(1, 3)))
+        lines = [" ".join(rng.choice(vocab) for _ in range(rng.randint(4, 12))).capitalize() + "."
+                 for _ in range(rng.randint(1, 4))]
+        lines.append("^FFFFFF_^000000")
+        lines.append(f"Class:^{rng.choice(COLORS)} {rng.choice(CLASSES)}^000000")
+        for _ in range(rng.randint(0, 3)):
+            lines.append(f"{rng.choice(vocab).capitalize()}:^{rng.choice(COLORS)} +{rng.randint(1, 99)}%^000000")
+        lines.append(f"Weight:^009900 {rng.randint(1, 300)}^000000")
+        item = {"name": name, "desc": "\n".join(lines), "res": f"res_{item_id}"}
+        if rng.random() < 0.3:
+            item["slot"] = rng.randint(1, 4)
+        items[item_id] = item
+    return items
+
+def render_iteminfo(items):
+    """Client itemInfo table text for gen_items() output"""
+    out = ["tbl = {"]
+    for item_id, item in items.items():
+        desc = ",\n".join(f'\t\t\t"{line}"' for line in item["desc"].split("\n"))
+        out.append(
+            f"\t[{item_id}] = {{\n"
+            f'\t\tunidentifiedDisplayName = "{item["name"]}",\n'
+            f'\t\tunidentifiedResourceName = "{item["res"]}",\n'
+            f"\t\tunidentifiedDescriptionName = {{\n"
+            f'\t\t\t"Unknown item, can be identified by using a ^6666CCMagnifier^000000."\n'
+            f"\t\t}},\n"
+            f'\t\tidentifiedDisplayName = "{item["name"]}",\n'
+            f'\t\tidentifiedResourceName = "{item["res"]}",\n'
+            f"\t\tidentifiedDescriptionName = {{\n{desc}\n\t\t}},\n"
+            f"\t\tslotCount = {item.get('slot', 0)},\n"
+            f"\t\tClassNum = 0,\n"
+            f"\t\tcostume = false\n"
+            f"\t}},"
+        )
+    out.append("}")
+    return "\n".join(out) + "\n"
+
+def gen_entries(count, list_key, item_ids, seed):
+    """Quest/shop data with count entries, spread over groups and subgroups"""
+    rng = random.Random(seed)
+    groups = []
+    remaining = count
+    while remaining > 0:
+        subgroups = []
+        for _ in range(rng.randint(2, 8)):
+            n = min(remaining, rng.randint(5, 60))
+            remaining -= n
+            entries = []
+            for _ in range(n):
+                requirements = []
+                for _ in range(rng.randint(1, 8)):
+                    req_type = rng.choice(REQ_TYPES)
+                    req = {"type": req_type, "amount": rng.randint(1, 100)}
+                    if req_type == "item":
+                        req["id"] = rng.choice(item_ids)
+                    requirements.append(req)
+                entries.append({
+                    "name": make_word(rng).capitalize(),
+                    "producesId": rng.choice(item_ids),
+                    "successRate": 100,
+                    "description": "",
+                    "accountBound": rng.random() < 0.2,
+                    "requirements": requirements,
+                })
+            subgroups.append({"name": make_word(rng).capitalize(), list_key: entries})
+            if remaining <= 0:
+                break
+        groups.append({"name": make_word(rng).capitalize(), "subgroups": subgroups})
+    return {"groups": groups}
+
+def gen_icon(rng, mode):
+    """24x24 icon: pink background (BMP) or transparent background (PNG)"""
+    from PIL import Image, ImageDraw
+    background = (255, 0, 255) if mode == "bmp" else (0, 0, 0, 0)
+    img = Image.new("RGB" if mode == "bmp" else "RGBA", (24, 24), background)
+    draw = ImageDraw.Draw(img)
+    for _ in range(rng.randint(2, 5)):
+        x0, y0 = rng.randint(0, 16), rng.randint(0, 16)
+        color = tuple(rng.randint(0, 254) for _ in range(3))
+        draw.ellipse((x0, y0, x0 + rng.randint(4, 8), y0 + rng.randint(4, 8)),
+                     fill=color if mode == "bmp" else color + (255,))
+    if mode == "bmp":
+        img = img.quantize(colors=64)  # 8-bit palette, like client BMPs
+    return img
+
+def prepare(scale, sizes, kinds):
+    """Generate (or reuse) synthetic inputs for a scale; returns the scale dir"""
+    root = WORK_DIR / f"v{GENERATOR_VERSION}_x{scale}"
+    root.mkdir(parents=True, exist_ok=True)
+    n_items = sizes["items"] * scale
+    items = None
+
+    def get_items():
+        nonlocal items
+        if items is None:
+            items = gen_items(n_items)
+        return items
+
+    if "iteminfo" in kinds and not (root / "itemInfo_EN.lub").exists():
+        print(f"  generating itemInfo ({n_items} items)...")
+        (root / "itemInfo_EN.lub").write_text(render_iteminfo(get_items()), encoding="utf-8")
+
+    if "items" in kinds and not (root / "items.json").exists():
+        data = {str(i): {k: v for k, v in item.items() if k != "res"} for i, item in get_items().items()}
+        with open(root / "items.json", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    if "quests" in kinds and not (root / "quests.json").exists():
+        print(f"  generating quests/shops ({sizes['quests'] * scale}/{sizes['shops'] * scale})...")
+        ids = list(get_items())
+        for name, list_key, seed in (("quests", "quests", SEED + 1), ("shops", "shops", SEED + 2)):
+            data = gen_entries(sizes[name] * scale, list_key, ids, seed)
+            with open(root / f"{name}.json", "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+    n_icons = sizes["icons"] * scale
+    for mode, dirname in (("bmp", "item"), ("png", "item_png_src")):
+        if mode not in kinds:
+            continue
+        icon_dir = root / dirname
+        marker = icon_dir / ".complete"
+        if marker.exists():
+            continue
+        print(f"  generating {n_icons} {mode.upper()} icons...")
+        if icon_dir.exists():
+            shutil.rmtree(icon_dir)
+        icon_dir.mkdir()
+        rng = random.Random(SEED + 3)
+        for item_id, item in list(get_items().items())[:n_icons]:
+            img = gen_icon(rng, mode)
+            if mode == "bmp":
+                img.save(icon_dir / f"{item['res']}.bmp")
+            else:
+                img.save(icon_dir / f"{item_id}.png")
+        marker.touch()
+
+    return root
+
+# ============================================================================
+# STAGES (run inside a fresh worker process)
+# ============================================================================
+
+def load_helper(filename):
+    """Import a helper script by file name (some contain hyphens)"""
+    path = SCRIPT_DIR / filename
+    spec = importlib.util.spec_from_file_location(path.stem.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def stage_iteminfo_mrhr(root, out):
+    module = load_helper("convert_iteminfo-mrhr.py")
+    text = (root / "itemInfo_EN.lub").read_text(encoding="utf-8")
+    items = module.convert_lub_to_json(text)
+    items = dict(sorted(items.items(), key=lambda kv: int(kv[0])))
+    with open(out / "items.json", "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False, indent=2)
+    return len(items)
+
+def stage_iteminfo_revo(root, out):
+    module = load_helper("convert_iteminfo-revo.py")
+    text = (root / "itemInfo_EN.lub").read_text(encoding="utf-8")
+    items = module.convert_lua_to_json(text)
+    items = dict(sorted(items.items(), key=lambda kv: int(kv[0])))
+    with open(out / "items.json", "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False, indent=2)
+    return len(items)
+
+def stage_search_index(root, out):
+    import generate_search_index as module
+    with open(root / "items.json", "r", encoding="utf-8") as f:
+        items = json.load(f)
+    for name, build in (("name", module.build_name_index), ("desc", module.build_desc_index)):
+        with open(out / f"index_{name}.json", "w", encoding="utf-8") as f:
+            json.dump(build(items), f, separators=(',', ':'))
+    return len(items)
+
+def stage_quest_index(root, out):
+    from generate_quest_search_index import build_entry_index, source_hash
+    with open(root / "items.json", "r", encoding="utf-8") as f:
+        items = json.load(f)
+    total = 0
+    for name in ("quests", "shops"):
+        raw = (root / f"{name}.json").read_bytes()
+        index = build_entry_index(json.loads(raw), name, items, source_hash(raw))
+        total += len(index["entries"])
+        with open(out / f"index_{name}.json", "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(',', ':'))
+    return total
+
+def stage_quest_solver(root, out):
+    from quest_solver import QuestSolver
+    with open(root / "quests.json", "r", encoding="utf-8") as f:
+        quests = json.load(f)
+    with open(root / "shops.json", "r", encoding="utf-8") as f:
+        shops = json.load(f)
+    solver = QuestSolver(quests, shops)
+    rng = random.Random(SEED)
+    inventory = {key: rng.randint(0, 150) for key in solver.columns}
+    solver.set_inventory(inventory)
+    solver.completable()
+    solver.nearest(50)
+    for _ in range(100):
+        solver.update({rng.choice(solver.columns): rng.randint(0, 150)})
+    return len(solver.entries)
+
+def stage_bmp_to_png(root, out):
+    module = load_helper("convert_bmp_to_png.py")
+    text = (root / "itemInfo_EN.lub").read_text(encoding="utf-8")
+    mappings = module.extract_resource_mappings(text)
+    bmp_lookup = {f.stem.lower(): f for f in (root / "item").glob("*.bmp")}
+    converted = 0
+    for item_id, (identified, unidentified) in sorted(mappings.items()):
+        bmp_path = bmp_lookup.get((identified or "").lower()) or bmp_lookup.get((unidentified or "").lower())
+        if bmp_path and module.convert_bmp_to_png(bmp_path, out / f"{item_id}.png"):
+            converted += 1
+    return converted
+
+def stage_sprite(root, out):
+    import generate_sprite as module
+    module.INPUT_DIR = root / "item_png_src"
+    module.OUTPUT_SPRITE = out / "item_sprite.png"
+    module.OUTPUT_MAP = out / "sprite_map.json"
+    with redirect_stdout(io.StringIO()):
+        module.generate_sprite_sheet()
+    with open(module.OUTPUT_MAP, "r", encoding="utf-8") as f:
+        return json.load(f)["totalIcons"]
+
+# name -> (function, unit, input kinds, max scale)
+STAGES = {
+    "iteminfo_mrhr": (stage_iteminfo_mrhr, "items", {"iteminfo"}, 100),
+    "iteminfo_revo": (stage_iteminfo_revo, "items", {"iteminfo"}, 100),
+    "search_index": (stage_search_index, "items", {"items"}, 100),
+    "quest_index": (stage_quest_index, "entries", {"items", "quests"}, 100),
+    "quest_solver": (stage_quest_solver, "entries", {"quests"}, 100),
+    "bmp_to_png": (stage_bmp_to_png, "icons", {"iteminfo", "bmp"}, 10),
+    "sprite": (stage_sprite, "icons", {"png"}, 10),
+}
+
+def proc_status_mb(field):
+    """VmRSS / VmHWM from /proc/self/status in MB, or None off Linux"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def reset_peak_rss():
+    """Reset the peak RSS high-water mark (Linux); returns the current RSS in MB"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+    return proc_status_mb("VmRSS")
+
+def peak_rss_mb():
+    peak = proc_status_mb("VmHWM")
+    if peak is not None or resource is None:
+        return peak
+    # ru_maxrss is KB on Linux, bytes on macOS (and survives exec, so it can
+    # include the parent's peak; only a fallback)
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+def measure(stage, root):
+    """Worker entry point: run one stage, return wall time, units and peak memory"""
+    sys.path.insert(0, str(SCRIPT_DIR))
+    import PIL.Image  # noqa: F401  Import cost is not part of any stage
+    out = Path(root) / f"out_{stage}"
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir()
+
+    func = STAGES[stage][0]
+    before = reset_peak_rss()
+    if before is None:
+        before = peak_rss_mb()
+    start = time.perf_counter()
+    units = func(Path(root), out)
+    wall = time.perf_counter() - start
+    after = peak_rss_mb()
+
+    shutil.rmtree(out, ignore_errors=True)
+    return {
+        "wall": wall,
+        "units": units,
+        "throughput": units / wall if wall else 0.0,
+        "peak_mb": None if before is None else after - before,
+    }
+
+# ============================================================================
+# RUN / COMPARE
+# ============================================================================
+
+def compare(result, base, threshold):
+    """List of regression descriptions (empty if within threshold)"""
+    problems = []
+    if not base:
+        return problems
+    if result["wall"] > base["wall"] * (1 + threshold) and result["wall"] - base["wall"] > MIN_WALL_DELTA:
+        problems.append(f"wall {result['wall']:.2f}s vs {base['wall']:.2f}s")
+    if (result["peak_mb"] is not None and base.get("peak_mb") is not None
+            and result["peak_mb"] > base["peak_mb"] * (1 + threshold)
+            and result["peak_mb"] - base["peak_mb"] > MIN_MEM_DELTA):
+        problems.append(f"memory {result['peak_mb']:.0f}MB vs {base['peak_mb']:.0f}MB")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark helper stages on synthetic data")
+    parser.add_argument("--scales", default="1", help="Comma-separated size multipliers (e.g. 1,10,100)")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stage names")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage (best wall time is kept)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown/growth vs baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--out", default=None, help="Also write results JSON here")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",")]
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        print(f"Unknown stages: {', '.join(unknown)} (available: {', '.join(STAGES)})")
+        sys.exit(2)
+
+    baseline = {}
+    if BASELINE_FILE.exists():
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    sizes = base_sizes()
+    print(f"\nBase sizes: {sizes['items']} items, {sizes['icons']} icons, "
+          f"{sizes['quests']} quests, {sizes['shops']} shops")
+
+    results = {}
+    failures = []
+    context = get_context("spawn")
+    header = f"  {'stage':<15} {'scale':>5} {'size':>9} {'wall':>9} {'throughput':>14} {'peak':>8}  {'baseline':>9}  status"
+
+    for scale in scales:
+        runnable = [s for s in stages if scale <= STAGES[s][3]]
+        skipped = [s for s in stages if s not in runnable]
+        kinds = set().union(*(STAGES[s][2] for s in runnable)) if runnable else set()
+        print(f"\nScale {scale}x")
+        root = prepare(scale, sizes, kinds)
+        print(header)
+
+        for stage in runnable:
+            runs = []
+            for _ in range(args.repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    runs.append(pool.submit(measure, stage, str(root)).result())
+            result = min(runs, key=lambda r: r["wall"])
+            peaks = [r["peak_mb"] for r in runs if r["peak_mb"] is not None]
+            result["peak_mb"] = max(peaks) if peaks else None
+
+            key = f"{stage}@{scale}"
+            results[key] = result
+            base = baseline.get(key)
+            problems = compare(result, base, args.threshold)
+            if problems:
+                failures.append(f"{key}: {', '.join(problems)}")
+
+            unit = STAGES[stage][1]
+            peak = f"{result['peak_mb']:.0f}MB" if result["peak_mb"] is not None else "n/a"
+            base_text = f"{base['wall']:.2f}s" if base else "-"
+            status = "❌ " + "; ".join(problems) if problems else ("✓" if base else "new")
+            print(f"  {stage:<15} {scale:>4}x {result['units']:>9} {result['wall']:>8.2f}s "
+                  f"{result['throughput']:>8.0f} {unit:<5} {peak:>8}  {base_text:>9}  {status}")
+
+        for stage in skipped:
+            print(f"  {stage:<15} {scale:>4}x  skipped (max {STAGES[stage][3]}x)")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\n✓ Baseline saved to {BASELINE_FILE.name} ({len(results)} results)")
+
+    if failures:
+        print(f"\n❌ {len(failures)} regression(s) beyond {args.threshold:.0%}:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print()
+
+if __name__ == "__main__":
+    main()
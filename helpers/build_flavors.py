@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+build_flavors.py
+
+Build several server flavors (Midrate, Lowrate, Highrate) concurrently from
+their itemInfo files, sharing one content-addressed icon cache.
+
+For each flavor this produces what the single-flavor helpers do today:
+items JSON (convert_iteminfo-*), new item IDs, search indices
+(generate_search_index), per-ID PNG icons (convert_bmp_to_png), the icon
+list (generate_item_icons) and the sprite sheet + map (generate_sprite).
+
+Icons are keyed by the SHA-256 of their source file. Every distinct source
+image is decoded, keyed and fitted to a sprite cell exactly once per cache
+lifetime, no matter how many flavors (or builds) use it; flavor sprites are
+assembled from the cached cells.
+
+INPUT LAYOUT (per flavor, see FLAVORS):
+    helpers/flavors/<Flavor>/itemInfo...     itemInfo Lua/Lub file
+    helpers/flavors/<Flavor>/item/*.bmp      BMP icons (optional; falls back to
+                                             the flavor's existing PNG icon dir)
+
+USAGE:
+    python build_flavors.py [Midrate Lowrate Highrate] [--workers N]
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import importlib.util
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from convert_bmp_to_png import extract_resource_mappings, convert_bmp_to_png
+from generate_search_index import build_name_index, build_desc_index
+from generate_sprite import ICON_SIZE, ICONS_PER_ROW, fit_icon, paste_icon
+from instrument import span, setup_profiling
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = SCRIPT_DIR / ".."
+DATA_DIR = ROOT_DIR / "data"
+IMAGE_DIR = ROOT_DIR / "image"
+FLAVOR_DIR = SCRIPT_DIR / "flavors"
+CACHE_DIR = SCRIPT_DIR / ".icon_cache"
+
+# Bump when keying/fitting changes so stale cells are not reused
+CACHE_VERSION = 1
+
+FLAVORS = {
+    "Midrate": {
+        "prefix": "osromr",
+        "converter": "convert_iteminfo-mrhr.py",
+        "iteminfo": "itemInfo_EN.lub",
+        "icon_dir": IMAGE_DIR / "item",
+        "sprite": IMAGE_DIR / "item_sprite.png",
+    },
+    "Lowrate": {
+        "prefix": "osrolr",
+        "converter": "convert_iteminfo-revo.py",
+        "iteminfo": "itemInfo.lua",
+        "icon_dir": IMAGE_DIR / "item_lr",
+        "sprite": IMAGE_DIR / "osrolr_item_sprite.png",
+    },
+    "Highrate": {
+        "prefix": "osrohr",
+        "converter": "convert_iteminfo-mrhr.py",
+        "iteminfo": "itemInfo_EN.lub",
+        "icon_dir": IMAGE_DIR / "item_hr",
+        "sprite": IMAGE_DIR / "osrohr_item_sprite.png",
+    },
+}
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def load_converter(filename):
+    """Import a convert_iteminfo-*.py script (hyphenated names need importlib)."""
+    spec = importlib.util.spec_from_file_location(filename.replace("-", "_")[:-3], SCRIPT_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, "convert_lub_to_json", None) or getattr(module, "convert_lua_to_json")
+
+def read_iteminfo(path):
+    for encoding in ["cp949", "utf-8", "latin-1"]:
+        try:
+            with open(path, "r", encoding=encoding) as f:
+                return f.read()
+        except UnicodeDecodeError:
+            continue
+    return None
+
+def file_hash(path):
+    digest = hashlib.sha256(f"v{CACHE_VERSION}:{ICON_SIZE}:".encode())
+    digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def cached_png(key):
+    return CACHE_DIR / key[:2] / f"{key}.png"
+
+def cached_cell(key):
+    return CACHE_DIR / key[:2] / f"{key}.rgba"
+
+def write_atomic(path, data):
+    """Write bytes via a temp file so concurrent builds never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+# ============================================================================
+# STAGE 1: PARSE (per flavor)
+# ============================================================================
+
+def parse_flavor(name):
+    """Parse a flavor's itemInfo and resolve each item's icon source file."""
+    config = FLAVORS[name]
+    flavor_dir = FLAVOR_DIR / name
+    text = read_iteminfo(flavor_dir / config["iteminfo"])
+    if text is None:
+        return name, None, {}, "could not decode itemInfo"
+
+    items = load_converter(config["converter"])(text)
+    items = dict(sorted(items.items(), key=lambda kv: int(kv[0])))
+
+    sources = {}
+    bmp_dir = flavor_dir / "item"
+    if bmp_dir.exists():
+        # Same lookup as convert_bmp_to_png.py: identified first, case-insensitive
+        bmp_lookup = {f.stem.lower(): f for f in bmp_dir.glob("*.bmp")}
+        for item_id, (identified, unidentified) in extract_resource_mappings(text).items():
+            for res in (identified, unidentified):
+                if res and res.lower() in bmp_lookup:
+                    sources[item_id] = str(bmp_lookup[res.lower()])
+                    break
+    elif config["icon_dir"].exists():
+        for file in config["icon_dir"].iterdir():
+            if file.suffix == ".png" and file.stem.isdigit():
+                sources[int(file.stem)] = str(file)
+
+    return name, items, sources, None
+
+# ============================================================================
+# STAGE 2: ICON CACHE (shared)
+# ============================================================================
+
+def build_cache_entry(task):
+    """Decode one source image into a keyed PNG and a fitted RGBA sprite cell."""
+    key, source = task
+    source = Path(source)
+    png_path = cached_png(key)
+    png_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if source.suffix.lower() == ".bmp":
+        tmp = png_path.with_name(f"{key}.{os.getpid()}.tmp.png")
+        if not convert_bmp_to_png(source, tmp):
+            return key, False
+        tmp.replace(png_path)
+    else:
+        write_atomic(png_path, source.read_bytes())
+
+    # Cell exactly as generate_sprite.py would paste it onto a blank sheet
+    cell = Image.new("RGBA", (ICON_SIZE, ICON_SIZE), (0, 0, 0, 0))
+    paste_icon(cell, fit_icon(Image.open(png_path)), 0, 0)
+    write_atomic(cached_cell(key), cell.tobytes())
+    return key, True
+
+# ============================================================================
+# STAGE 3: OUTPUT (per flavor)
+# ============================================================================
+
+def write_flavor(task):
+    """Write all artifacts for one flavor from parsed items and cached icons."""
+    name, items, icon_keys = task
+    config = FLAVORS[name]
+    prefix = config["prefix"]
+    icon_keys = {int(k): v for k, v in icon_keys.items()}
+
+    items_file = DATA_DIR / f"{prefix}_items.json"
+    existing_ids = set()
+    if items_file.exists():
+        with open(items_file, "r", encoding="utf-8") as f:
+            existing_ids = set(json.load(f).keys())
+    new_ids = sorted(int(i) for i in items if i not in existing_ids)
+
+    with open(items_file, "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False, indent=2)
+    with open(DATA_DIR / f"{prefix}_items_new.json", "w", encoding="utf-8") as f:
+        json.dump(new_ids, f, separators=(',', ':'))
+    with open(DATA_DIR / f"{prefix}_search_index_name.json", "w", encoding="utf-8") as f:
+        json.dump(build_name_index(items), f, separators=(',', ':'))
+    with open(DATA_DIR / f"{prefix}_search_index_desc.json", "w", encoding="utf-8") as f:
+        json.dump(build_desc_index(items), f, separators=(',', ':'))
+
+    # Per-ID PNG icons (skip when the icon dir is itself the source)
+    icon_dir = config["icon_dir"]
+    icon_dir.mkdir(parents=True, exist_ok=True)
+    for item_id, key in icon_keys.items():
+        target = icon_dir / f"{item_id}.png"
+        if not target.exists() or target.read_bytes() != cached_png(key).read_bytes():
+            shutil.copyfile(cached_png(key), target)
+
+    icon_ids = sorted(icon_keys)
+    with open(DATA_DIR / f"{prefix}_item_icons.json", "w", encoding="utf-8") as f:
+        json.dump(icon_ids, f, separators=(',', ':'))
+
+    # Sprite sheet assembled from cached cells (same layout as generate_sprite.py)
+    rows_needed = (len(icon_ids) + ICONS_PER_ROW - 1) // ICONS_PER_ROW
+    sprite_width = ICONS_PER_ROW * ICON_SIZE
+    sprite_height = rows_needed * ICON_SIZE
+    sprite = Image.new("RGBA", (sprite_width, sprite_height), (0, 0, 0, 0))
+    sprite_map = {}
+    for idx, item_id in enumerate(icon_ids):
+        col, row = idx % ICONS_PER_ROW, idx // ICONS_PER_ROW
+        cell = Image.frombytes("RGBA", (ICON_SIZE, ICON_SIZE), cached_cell(icon_keys[item_id]).read_bytes())
+        sprite.paste(cell, (col * ICON_SIZE, row * ICON_SIZE))
+        sprite_map[str(item_id)] = [col, row]
+
+    if icon_ids:
+        config["sprite"].parent.mkdir(parents=True, exist_ok=True)
+        sprite.save(config["sprite"], "PNG", optimize=True)
+    with open(DATA_DIR / f"{prefix}_sprite_map.json", "w") as f:
+        json.dump({
+            "version": 1,
+            "iconSize": ICON_SIZE,
+            "iconsPerRow": ICONS_PER_ROW,
+            "totalIcons": len(icon_ids),
+            "spriteWidth": sprite_width,
+            "spriteHeight": sprite_height,
+            "map": sprite_map,
+        }, f, separators=(',', ':'))
+
+    return name, len(items), len(new_ids), len(icon_ids)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Build several server flavors with a shared icon cache")
+    parser.add_argument("flavors", nargs="*", default=list(FLAVORS), help="Flavors to build")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
+
+    unknown = [f for f in args.flavors if f not in FLAVORS]
+    if unknown:
+        print(f"❌ Unknown flavor(s): {', '.join(unknown)} (expected {', '.join(FLAVORS)})")
+        sys.exit(2)
+
+    selected = []
+    for name in args.flavors:
+        iteminfo = FLAVOR_DIR / name / FLAVORS[name]["iteminfo"]
+        if iteminfo.exists():
+            selected.append(name)
+        else:
+            print(f"⚠️  {name}: {iteminfo} not found - skipping")
+    if not selected:
+        print("❌ Nothing to build")
+        sys.exit(1)
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Stage 1: parse every flavor concurrently
+        print(f"\n🔍 Parsing {len(selected)} flavor(s): {', '.join(selected)}")
+        with span("parse"):
+            parsed = {}
+            for name, items, sources, error in pool.map(parse_flavor, selected):
+                if error:
+                    print(f"❌ {name}: {error}")
+                    continue
+                parsed[name] = (items, sources)
+                print(f"   ✅ {name}: {len(items)} items, {len(sources)} icon sources")
+
+        # Stage 2: hash sources, decode each distinct image once
+        with span("hash"):
+            source_keys = {}
+            for _, sources in parsed.values():
+                for source in sources.values():
+                    if source not in source_keys:
+                        source_keys[source] = file_hash(Path(source))
+
+        unique = {}
+        for source, key in source_keys.items():
+            unique.setdefault(key, source)
+        missing = [(key, source) for key, source in unique.items() if not cached_cell(key).exists()]
+
+        print(f"\n🧊 Icon cache: {len(source_keys)} sources, {len(unique)} distinct, "
+              f"{len(unique) - len(missing)} cached, {len(missing)} to decode")
+        with span("decode"):
+            failed = set()
+            for key, ok in pool.map(build_cache_entry, missing, chunksize=64):
+                if not ok:
+                    failed.add(key)
+        if failed:
+            print(f"   ⚠️  {len(failed)} icons failed to convert")
+
+        # Stage 3: write every flavor's artifacts concurrently
+        print("\n💾 Writing flavor artifacts...")
+        tasks = []
+        for name, (items, sources) in parsed.items():
+            icon_keys = {item_id: source_keys[src] for item_id, src in sources.items()
+                         if source_keys[src] not in failed}
+            tasks.append((name, items, icon_keys))
+        with span("write"):
+            for name, item_count, new_count, icon_count in pool.map(write_flavor, tasks):
+                print(f"   ✅ {name} ({FLAVORS[name]['prefix']}): {item_count} items, "
+                      f"{new_count} new, {icon_count} icons")
+
+    print("\n🎉 Done\n")
+
+if __name__ == "__main__":
+    setup_profiling("build_flavors")
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+bundle_data.py
+
+Pack every dataset initializeData() fetches at startup into a single
+versioned container, so a cold start is one request instead of eight.
+
+Container layout (little-endian):
+    magic          4s   b"OSRB"
+    formatVersion  u16
+    reserved       u16
+    dataVersion    u32  VERSION from js/config.js
+    headerLength   u32
+    header         JSON (utf-8), {"sections": [...]}
+    payload        section bytes, back to back
+
+Each header section is:
+    {"key", "source", "offset", "length", "rawLength", "compression", "hash"}
+with offset relative to the start of the payload. Compression is per section
+("none", "gzip" or "br"; brotli needs the 'brotli' package).
+
+USAGE:
+    python bundle_data.py build [gzip|br|none]
+    python bundle_data.py verify
+"""
+
+import sys
+import gzip
+import json
+import zlib
+import struct
+import hashlib
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from publish_data import read_config
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR / ".." / "data"
+OUTPUT_FILE = DATA_DIR / "osromr_bundle.bin"
+
+MAGIC = b"OSRB"
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct("<4sHHII")
+
+# Same datasets (and order) as initializeData() in js/main.js
+STARTUP_KEYS = [
+    "items",
+    "quests",
+    "shops",
+    "icons",
+    "searchIndexName",
+    "searchIndexDesc",
+    "newItems",
+    "spriteMap",
+]
+
+# Sections smaller than this are stored uncompressed
+MIN_COMPRESS_SIZE = 256
+
+HASH_LENGTH = 12
+
+# What a corrupt or truncated section can raise while decoding
+DECODE_ERRORS = (zlib.error, EOFError, OSError) + ((brotli.error,) if brotli is not None else ())
+
+# ============================================================================
+# COMPRESSION
+# ============================================================================
+
+def compress(data, method):
+    if method == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if method == "br":
+        return brotli.compress(data, quality=11)
+    return data
+
+def decompress(data, method):
+    if method == "gzip":
+        return gzip.decompress(data)
+    if method == "br":
+        if brotli is None:
+            raise RuntimeError("Bundle section uses brotli but 'brotli' is not installed")
+        return brotli.decompress(data)
+    if method == "none":
+        return data
+    raise ValueError(f"Unknown section compression: {method}")
+
+def section_hash(raw):
+    return hashlib.sha256(raw).hexdigest()[:HASH_LENGTH]
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+def build_bundle(sources, data_version, method="gzip"):
+    """Pack {key: path} into bundle bytes"""
+    sections = []
+    payload = bytearray()
+
+    for key, path in sources.items():
+        raw = path.read_bytes()
+        section_method = method if len(raw) >= MIN_COMPRESS_SIZE else "none"
+        packed = compress(raw, section_method)
+        sections.append({
+            "key": key,
+            "source": path.name,
+            "offset": len(payload),
+            "length": len(packed),
+            "rawLength": len(raw),
+            "compression": section_method,
+            "hash": section_hash(raw),
+        })
+        payload.extend(packed)
+
+    header = json.dumps({"sections": sections}, separators=(',', ':')).encode("utf-8")
+    preamble = PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, data_version or 0, len(header))
+    return preamble + header + bytes(payload)
+
+# ============================================================================
+# READER
+# ============================================================================
+
+class BundleReader:
+    """
+    Random access to bundle sections by key. With verify (the default) each
+    section read is checked against its header hash, so a corrupt or
+    truncated bundle raises ValueError instead of decoding silently.
+    """
+
+    def __init__(self, data, verify=True):
+        magic, fmt, _, data_version, header_len = PREAMBLE.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a data bundle (magic {magic!r})")
+        if fmt != FORMAT_VERSION:
+            raise ValueError(f"Unsupported bundle format version: {fmt}")
+
+        self.data = data
+        self.verify = verify
+        self.data_version = data_version
+        header_start = PREAMBLE.size
+        self.payload_start = header_start + header_len
+        header = json.loads(data[header_start:self.payload_start].decode("utf-8"))
+        self.sections = {s["key"]: s for s in header["sections"]}
+
+    @classmethod
+    def open(cls, path, verify=True):
+        return cls(Path(path).read_bytes(), verify)
+
+    def keys(self):
+        return list(self.sections.keys())
+
+    def read_bytes(self, key):
+        section = self.sections[key]
+        start = self.payload_start + section["offset"]
+        end = start + section["length"]
+        if end > len(self.data):
+            raise ValueError(f"Section '{key}' truncated: bundle ends at {len(self.data)}, section at {end}")
+        try:
+            raw = decompress(self.data[start:end], section["compression"])
+        except DECODE_ERRORS as e:
+            raise ValueError(f"Section '{key}' is corrupt: {e}") from e
+        if len(raw) != section["rawLength"]:
+            raise ValueError(f"Section '{key}' length mismatch: {len(raw)} != {section['rawLength']}")
+        if self.verify and section_hash(raw) != section["hash"]:
+            raise ValueError(f"Section '{key}' hash mismatch: {section_hash(raw)} != {section['hash']}")
+        return raw
+
+    def read_json(self, key):
+        return json.loads(self.read_bytes(key).decode("utf-8"))
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def startup_sources():
+    """Return {key: path} for the startup datasets"""
+    _, files = read_config()
+    sources = {}
+    for key in STARTUP_KEYS:
+        if key not in files:
+            print(f"⚠️  FILES has no '{key}' entry - skipping")
+            continue
+        path = DATA_DIR / files[key]
+        if not path.exists():
+            print(f"⚠️  {path.name} not found - skipping")
+            continue
+        sources[key] = path
+    return sources
+
+def build(method):
+    if method == "br" and brotli is None:
+        print("❌ 'brotli' not installed (pip install brotli)")
+        return False
+
+    version, _ = read_config()
+    sources = startup_sources()
+    bundle = build_bundle(sources, version, method)
+    OUTPUT_FILE.write_bytes(bundle)
+
+    raw_total = sum(p.stat().st_size for p in sources.values())
+    print(f"✓ {len(sources)} sections ({raw_total / 1024:.1f} KB raw) → "
+          f"{OUTPUT_FILE.name} ({len(bundle) / 1024:.1f} KB, {method}), VERSION {version}")
+    return True
+
+def verify():
+    if not OUTPUT_FILE.exists():
+        print(f"❌ Bundle not found: {OUTPUT_FILE}")
+        return False
+
+    reader = BundleReader.open(OUTPUT_FILE)
+    sources = startup_sources()
+    ok = True
+
+    print(f"Bundle VERSION {reader.data_version}, {len(reader.sections)} sections")
+    for key, path in sources.items():
+        if key not in reader.sections:
+            print(f"  ❌ {key}: missing from bundle")
+            ok = False
+            continue
+        section = reader.sections[key]
+        try:
+            raw = reader.read_bytes(key)
+        except (ValueError,) + DECODE_ERRORS as e:
+            print(f"  ❌ {key}: {e}")
+            ok = False
+            continue
+        if raw == path.read_bytes():
+            print(f"  ✅ {key}: {section['length'] / 1024:.1f} KB ({section['compression']}) "
+                  f"→ {section['rawLength'] / 1024:.1f} KB")
+        else:
+            print(f"  ❌ {key}: differs from {path.name} (rebuild the bundle)")
+            ok = False
+    return ok
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+
+    if command == "build":
+        method = sys.argv[2] if len(sys.argv) > 2 else "gzip"
+        if method not in ("gzip", "br", "none"):
+            print(f"Unknown compression: {method} (expected gzip, br or none)")
+            sys.exit(2)
+        sys.exit(0 if build(method) else 1)
+    elif command == "verify":
+        sys.exit(0 if verify() else 1)
+    else:
+        print(f"Unknown command: {command} (expected build or verify)")
+        sys.exit(2)
+
+if __name__ == "__main__":
+    main()
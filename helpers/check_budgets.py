@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+check_budgets.py
+
+Size and parse-time budget gate for published artifacts (the same set
+publish_data.py publishes: data/*.json and the item sprite).
+
+For every artifact it measures:
+    raw / gzip / br    bytes on disk and compressed as published
+    parse              json.loads time (median of several runs) - for the
+                       sprite, PNG decode time
+    memory             tracemalloc peak of one json.loads - for the sprite,
+                       the decoded RGBA canvas
+and checks them against:
+    - per-file budgets in helpers/budgets.json
+    - the previous release: measurements recorded per VERSION (js/config.js)
+      in helpers/budget_history.json; raw, gzip, br and memory may not grow
+      by more than max_growth.
+Parse time depends on the machine, so its budget and growth are only
+reported as warnings; they never fail the gate.
+
+The baseline release is the newest recorded VERSION below the current one.
+Until an older release is recorded, the current VERSION's own record is
+used, so changes since it was recorded are still checked. Run with --record
+when cutting a release to store the current measurements under VERSION.
+
+publish_data.py runs this gate first, on the bytes it is about to publish,
+and stops on failure (--no-budgets to skip).
+
+USAGE:
+    python check_budgets.py              # report, exit 1 on failure
+    python check_budgets.py --record     # also store measurements for VERSION
+    python check_budgets.py --suggest    # print budgets with headroom over current sizes
+"""
+
+import io
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+from statistics import median
+
+from publish_data import collect_artifacts, compress_artifact, format_size, read_config
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+BUDGETS_FILE = SCRIPT_DIR / "budgets.json"
+HISTORY_FILE = SCRIPT_DIR / "budget_history.json"
+
+PARSE_RUNS = 5
+DEFAULT_MAX_GROWTH = 0.10
+GROWTH_METRICS = ("raw", "gzip", "br", "memory_mb")
+WARN_METRICS = ("parse_ms",)  # Machine-dependent: reported, never fails
+# Smallest change the growth check reacts to, so tiny files can't trip it
+MIN_GROWTH = {"raw": 1024, "gzip": 1024, "br": 1024, "memory_mb": 0.5, "parse_ms": 1.0}
+MB = 1024 * 1024
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def time_runs(func, runs=PARSE_RUNS):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return median(samples) * 1000
+
+def measure(path, data, variants):
+    """Sizes, parse time and memory footprint for one artifact (compress_artifact() output)"""
+    result = {
+        "raw": len(data),
+        "gzip": len(variants["gzip"]),
+        "br": len(variants["br"]) if "br" in variants else None,
+    }
+
+    if path.suffix == ".json":
+        text = data.decode("utf-8")
+        result["parse_ms"] = round(time_runs(lambda: json.loads(text)), 3)
+
+        tracemalloc.start()
+        parsed = json.loads(text)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del parsed
+        result["memory_mb"] = round(peak / MB, 3)
+    else:
+        from PIL import Image
+
+        def decode():
+            with Image.open(io.BytesIO(data)) as img:
+                img.load()
+                return img.size
+
+        result["parse_ms"] = round(time_runs(decode), 3)
+        width, height = decode()
+        result["memory_mb"] = round(width * height * 4 / MB, 3)
+
+    return result
+
+def measure_all(packed=None):
+    """Measure every artifact; packed is {key: compress_artifact()} from publish_data.py"""
+    artifacts = collect_artifacts()
+    if packed is None:
+        packed = {key: compress_artifact(path) for key, path in artifacts.items()}
+    return {key: measure(path, *packed[key]) for key, path in artifacts.items()}
+
+# ============================================================================
+# CHECKS
+# ============================================================================
+
+def load_json(path, default):
+    if not path.exists():
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def baseline_release(history, version):
+    """(version, measurements) of the newest release below version (else version's own record), or (None, {})"""
+    older = [int(v) for v in history if version is None or int(v) < version]
+    if older:
+        return max(older), history[str(max(older))]
+    if version is not None and str(version) in history:
+        return version, history[str(version)]
+    return None, {}
+
+def check_file(key, current, budget, previous, max_growth):
+    """(failures, notes) for one artifact"""
+    failures = []
+    notes = []
+
+    for metric, limit in budget.items():
+        value = current.get(metric)
+        if value is not None and value > limit:
+            message = f"{metric} {format_metric(metric, value)} > budget {format_metric(metric, limit)}"
+            (notes if metric in WARN_METRICS else failures).append(message)
+
+    if previous:
+        for metric in GROWTH_METRICS:
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None or new - old < MIN_GROWTH[metric]:
+                continue
+            growth = (new - old) / old
+            if growth > max_growth:
+                failures.append(f"{metric} +{growth:.0%} vs previous release "
+                                f"({format_metric(metric, old)} -> {format_metric(metric, new)})")
+        old, new = previous.get("parse_ms"), current.get("parse_ms")
+        if old and new is not None and new - old >= MIN_GROWTH["parse_ms"] and (new - old) / old > max_growth:
+            notes.append(f"parse_ms {old:.1f}ms -> {new:.1f}ms")
+
+    return failures, notes
+
+def format_metric(metric, value):
+    if metric == "parse_ms":
+        return f"{value:.1f}ms"
+    if metric == "memory_mb":
+        return f"{value:.1f}MB"
+    return format_size(value)
+
+def growth_text(current, previous):
+    if not previous or not previous.get("gzip"):
+        return "new" if previous is not None else "-"
+    change = (current["gzip"] - previous["gzip"]) / previous["gzip"]
+    return f"{change:+.1%}"
+
+def run_checks(record=False, packed=None):
+    """Print the report; returns True if every artifact is within budget"""
+    version, _ = read_config()
+    budgets = load_json(BUDGETS_FILE, {})
+    history = load_json(HISTORY_FILE, {})
+    max_growth = budgets.get("max_growth", DEFAULT_MAX_GROWTH)
+    file_budgets = budgets.get("files", {})
+    base_version, base = baseline_release(history, version)
+
+    print(f"\nArtifact budgets for VERSION {version}"
+          + (" (no release recorded)" if base_version is None
+             else " (compared with the record for this VERSION)" if base_version == version
+             else f" (previous release: {base_version})"))
+    print(f"  {'key':<20} {'raw':>10} {'gzip':>10} {'br':>10} {'parse':>9} {'memory':>9} {'gzip Δ':>8}  status")
+
+    measurements = measure_all(packed)
+    failed = 0
+    details = []
+    for key, current in measurements.items():
+        previous = base.get(key) if base_version is not None else None
+        failures, notes = check_file(key, current, file_budgets.get(key, {}), previous, max_growth)
+        if key not in file_budgets:
+            notes.append("no budget")
+
+        status = "❌" if failures else ("⚠️" if any(n.startswith(WARN_METRICS) for n in notes) else "✓")
+        br = format_size(current["br"]) if current["br"] is not None else "-"
+        print(f"  {key:<20} {format_size(current['raw']):>10} {format_size(current['gzip']):>10} {br:>10} "
+              f"{current['parse_ms']:>7.1f}ms {current['memory_mb']:>7.1f}MB "
+              f"{growth_text(current, previous):>8}  {status}{' (' + ', '.join(notes) + ')' if notes else ''}")
+
+        if failures:
+            failed += 1
+            details.extend(f"{key}: {failure}" for failure in failures)
+
+    if record:
+        history[str(version)] = measurements
+        with open(HISTORY_FILE, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(history.items(), key=lambda kv: int(kv[0]))), f, indent=2)
+        print(f"\n✓ Recorded {len(measurements)} artifacts for VERSION {version} → {HISTORY_FILE.name}")
+
+    if failed:
+        print(f"\n❌ {failed} artifact(s) over budget:")
+        for detail in details:
+            print(f"   {detail}")
+        print()
+        return False
+
+    print(f"\n✓ {len(measurements)} artifacts within budget\n")
+    return True
+
+def suggest_budgets():
+    """Budgets with headroom over current measurements, in budgets.json format"""
+    budgets = {}
+    for key, current in measure_all().items():
+        entry = {
+            "raw": round_up(current["raw"] * 1.25),
+            "gzip": round_up(current["gzip"] * 1.25),
+        }
+        if current["br"] is not None:
+            entry["br"] = round_up(current["br"] * 1.25)
+        entry["parse_ms"] = max(5, round(current["parse_ms"] * 3))
+        entry["memory_mb"] = max(1, round(current["memory_mb"] * 1.5))
+        budgets[key] = entry
+    print(json.dumps({"max_growth": DEFAULT_MAX_GROWTH, "files": budgets}, indent=2))
+
+def round_up(size):
+    """Round a byte budget up to two significant digits (at least 4 KB)"""
+    size = max(size, 4096)
+    step = 10 ** max(0, len(str(int(size))) - 2)
+    return -(-int(size) // step) * step
+
+def main():
+    parser = argparse.ArgumentParser(description="Check artifact size and parse-time budgets")
+    parser.add_argument("--record", action="store_true", help="Store measurements for the current VERSION")
+    parser.add_argument("--suggest", action="store_true", help="Print budgets with headroom over current sizes")
+    args = parser.parse_args()
+
+    if args.suggest:
+        suggest_budgets()
+        return
+    sys.exit(0 if run_checks(record=args.record) else 1)
+
+if __name__ == "__main__":
+    main()
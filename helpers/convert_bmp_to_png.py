@@ -22,6 +22,8 @@ import json
 from pathlib import Path
 from PIL import Image
 
+from instrument import span, setup_profiling
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 INPUT_FILE = "itemInfo_EN.lub"
@@ -98,25 +100,28 @@ def extract_resource_mappings(text):
 def convert_bmp_to_png(bmp_path, png_path, transparent_color=(255, 0, 255)):
     """Convert BMP to PNG with transparency"""
     try:
-        img = Image.open(bmp_path)
-        
-        # Convert to RGBA if not already
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
-        
-        # Access pixels directly using load()
-        pixels = img.load()
-        width, height = img.size
+        with span("read", aggregate=True):
+            img = Image.open(bmp_path)
+            
+            # Convert to RGBA if not already
+            if img.mode != 'RGBA':
+                img = img.convert('RGBA')
         
-        # Replace pink with transparent
-        for y in range(height):
-            for x in range(width):
-                pixel = pixels[x, y]
-                # Check if pixel matches transparent color (RGB)
-                if pixel[:3] == transparent_color:
-                    pixels[x, y] = (255, 0, 255, 0)  # Fully transparent
+        with span("key", aggregate=True):
+            # Access pixels directly using load()
+            pixels = img.load()
+            width, height = img.size
+            
+            # Replace pink with transparent
+            for y in range(height):
+                for x in range(width):
+                    pixel = pixels[x, y]
+                    # Check if pixel matches transparent color (RGB)
+                    if pixel[:3] == transparent_color:
+                        pixels[x, y] = (255, 0, 255, 0)  # Fully transparent
         
-        img.save(png_path, 'PNG')
+        with span("save", aggregate=True):
+            img.save(png_path, 'PNG')
         return True
     except Exception as e:
         print(f"  Error converting {bmp_path.name}: {e}")
@@ -158,7 +163,8 @@ def main():
             return
 
     # Extract mappings
-    mappings = extract_resource_mappings(text)
+    with span("parse"):
+        mappings = extract_resource_mappings(text)
     print(f"Found {len(mappings)} items with resource names\n")
 
     # Create output directory
@@ -230,4 +236,5 @@ def main():
 
 
 if __name__ == "__main__":
+    setup_profiling("convert_bmp_to_png")
     main()
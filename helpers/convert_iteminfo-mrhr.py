@@ -11,6 +11,8 @@ import json
 import random
 from pathlib import Path
 
+from instrument import span, setup_profiling
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 EXISTING_ITEMS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_items.json"
@@ -135,7 +137,7 @@ def main():
     # Read input
     for encoding in ["cp949", "utf-8", "latin-1"]:
         try:
-            with open(INPUT_FILE, "r", encoding=encoding) as f:
+            with span("read"), open(INPUT_FILE, "r", encoding=encoding) as f:
                 text = f.read()
             print(f"Read \"{INPUT_FILE}\" with {encoding}")
             break
@@ -145,20 +147,22 @@ def main():
                 return
 
     # Convert
-    items = convert_lub_to_json(text)
-    items = dict(sorted(items.items(), key=lambda kv: int(kv[0])))
+    with span("parse"):
+        items = convert_lub_to_json(text)
+        items = dict(sorted(items.items(), key=lambda kv: int(kv[0])))
 
     # Find new IDs
     new_ids = sorted([int(id) for id in items.keys() if id not in existing_ids])
 
-    # Write items
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(items, f, ensure_ascii=False, indent=2)
+    with span("dump"):
+        # Write items
+        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False, indent=2)
 
-    # Write new IDs
-    OUTPUT_NEW_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_NEW_FILE, "w", encoding="utf-8") as f:
-        json.dump(new_ids, f, separators=(',', ':'))
+        # Write new IDs
+        OUTPUT_NEW_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(OUTPUT_NEW_FILE, "w", encoding="utf-8") as f:
+            json.dump(new_ids, f, separators=(',', ':'))
 
     print(f"✓ {len(items)} items → {OUTPUT_FILE}")
     print(f"✓ {len(new_ids)} new items → {OUTPUT_NEW_FILE}")
@@ -172,4 +176,5 @@ def main():
         print(f"  {item_id}: {item['name']}{new_mark}")
 
 if __name__ == "__main__":
+    setup_profiling("convert_iteminfo-mrhr")
     main()
\ No newline at end of file
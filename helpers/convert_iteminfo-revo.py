@@ -11,6 +11,8 @@ import random
 import sys
 from collections import defaultdict
 
+from instrument import span, setup_profiling
+
 # Edit these if needed
 INPUT_FILE = "itemInfo.lua"
 OUTPUT_FILE = "osrolr_items.json"
@@ -188,7 +190,7 @@ def main():
     text = None
     for enc in ("cp949", "utf-8", "latin-1"):
         try:
-            with open(INPUT_FILE, "r", encoding="cp949", errors="replace") as f:
+            with span("read"), open(INPUT_FILE, "r", encoding="cp949", errors="replace") as f:
                 text = f.read()
             print(f"Read {INPUT_FILE} as cp949 (surrogateescape)")
             break
@@ -203,12 +205,13 @@ def main():
         print("Failed to read input file with available encodings.")
         return
 
-    items = convert_lua_to_json(text)
+    with span("parse"):
+        items = convert_lua_to_json(text)
 
-    # sort by numeric id
-    items = dict(sorted(items.items(), key=lambda kv: int(kv[0])))
+        # sort by numeric id
+        items = dict(sorted(items.items(), key=lambda kv: int(kv[0])))
 
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+    with span("dump"), open(OUTPUT_FILE, "w", encoding="utf-8") as f:
         json.dump(items, f, ensure_ascii=False, indent=2)
 
     print(f"Converted {len(items)} items -> {OUTPUT_FILE}")
@@ -245,6 +248,7 @@ def main():
     print("")
 
 if __name__ == "__main__":
+    setup_profiling("convert_iteminfo-revo")
     # allow passing input/output filenames on CLI if desired
     if len(sys.argv) >= 2:
         INPUT_FILE = sys.argv[1]
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+desc_dictionary.py
+
+Dictionary-compressed storage for osromr_items.json. Description lines
+(separators, "Class:" / "Jobs:" / "Weight:" lines, shared effect text) are
+interned in one shared line dictionary and each item stores its description
+as a list of line IDs. Line IDs are assigned by frequency, so the most common
+lines get the shortest IDs.
+
+Packed format:
+    {
+      "format": "osromr-items-dict",
+      "version": 1,
+      "lines": ["...", "Jobs:^6666CC All^000000", ...],
+      "items": {"501": ["Red Potion", [12, 3, 40]], "1101": ["Sword", [...], 3], ...}
+    }
+Item tuples are [name, lineIds] or [name, lineIds, slot]; items with any other
+shape are stored as-is.
+
+USAGE:
+    python desc_dictionary.py encode    # osromr_items.json -> osromr_items_dict.json
+    python desc_dictionary.py decode    # osromr_items_dict.json -> osromr_items.json
+    python desc_dictionary.py check     # byte-identical round trip + size report
+
+The page doesn't load osromr_items_dict.json yet, so it is gitignored and
+left out of publish_data.py's artifacts.
+"""
+
+import sys
+import gzip
+import json
+from pathlib import Path
+from collections import Counter
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ITEMS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_items.json"
+OUTPUT_FILE = SCRIPT_DIR / ".." / "data" / "osromr_items_dict.json"
+
+FORMAT_NAME = "osromr-items-dict"
+FORMAT_VERSION = 1
+
+def split_lines(desc):
+    return desc.split("\n")
+
+def is_packable(item):
+    """True if the item is {name, desc[, slot]} with plain values, in that order"""
+    keys = list(item.keys())
+    if keys not in (["name", "desc"], ["name", "desc", "slot"]):
+        return False
+    return isinstance(item["name"], str) and isinstance(item["desc"], str)
+
+# ============================================================================
+# ENCODER / DECODER
+# ============================================================================
+
+def encode(items):
+    """Items dict -> packed dict"""
+    counts = Counter()
+    for item in items.values():
+        if is_packable(item):
+            counts.update(split_lines(item["desc"]))
+
+    # Most frequent lines first; ties broken by text for stable output
+    lines = [line for line, _ in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+    line_ids = {line: i for i, line in enumerate(lines)}
+
+    packed_items = {}
+    for item_id, item in items.items():
+        if not is_packable(item):
+            packed_items[item_id] = item
+            continue
+        record = [item["name"], [line_ids[line] for line in split_lines(item["desc"])]]
+        if "slot" in item:
+            record.append(item["slot"])
+        packed_items[item_id] = record
+
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "lines": lines,
+        "items": packed_items,
+    }
+
+def decode(packed):
+    """Packed dict -> items dict"""
+    if packed.get("format") != FORMAT_NAME:
+        raise ValueError(f"Not a dictionary-compressed items file: format={packed.get('format')!r}")
+    if packed.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported version: {packed.get('version')}")
+
+    lines = packed["lines"]
+    items = {}
+    for item_id, record in packed["items"].items():
+        if isinstance(record, dict):
+            items[item_id] = record
+            continue
+        item = {"name": record[0], "desc": "\n".join(lines[i] for i in record[1])}
+        if len(record) > 2:
+            item["slot"] = record[2]
+        items[item_id] = item
+    return items
+
+def dumps_packed(packed):
+    return json.dumps(packed, ensure_ascii=False, separators=(',', ':'))
+
+def dumps_source(items):
+    """Serialize the same way as convert_iteminfo-mrhr.py"""
+    return json.dumps(items, ensure_ascii=False, indent=2)
+
+# ============================================================================
+# SIZE REPORT
+# ============================================================================
+
+def string_bytes(strings):
+    """Approximate in-memory size of a collection of str objects"""
+    return sum(sys.getsizeof(s) for s in strings)
+
+def report(items, packed, source_bytes, packed_bytes):
+    total_lines = sum(len(split_lines(i["desc"])) for i in items.values() if is_packable(i))
+    unique_lines = len(packed["lines"])
+
+    desc_mem = string_bytes(i["desc"] for i in items.values() if isinstance(i.get("desc"), str))
+    dict_mem = string_bytes(packed["lines"])
+
+    print(f"\n  Items:              {len(items)}")
+    print(f"  Description lines:  {total_lines} ({unique_lines} unique, {unique_lines / total_lines * 100:.1f}%)")
+    print(f"  {'':<20}{'source':>12}{'dict':>12}{'ratio':>9}")
+    rows = [
+        ("File (raw)", len(source_bytes), len(packed_bytes)),
+        ("File (gzip)", len(gzip.compress(source_bytes, mtime=0)), len(gzip.compress(packed_bytes, mtime=0))),
+        ("Desc strings (mem)", desc_mem, dict_mem),
+    ]
+    for label, before, after in rows:
+        print(f"  {label:<20}{before / 1024:>9.1f} KB{after / 1024:>9.1f} KB{after / before * 100:>8.1f}%")
+    print()
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+
+    if command == "encode":
+        items = json.loads(ITEMS_FILE.read_text(encoding="utf-8"))
+        OUTPUT_FILE.write_text(dumps_packed(encode(items)), encoding="utf-8")
+        print(f"✓ {ITEMS_FILE.name} → {OUTPUT_FILE.name}")
+    elif command == "decode":
+        packed = json.loads(OUTPUT_FILE.read_text(encoding="utf-8"))
+        ITEMS_FILE.write_text(dumps_source(decode(packed)), encoding="utf-8")
+        print(f"✓ {OUTPUT_FILE.name} → {ITEMS_FILE.name}")
+    elif command == "check":
+        source_bytes = ITEMS_FILE.read_bytes()
+        items = json.loads(source_bytes.decode("utf-8"))
+        packed = encode(items)
+        packed_bytes = dumps_packed(packed).encode("utf-8")
+        restored = dumps_source(decode(json.loads(packed_bytes))).encode("utf-8")
+
+        report(items, packed, source_bytes, packed_bytes)
+        if restored != source_bytes:
+            print(f"❌ {ITEMS_FILE.name}: round trip differs")
+            sys.exit(1)
+        print(f"✓ {ITEMS_FILE.name}: round trip is byte-identical\n")
+    else:
+        print(f"Unknown command: {command} (expected encode, decode or check)")
+        sys.exit(2)
+
+if __name__ == "__main__":
+    main()
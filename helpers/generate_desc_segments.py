@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+generate_desc_segments.py
+
+Pre-render item descriptions from osromr_items.json into compact segment
+lists, so the page can emit description HTML without re-parsing ^RRGGBB
+markup or recomputing dark theme colors.
+
+Mirrors parseDescription() in js/main.js: "^000000" closes a span, any other
+"^RRGGBB" opens one, newlines become <br>.
+
+Output format:
+    {
+      "version": 1,
+      "palette": [["0000FF", "8080FF"], ...],   # [light, dark] per color
+      "items": {"501": [op, "text", op, "text", ...], ...}
+    }
+Each op is a palette index (open a span in that color), CLOSE (-1, emit
+</span>) or TEXT (-2, plain text; only used for a leading run). Text keeps
+its newlines; the emitter turns them into <br>.
+
+USAGE:
+    python generate_desc_segments.py           # build
+    python generate_desc_segments.py check     # compare with parseDescription port
+
+The page doesn't load osromr_item_desc_segments.json yet, so it is
+gitignored and left out of publish_data.py's artifacts.
+"""
+
+import re
+import sys
+import json
+import math
+from pathlib import Path
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ITEMS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_items.json"
+OUTPUT_FILE = SCRIPT_DIR / ".." / "data" / "osromr_item_desc_segments.json"
+
+FORMAT_VERSION = 1
+
+CLOSE = -1
+TEXT = -2
+
+CLOSE_CODE = "000000"
+COLOR_RE = re.compile(r"\^([0-9A-Fa-f]{6})")
+
+# ============================================================================
+# COLORS (port of adjustColorForDarkTheme in js/main.js)
+# ============================================================================
+
+def js_round(n):
+    """Math.round semantics (half rounds up, unlike Python's round)"""
+    return math.floor(n + 0.5)
+
+def adjust_color_for_dark_theme(hex_color):
+    """Adjust a hex color for contrast on dark backgrounds, preserving hue"""
+    r = int(hex_color[0:2], 16) / 255
+    g = int(hex_color[2:4], 16) / 255
+    b = int(hex_color[4:6], 16) / 255
+
+    # RGB -> HSL
+    mx = max(r, g, b)
+    mn = min(r, g, b)
+    l = (mx + mn) / 2
+
+    if mx == mn:
+        h = s = 0
+    else:
+        d = mx - mn
+        s = d / (2 - mx - mn) if l > 0.5 else d / (mx + mn)
+        if mx == r:
+            h = ((g - b) / d + (6 if g < b else 0)) / 6
+        elif mx == g:
+            h = ((b - r) / d + 2) / 6
+        else:
+            h = ((r - g) / d + 4) / 6
+
+    # Lightness / saturation adjustments
+    if l < 0.4:
+        l = min(0.75, l + 0.45)
+    elif l < 0.6:
+        l = min(0.8, l + 0.25)
+    elif l > 0.95:
+        l = 0.9
+
+    if s < 0.3:
+        s = min(0.5, s + 0.15)
+
+    # HSL -> RGB
+    if s == 0:
+        r2 = g2 = b2 = l
+    else:
+        def hue2rgb(p, q, t):
+            if t < 0:
+                t += 1
+            if t > 1:
+                t -= 1
+            if t < 1 / 6:
+                return p + (q - p) * 6 * t
+            if t < 1 / 2:
+                return q
+            if t < 2 / 3:
+                return p + (q - p) * (2 / 3 - t) * 6
+            return p
+
+        q = l * (1 + s) if l < 0.5 else l + s - l * s
+        p = 2 * l - q
+        r2 = hue2rgb(p, q, h + 1 / 3)
+        g2 = hue2rgb(p, q, h)
+        b2 = hue2rgb(p, q, h - 1 / 3)
+
+    return "".join(f"{js_round(n * 255):02x}" for n in (r2, g2, b2)).upper()
+
+# ============================================================================
+# SEGMENTS
+# ============================================================================
+
+class Palette:
+    def __init__(self):
+        self.colors = []
+        self.index = {}
+
+    def add(self, hex_color):
+        idx = self.index.get(hex_color)
+        if idx is None:
+            idx = len(self.colors)
+            self.index[hex_color] = idx
+            self.colors.append([hex_color, adjust_color_for_dark_theme(hex_color)])
+        return idx
+
+def build_segments(desc, palette):
+    """Description string -> flat [op, text, op, text, ...] list"""
+    segments = []
+    pos = 0
+    for m in COLOR_RE.finditer(desc):
+        if m.start() > pos or not segments:
+            text = desc[pos:m.start()]
+            if segments:
+                segments[-1] += text
+            elif text:
+                segments.extend([TEXT, text])
+        code = m.group(1)
+        segments.extend([CLOSE if code == CLOSE_CODE else palette.add(code), ""])
+        pos = m.end()
+
+    tail = desc[pos:]
+    if segments:
+        segments[-1] += tail
+    elif tail:
+        segments.extend([TEXT, tail])
+    return segments
+
+def render_segments(segments, palette, dark):
+    """Emit HTML from segments (what the page-side emitter does)"""
+    theme = 1 if dark else 0
+    out = []
+    for i in range(0, len(segments), 2):
+        op, text = segments[i], segments[i + 1]
+        if op == CLOSE:
+            out.append("</span>")
+        elif op >= 0:
+            out.append(f'<span style="color: #{palette[op][theme]}">')
+        out.append(text.replace("\n", "<br>"))
+    return "".join(out)
+
+def parse_description(desc, dark):
+    """Reference port of parseDescription for string descriptions"""
+    if not desc:
+        return ""
+    text = desc.replace("\n", "<br>").replace("^" + CLOSE_CODE, "</span>")
+    return COLOR_RE.sub(
+        lambda m: f'<span style="color: #{adjust_color_for_dark_theme(m.group(1)) if dark else m.group(1)}">',
+        text,
+    )
+
+def build(items):
+    palette = Palette()
+    result = {}
+    for item_id, item in items.items():
+        desc = item.get("desc")
+        if isinstance(desc, str) and desc:
+            result[item_id] = build_segments(desc, palette)
+    return {"version": FORMAT_VERSION, "palette": palette.colors, "items": result}
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    if not ITEMS_FILE.exists():
+        print(f"Error: Items file not found: {ITEMS_FILE}")
+        return
+
+    with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    print(f"\nLoaded {len(items)} items")
+
+    data = build(items)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "check":
+        mismatches = 0
+        for item_id, segments in data["items"].items():
+            desc = items[item_id]["desc"]
+            for dark in (False, True):
+                if render_segments(segments, data["palette"], dark) != parse_description(desc, dark):
+                    mismatches += 1
+                    if mismatches <= 5:
+                        print(f"❌ Item {item_id} ({'dark' if dark else 'light'}) renders differently")
+        if mismatches:
+            print(f"❌ {mismatches} mismatched renders\n")
+            sys.exit(1)
+        print(f"✓ {len(data['items'])} descriptions render identically in both themes\n")
+        return
+
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    segment_count = sum(len(s) // 2 for s in data["items"].values())
+    print(f"✓ {OUTPUT_FILE.name}: {len(data['items'])} descriptions, "
+          f"{segment_count} segments, {len(data['palette'])} palette colors\n")
+
+if __name__ == "__main__":
+    main()
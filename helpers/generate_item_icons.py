@@ -1,12 +1,16 @@
 import json
 import os
+import sys
 from pathlib import Path
 
+from instrument import span, setup_profiling
+
 # Paths relative to helpers/ directory
 SCRIPT_DIR = Path(__file__).parent
 IMAGE_DIR = SCRIPT_DIR / ".." / "image" / "item"
 ITEMS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_items.json"
 OUTPUT_FILE = SCRIPT_DIR / ".." / "data" / "osromr_item_icons.json"
+PACK_FILE = SCRIPT_DIR / ".." / "image" / "item_icons.pack"
 
 def get_available_icons():
     """Scan image/item directory and return list of item IDs that have icons"""
@@ -30,10 +34,25 @@ def get_available_icons():
     
     return icons
 
-def main():
-    print("\nScanning image/item/ directory for item icons...")
+def get_packed_icons():
+    """Read item IDs from the packed icon store index (see icon_pack.py)"""
+    from icon_pack import IconPack
+    
+    if not PACK_FILE.exists():
+        print(f"Error: Icon pack not found: {PACK_FILE}")
+        return []
     
-    icons = get_available_icons()
+    with IconPack(PACK_FILE) as pack:
+        return list(pack.ids)
+
+def main():
+    with span("scan"):
+        if "--pack" in sys.argv[1:]:
+            print("\nReading item icons from image/item_icons.pack...")
+            icons = get_packed_icons()
+        else:
+            print("\nScanning image/item/ directory for item icons...")
+            icons = get_available_icons()
     
     if len(icons) == 0:
         print("Warning: No valid item icons found")
@@ -42,11 +61,12 @@ def main():
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
     
     # Write compact JSON (single line array)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+    with span("dump"), open(OUTPUT_FILE, "w", encoding="utf-8") as f:
         json.dump(icons, f, separators=(',', ':'))
     
     print(f"\n✓ Generated {OUTPUT_FILE}")
     print(f"✓ Found {len(icons)} item icons\n")
 
 if __name__ == "__main__":
+    setup_profiling("generate_item_icons")
     main()
\ No newline at end of file
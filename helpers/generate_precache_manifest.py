@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+generate_precache_manifest.py
+
+Generate precache-manifest.json for the offline layer (sw.js). Lists every
+app shell, data and image asset with a content hash and size, stamped with
+VERSION from js/config.js.
+
+VERSION and a hash of the manifest are stamped into sw.js, so every release
+changes the worker's bytes and the browser's update check installs a new
+worker, which downloads only the assets whose hashes changed.
+
+With USE_PUBLISH_MANIFEST on, the page loads data and the sprite from the
+hashed files in publish/, so those are precached (with publish/manifest.json)
+in place of the plain data files and sprite. Run publish_data.py first.
+"""
+
+import re
+import json
+import hashlib
+from pathlib import Path
+
+from publish_data import MANIFEST_FILE, SPRITE_KEY, is_dev_file, publish_manifest_enabled, read_config
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = (SCRIPT_DIR / "..").resolve()
+DATA_DIR = ROOT_DIR / "data"
+OUTPUT_FILE = ROOT_DIR / "precache-manifest.json"
+WORKER_FILE = ROOT_DIR / "sw.js"
+
+HASH_LENGTH = 12
+
+WORKER_VERSION_RE = re.compile(r"^const PRECACHE_VERSION = .*;$", re.MULTILINE)
+WORKER_HASH_RE = re.compile(r"^const MANIFEST_HASH = .*;$", re.MULTILINE)
+
+# App shell assets, relative to the site root
+SHELL_PATTERNS = [
+    "index.html",
+    "css/*.css",
+    "js/*.js",
+    "image/*.png",
+    "image/*.jpg",
+]
+
+def file_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:HASH_LENGTH]
+
+def load_publish_manifest(version):
+    """publish/manifest.json if it is for this VERSION, else None"""
+    if not MANIFEST_FILE.exists():
+        return None
+    with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return manifest if manifest.get("version") == version else None
+
+def collect_assets(files, published=None):
+    """Return sorted list of site-relative asset paths"""
+    assets = set()
+    for pattern in SHELL_PATTERNS:
+        for path in ROOT_DIR.glob(pattern):
+            if is_dev_file(path):
+                continue
+            assets.add(path.relative_to(ROOT_DIR).as_posix())
+    for name in files.values():
+        if (DATA_DIR / name).exists():
+            assets.add(f"data/{name}")
+
+    if published is not None:
+        # The page fetches these from publish/ instead
+        for key, entry in published["files"].items():
+            if key not in files and key != SPRITE_KEY:
+                continue
+            assets.discard(f"data/{entry['source']}")
+            assets.discard(f"image/{entry['source']}")
+            assets.add(f"publish/{entry['file']}")
+        assets.add("publish/manifest.json")
+    return sorted(assets)
+
+def stamp_worker(version, manifest_hash):
+    """Write VERSION and the manifest hash into sw.js; returns False if the markers are missing"""
+    text = WORKER_FILE.read_text(encoding="utf-8")
+    if not WORKER_VERSION_RE.search(text) or not WORKER_HASH_RE.search(text):
+        return False
+    text = WORKER_VERSION_RE.sub(f"const PRECACHE_VERSION = {version};", text)
+    text = WORKER_HASH_RE.sub(f"const MANIFEST_HASH = '{manifest_hash}';", text)
+    WORKER_FILE.write_text(text, encoding="utf-8")
+    return True
+
+def load_previous():
+    if not OUTPUT_FILE.exists():
+        return None
+    try:
+        with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"Warning: Could not read previous manifest: {e}")
+        return None
+
+def main():
+    print("\nGenerating precache manifest...")
+
+    version, files = read_config()
+    if version is None:
+        print("Error: Could not find VERSION in js/config.js")
+        return
+
+    published = None
+    if publish_manifest_enabled():
+        published = load_publish_manifest(version)
+        if published is None:
+            print(f"⚠️  USE_PUBLISH_MANIFEST is on but publish/manifest.json is missing or not for VERSION {version} "
+                  f"- run publish_data.py first; precaching plain data URLs")
+        else:
+            print(f"Precaching {len(published['files'])} hashed files from publish/")
+
+    assets = {}
+    for rel in collect_assets(files, published):
+        path = ROOT_DIR / rel
+        assets[rel] = {"hash": file_hash(path), "size": path.stat().st_size}
+
+    manifest = {"version": version, "assets": assets}
+
+    # Compare with the previous manifest to report what a release will download
+    previous = load_previous()
+    if previous:
+        old_assets = previous.get("assets", {})
+        changed = [rel for rel, a in assets.items() if old_assets.get(rel, {}).get("hash") != a["hash"]]
+        removed = [rel for rel in old_assets if rel not in assets]
+        changed_bytes = sum(assets[rel]["size"] for rel in changed)
+
+        for rel in changed:
+            print(f"  ~ {rel} ({assets[rel]['size'] / 1024:.1f} KB)")
+        for rel in removed:
+            print(f"  - {rel}")
+
+        if (changed or removed) and previous.get("version") == version:
+            print(f"⚠️  Assets changed but VERSION is still {version} - bump VERSION in js/config.js "
+                  f"so clients pick up the new files")
+        print(f"→ Update size for clients on VERSION {previous.get('version')}: "
+              f"{len(changed)} files, {changed_bytes / 1024:.1f} KB")
+
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+    manifest_hash = file_hash(OUTPUT_FILE)
+    if not stamp_worker(version, manifest_hash):
+        print(f"Error: PRECACHE_VERSION / MANIFEST_HASH not found in {WORKER_FILE.name}")
+        return
+    print(f"✓ {WORKER_FILE.name} stamped with VERSION {version}, manifest {manifest_hash}")
+
+    total_kb = sum(a["size"] for a in assets.values()) / 1024
+    print(f"✓ {OUTPUT_FILE.name}: {len(assets)} assets ({total_kb:.1f} KB), VERSION {version}\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+generate_quest_search_index.py
+
+Generate search indices from osromr_quests.json and osromr_shops.json for
+sidebar filtering. Each index covers quest/shop names, subgroup names and the
+names of produced and required items, so a filter is a set intersection of
+token postings instead of a rescan of every group.
+
+Output format:
+    {
+      "source": "<sha256 prefix of the quests/shops file>",
+      "entries": [[producesId, groupIdx, subIdx, idx], ...],
+      "index": {"token": [entryIdx, ...], ...}
+    }
+
+Entries point into the source file by position, so any edit to it shifts
+them. load_entry_index() rejects an index whose "source" hash doesn't match
+the current file.
+
+match_entries() matches each filter word against the start of the indexed
+tokens (exact or prefix, found by binary search over the sorted terms), so a
+partially typed word matches without scanning the vocabulary. It differs
+from getGroupMatches in js/quests.js: it also searches subgroup and item
+names, matches word starts rather than any substring, and a multi-word
+filter matches each word separately (all must match) instead of as one
+contiguous phrase.
+"""
+
+import json
+import bisect
+import hashlib
+from pathlib import Path
+from collections import defaultdict
+
+from generate_search_index import tokenize
+from instrument import span, setup_profiling
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ITEMS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_items.json"
+QUESTS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_quests.json"
+SHOPS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_shops.json"
+OUTPUT_QUESTS = SCRIPT_DIR / ".." / "data" / "osromr_search_index_quests.json"
+OUTPUT_SHOPS = SCRIPT_DIR / ".." / "data" / "osromr_search_index_shops.json"
+
+HASH_LENGTH = 12
+
+# Currencies that are really items (mirrors SPECIAL_ITEMS in js/config.js)
+SPECIAL_ITEMS = {
+    "gold": 969,
+    "credit": 40001,
+}
+
+def item_name(items, item_id):
+    if item_id is None:
+        return ""
+    return items.get(str(item_id), {}).get("name", "")
+
+def source_hash(raw):
+    """Hash of the source file bytes an index was built from"""
+    return hashlib.sha256(raw).hexdigest()[:HASH_LENGTH]
+
+def build_entry_index(data, list_key, items, source=None):
+    """Build index from quest/shop names, subgroup names and item names"""
+    entries = []
+    index = defaultdict(set)
+
+    for group_idx, group in enumerate(data.get("groups", [])):
+        for sub_idx, subgroup in enumerate(group.get("subgroups", [])):
+            subgroup_tokens = tokenize(subgroup.get("name", ""))
+
+            for idx, entry in enumerate(subgroup.get(list_key, [])):
+                entry_idx = len(entries)
+                entries.append([entry.get("producesId"), group_idx, sub_idx, idx])
+
+                texts = [entry.get("name", ""), item_name(items, entry.get("producesId"))]
+                for req in entry.get("requirements", []):
+                    req_type = req.get("type")
+                    if req_type == "item":
+                        texts.append(item_name(items, req.get("id")))
+                    elif req_type in SPECIAL_ITEMS:
+                        texts.append(item_name(items, SPECIAL_ITEMS[req_type]))
+
+                for token in subgroup_tokens:
+                    index[token].add(entry_idx)
+                for text in texts:
+                    for token in tokenize(text):
+                        index[token].add(entry_idx)
+
+    return {
+        "source": source,
+        "entries": entries,
+        "index": {term: sorted(ids) for term, ids in sorted(index.items())},
+    }
+
+class EntryIndex:
+    """A loaded quest/shop index with prefix lookup over its sorted terms"""
+
+    def __init__(self, index):
+        self.source = index.get("source")
+        self.entries = index["entries"]
+        self.postings = index["index"]
+        self.terms = sorted(self.postings)
+
+    def lookup(self, word):
+        """Entry indices under every term starting with word"""
+        ids = set()
+        pos = bisect.bisect_left(self.terms, word)
+        while pos < len(self.terms) and self.terms[pos].startswith(word):
+            ids.update(self.postings[self.terms[pos]])
+            pos += 1
+        return ids
+
+def load_entry_index(index_path, source_path):
+    """Load an index as an EntryIndex, rejecting it if source_path changed since it was built"""
+    with open(index_path, "r", encoding="utf-8") as f:
+        index = json.load(f)
+    if index.get("source") != source_hash(Path(source_path).read_bytes()):
+        raise ValueError(f"{Path(index_path).name} is stale: {Path(source_path).name} changed since it was built "
+                         f"(rerun generate_quest_search_index.py)")
+    return EntryIndex(index)
+
+def match_entries(index, text):
+    """Sorted entry indices (of an EntryIndex) matching every filter word"""
+    result = None
+    for word in tokenize(text):
+        ids = index.lookup(word)
+        result = ids if result is None else result & ids
+        if not result:
+            return []
+    return sorted(result) if result is not None else list(range(len(index.entries)))
+
+def main():
+    print("\nGenerating quest/shop search indices...")
+
+    for path in (ITEMS_FILE, QUESTS_FILE, SHOPS_FILE):
+        if not path.exists():
+            print(f"Error: Data file not found: {path}")
+            return
+
+    with span("read"):
+        with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        quests_raw = QUESTS_FILE.read_bytes()
+        shops_raw = SHOPS_FILE.read_bytes()
+        quests = json.loads(quests_raw)
+        shops = json.loads(shops_raw)
+
+    print(f"Loaded {len(items)} items")
+
+    # Build indices
+    with span("tokenize"):
+        quest_index = build_entry_index(quests, "quests", items, source_hash(quests_raw))
+        shop_index = build_entry_index(shops, "shops", items, source_hash(shops_raw))
+
+    # Write
+    OUTPUT_QUESTS.parent.mkdir(parents=True, exist_ok=True)
+
+    with span("dump"):
+        with open(OUTPUT_QUESTS, "w", encoding="utf-8") as f:
+            json.dump(quest_index, f, separators=(',', ':'))
+
+        with open(OUTPUT_SHOPS, "w", encoding="utf-8") as f:
+            json.dump(shop_index, f, separators=(',', ':'))
+
+    print(f"✓ {OUTPUT_QUESTS.name}: {len(quest_index['entries'])} quests, {len(quest_index['index'])} terms")
+    print(f"✓ {OUTPUT_SHOPS.name}: {len(shop_index['entries'])} shops, {len(shop_index['index'])} terms\n")
+
+if __name__ == "__main__":
+    setup_profiling("generate_quest_search_index")
+    main()
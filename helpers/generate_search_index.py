@@ -11,6 +11,8 @@ from pathlib import Path
 from collections import defaultdict
 import re
 
+from instrument import span, setup_profiling
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 ITEMS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_items.json"
@@ -54,26 +56,29 @@ def main():
         print(f"Error: Items file not found: {ITEMS_FILE}")
         return
     
-    with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+    with span("read"), open(ITEMS_FILE, "r", encoding="utf-8") as f:
         items = json.load(f)
     
     print(f"Loaded {len(items)} items")
     
     # Build indices
-    name_index = build_name_index(items)
-    desc_index = build_desc_index(items)
+    with span("tokenize"):
+        name_index = build_name_index(items)
+        desc_index = build_desc_index(items)
     
     # Write
     OUTPUT_NAME.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(OUTPUT_NAME, "w", encoding="utf-8") as f:
-        json.dump(name_index, f, separators=(',', ':'))
-    
-    with open(OUTPUT_DESC, "w", encoding="utf-8") as f:
-        json.dump(desc_index, f, separators=(',', ':'))
+    with span("dump"):
+        with open(OUTPUT_NAME, "w", encoding="utf-8") as f:
+            json.dump(name_index, f, separators=(',', ':'))
+        
+        with open(OUTPUT_DESC, "w", encoding="utf-8") as f:
+            json.dump(desc_index, f, separators=(',', ':'))
     
     print(f"✓ {OUTPUT_NAME.name}: {len(name_index)} terms")
     print(f"✓ {OUTPUT_DESC.name}: {len(desc_index)} terms\n")
 
 if __name__ == "__main__":
+    setup_profiling("generate_search_index")
     main()
\ No newline at end of file
@@ -7,10 +7,13 @@ Place this script in the helpers/ directory alongside generate_item_icons.py
 """
 
 import os
+import sys
 import json
 from PIL import Image
 from pathlib import Path
 
+from instrument import span, setup_profiling
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -22,30 +25,58 @@ ICONS_PER_ROW = 128  # Icons per row (128 icons = 3072px wide)
 INPUT_DIR = SCRIPT_DIR / ".." / "image" / "item"  # Directory containing individual icon PNGs
 OUTPUT_SPRITE = SCRIPT_DIR / ".." / "image" / "item_sprite.png"  # Output sprite sheet
 OUTPUT_MAP = SCRIPT_DIR / ".." / "data" / "osromr_sprite_map.json"  # Output mapping file
+PACK_FILE = SCRIPT_DIR / ".." / "image" / "item_icons.pack"  # Packed icon store (icon_pack.py)
 
 # ============================================================================
 # SPRITE GENERATION
 # ============================================================================
 
-def generate_sprite_sheet():
-    """Generate sprite sheet from individual icon files."""
-    
-    print(f"🔍 Scanning for icons in '{INPUT_DIR}'...")
-    
-    # Check if image directory exists
-    if not INPUT_DIR.exists():
-        print(f"❌ Error: Image directory not found: {INPUT_DIR}")
+def fit_icon(icon):
+    """Resize an icon to ICON_SIZE x ICON_SIZE if it isn't already."""
+    if icon.size != (ICON_SIZE, ICON_SIZE):
+        icon = icon.resize((ICON_SIZE, ICON_SIZE), Image.Resampling.NEAREST)
+    return icon
+
+def paste_icon(sprite, icon, x, y):
+    """Paste a fitted icon onto the sprite sheet at pixel (x, y)."""
+    sprite.paste(icon, (x, y), icon if icon.mode == 'RGBA' else None)
+
+def generate_sprite_sheet(use_pack=False):
+    """Generate sprite sheet from individual icon files (or the packed icon store)."""
+    if not use_pack:
+        return build_sprite_sheet()
+
+    from icon_pack import IconPack
+    print(f"🔍 Reading icons from '{PACK_FILE}'...")
+    if not PACK_FILE.exists():
+        print(f"❌ Error: Icon pack not found: {PACK_FILE} (run icon_pack.py import)")
         return False
+    with IconPack(PACK_FILE) as pack:
+        return build_sprite_sheet(pack)
+
+def build_sprite_sheet(pack=None):
+    """Build the sprite sheet and map from an open icon pack, or from INPUT_DIR if pack is None."""
     
-    # Get all PNG files and extract item IDs
     icon_files = {}
-    for file in INPUT_DIR.iterdir():
-        if file.suffix == '.png':
-            try:
-                item_id = int(file.stem)
-                icon_files[item_id] = file
-            except ValueError:
-                print(f"⚠️  Skipping non-numeric file: {file.name}")
+    if pack is not None:
+        icon_files = {item_id: item_id for item_id in pack.ids}
+    else:
+        print(f"🔍 Scanning for icons in '{INPUT_DIR}'...")
+        
+        # Check if image directory exists
+        if not INPUT_DIR.exists():
+            print(f"❌ Error: Image directory not found: {INPUT_DIR}")
+            return False
+        
+        # Get all PNG files and extract item IDs
+        with span("scan"):
+            for file in INPUT_DIR.iterdir():
+                if file.suffix == '.png':
+                    try:
+                        item_id = int(file.stem)
+                        icon_files[item_id] = file
+                    except ValueError:
+                        print(f"⚠️  Skipping non-numeric file: {file.name}")
     
     if not icon_files:
         print(f"❌ No icon files found in '{INPUT_DIR}'")
@@ -80,16 +111,18 @@ def generate_sprite_sheet():
             y = row * ICON_SIZE
             
             # Load and paste icon
-            icon_path = icon_files[item_id]
-            icon = Image.open(icon_path)
+            with span("read", aggregate=True):
+                icon = pack.open_image(item_id) if pack is not None else Image.open(icon_files[item_id])
+                icon.load()
             
-            # Verify icon size
+            # Resize to ICON_SIZE if needed
             if icon.size != (ICON_SIZE, ICON_SIZE):
                 print(f"⚠️  Icon {item_id} is {icon.size}, expected {ICON_SIZE}x{ICON_SIZE} - resizing")
-                icon = icon.resize((ICON_SIZE, ICON_SIZE), Image.Resampling.NEAREST)
+            icon = fit_icon(icon)
             
             # Paste onto sprite
-            sprite.paste(icon, (x, y), icon if icon.mode == 'RGBA' else None)
+            with span("paste", aggregate=True):
+                paste_icon(sprite, icon, x, y)
             
             # Store position in map
             sprite_map[str(item_id)] = [col, row]
@@ -104,7 +137,8 @@ def generate_sprite_sheet():
     # Save sprite sheet
     print(f"💾 Saving sprite sheet to '{OUTPUT_SPRITE}'...")
     OUTPUT_SPRITE.parent.mkdir(parents=True, exist_ok=True)
-    sprite.save(OUTPUT_SPRITE, 'PNG', optimize=True)
+    with span("save"):
+        sprite.save(OUTPUT_SPRITE, 'PNG', optimize=True)
     
     # Get file size
     sprite_size_mb = OUTPUT_SPRITE.stat().st_size / (1024 * 1024)
@@ -124,7 +158,7 @@ def generate_sprite_sheet():
         "map": sprite_map
     }
     
-    with open(OUTPUT_MAP, 'w') as f:
+    with span("dump"), open(OUTPUT_MAP, 'w') as f:
         json.dump(map_data, f, separators=(',', ':'))  # Compact JSON
     
     map_size_kb = OUTPUT_MAP.stat().st_size / 1024
@@ -143,8 +177,9 @@ def generate_sprite_sheet():
 # ============================================================================
 
 if __name__ == "__main__":
+    setup_profiling("generate_sprite")
     try:
-        generate_sprite_sheet()
+        generate_sprite_sheet(use_pack="--pack" in sys.argv[1:])
     except Exception as e:
         print(f"\n❌ FATAL ERROR: {e}")
         import traceback
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+icon_pack.py
+
+Packed, random-access icon store: all image/item/*.png files in one file
+with a sorted ID index, so helpers open one file instead of thousands.
+
+Pack layout (little-endian):
+    magic     4s   b"OSRI"
+    version   u16
+    reserved  u16
+    count     u32
+    index     count x (id u32, offset u64, length u32, sha256[:16])  sorted by id
+    data      PNG bytes, back to back (offsets are from the start of the file)
+
+Content hashes live in the index, so changed or unchanged icons can be
+detected without touching the PNG data.
+
+USAGE:
+    python icon_pack.py import [dir]     # image/item/*.png -> image/item_icons.pack
+    python icon_pack.py export [dir]     # pack -> loose {id}.png files
+    python icon_pack.py diff [dir]       # added/changed/removed vs the pack
+    python icon_pack.py info
+"""
+
+import sys
+import mmap
+import struct
+import hashlib
+import bisect
+from array import array
+from pathlib import Path
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ICON_DIR = SCRIPT_DIR / ".." / "image" / "item"
+PACK_FILE = SCRIPT_DIR / ".." / "image" / "item_icons.pack"
+
+MAGIC = b"OSRI"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+ENTRY = struct.Struct("<IQI16s")
+
+def icon_hash(data):
+    return hashlib.sha256(data).digest()[:16]
+
+def scan_icon_dir(icon_dir):
+    """Return {item_id: path} for numeric PNGs in a loose icon directory"""
+    icons = {}
+    for file in Path(icon_dir).iterdir():
+        if file.suffix == '.png' and file.stem.isdigit():
+            icons[int(file.stem)] = file
+    return icons
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+def write_pack(icons, pack_path=PACK_FILE):
+    """Write {item_id: png bytes} to a pack file"""
+    ids = sorted(icons)
+    data_start = HEADER.size + ENTRY.size * len(ids)
+
+    index = bytearray()
+    offset = data_start
+    for item_id in ids:
+        data = icons[item_id]
+        index += ENTRY.pack(item_id, offset, len(data), icon_hash(data))
+        offset += len(data)
+
+    tmp = Path(pack_path).with_suffix(".pack.tmp")
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(ids)))
+        f.write(index)
+        for item_id in ids:
+            f.write(icons[item_id])
+    tmp.replace(pack_path)
+    return len(ids), offset
+
+# ============================================================================
+# READER
+# ============================================================================
+
+class IconPack:
+    """Memory-mapped random access to a pack file"""
+
+    def __init__(self, pack_path=PACK_FILE):
+        self.path = Path(pack_path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path.name} is not an icon pack (magic {magic!r})")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported icon pack version: {version}")
+
+        self.count = count
+        self.ids = array("I", (entry[0] for entry in ENTRY.iter_unpack(
+            self._mm[HEADER.size:HEADER.size + ENTRY.size * count])))
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, item_id):
+        return self._find(item_id) is not None
+
+    def _find(self, item_id):
+        i = bisect.bisect_left(self.ids, item_id)
+        if i < self.count and self.ids[i] == item_id:
+            return i
+        return None
+
+    def entry(self, item_id):
+        """(offset, length, hash) for an icon, or None"""
+        i = self._find(item_id)
+        if i is None:
+            return None
+        _, offset, length, digest = ENTRY.unpack_from(self._mm, HEADER.size + ENTRY.size * i)
+        return offset, length, digest
+
+    def get(self, item_id):
+        """PNG bytes for an icon, or None"""
+        found = self.entry(item_id)
+        if found is None:
+            return None
+        offset, length, _ = found
+        return self._mm[offset:offset + length]
+
+    def open_image(self, item_id):
+        """PIL image for an icon, or None"""
+        from io import BytesIO
+        from PIL import Image
+        data = self.get(item_id)
+        return Image.open(BytesIO(data)) if data is not None else None
+
+    def hashes(self):
+        """{item_id: hash} straight from the index"""
+        return {item_id: digest for item_id, _, _, digest in ENTRY.iter_unpack(
+            self._mm[HEADER.size:HEADER.size + ENTRY.size * self.count])}
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def cmd_import(icon_dir):
+    icons = {item_id: path.read_bytes() for item_id, path in scan_icon_dir(icon_dir).items()}
+    count, size = write_pack(icons)
+    print(f"✓ {count} icons → {PACK_FILE.name} ({size / (1024 * 1024):.2f} MB)")
+
+def cmd_export(icon_dir):
+    icon_dir = Path(icon_dir)
+    icon_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with IconPack() as pack:
+        for item_id in pack.ids:
+            target = icon_dir / f"{item_id}.png"
+            data = pack.get(item_id)
+            if not target.exists() or target.read_bytes() != data:
+                target.write_bytes(data)
+                written += 1
+        print(f"✓ {len(pack)} icons in pack, {written} written to {icon_dir}")
+
+def cmd_diff(icon_dir):
+    loose = scan_icon_dir(icon_dir)
+    with IconPack() as pack:
+        packed = pack.hashes()
+    added = sorted(set(loose) - set(packed))
+    removed = sorted(set(packed) - set(loose))
+    changed = sorted(i for i in set(loose) & set(packed) if icon_hash(loose[i].read_bytes()) != packed[i])
+
+    print(f"  Added:     {len(added)} {added[:10]}")
+    print(f"  Changed:   {len(changed)} {changed[:10]}")
+    print(f"  Removed:   {len(removed)} {removed[:10]}")
+    print(f"  Unchanged: {len(loose) - len(added) - len(changed)}")
+    return not (added or removed or changed)
+
+def cmd_info():
+    with IconPack() as pack:
+        size = PACK_FILE.stat().st_size
+        print(f"  {PACK_FILE.name}: {len(pack)} icons, {size / (1024 * 1024):.2f} MB")
+        if len(pack):
+            print(f"  ID range: {pack.ids[0]} - {pack.ids[-1]}")
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "info"
+    icon_dir = sys.argv[2] if len(sys.argv) > 2 else ICON_DIR
+
+    if command == "import":
+        cmd_import(icon_dir)
+    elif command == "export":
+        cmd_export(icon_dir)
+    elif command == "diff":
+        sys.exit(0 if cmd_diff(icon_dir) else 1)
+    elif command == "info":
+        cmd_info()
+    else:
+        print(f"Unknown command: {command} (expected import, export, diff or info)")
+        sys.exit(2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+instrument.py
+
+Shared timing / memory instrumentation for the helpers. Off by default; a
+helper run with --profile records timed spans for its stages and writes a
+JSON trace to helpers/.profile/<script>-<timestamp>-<pid>.json.
+
+    --profile            spans + tracemalloc peaks (slower: every allocation is traced)
+    --profile=time       spans only
+    --profile=cprofile   spans + cProfile (.prof next to the trace, top functions printed)
+
+In a helper:
+
+    from instrument import span, setup_profiling
+
+    with span("parse"):
+        ...
+    for icon in icons:
+        with span("paste", aggregate=True):   # summary only, no per-call record
+            ...
+
+    if __name__ == "__main__":
+        setup_profiling("generate_sprite")   # strips --profile from sys.argv
+        main()
+
+Traces from two builds can be compared span by span:
+
+    python instrument.py compare old.json new.json
+    python instrument.py show trace.json
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+from pathlib import Path
+from contextlib import contextmanager, nullcontext
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+PROFILE_DIR = SCRIPT_DIR / ".profile"
+
+TRACE_VERSION = 1
+CPROFILE_TOP = 15
+MB = 1024 * 1024
+
+class Profiler:
+    def __init__(self, script, mode):
+        self.script = script
+        self.mode = mode
+        self.memory = mode == "mem"
+        self.started = time.time()
+        self.origin = time.perf_counter()
+        self.stack = []       # open spans: [name, start, peak]
+        self.spans = []       # finished non-aggregate spans
+        self.summary = {}     # path -> {count, wall, peak}, in first-start order
+        self.cprofile = None
+
+        if self.memory:
+            import tracemalloc
+            self.tracemalloc = tracemalloc
+            tracemalloc.start()
+        if mode == "cprofile":
+            import cProfile
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def _traced_peak(self):
+        """Peak traced memory since the last reset, then reset it"""
+        _, peak = self.tracemalloc.get_traced_memory()
+        self.tracemalloc.reset_peak()
+        return peak
+
+    @contextmanager
+    def span(self, name, aggregate=False):
+        if self.memory:
+            # Hand the peak so far to the enclosing span before resetting
+            peak = self._traced_peak()
+            if self.stack:
+                self.stack[-1][2] = max(self.stack[-1][2], peak)
+        path = "/".join([f[0] for f in self.stack] + [name])
+        entry = self.summary.setdefault(path, {"count": 0, "wall": 0.0, "peak": 0})
+        frame = [name, time.perf_counter(), 0]
+        self.stack.append(frame)
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.stack.pop()
+            wall = end - frame[1]
+            peak = None
+            if self.memory:
+                frame[2] = max(frame[2], self._traced_peak())
+                peak = frame[2]
+                if self.stack:
+                    self.stack[-1][2] = max(self.stack[-1][2], peak)
+
+            entry["count"] += 1
+            entry["wall"] += wall
+            if peak is not None:
+                entry["peak"] = max(entry["peak"], peak)
+
+            if not aggregate:
+                self.spans.append({
+                    "name": path,
+                    "depth": len(self.stack),
+                    "start": round(frame[1] - self.origin, 6),
+                    "wall": round(wall, 6),
+                    "peak_mb": None if peak is None else round(peak / MB, 3),
+                })
+
+    def finish(self):
+        """Close the run, write the trace and print a short report"""
+        total = time.perf_counter() - self.origin
+        peak = None
+        if self.memory:
+            peak = max([self._traced_peak()] + [e["peak"] for e in self.summary.values()])
+            self.tracemalloc.stop()
+
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        # The pid keeps runs started in the same second apart
+        trace_path = PROFILE_DIR / f"{self.script}-{stamp}-{os.getpid()}.json"
+
+        prof_path = None
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            prof_path = trace_path.with_suffix(".prof")
+            self.cprofile.dump_stats(prof_path)
+
+        trace = {
+            "version": TRACE_VERSION,
+            "script": self.script,
+            "argv": sys.argv[1:],
+            "mode": self.mode,
+            "started": stamp,
+            "python": sys.version.split()[0],
+            "wall": round(total, 6),
+            "peak_mb": None if peak is None else round(peak / MB, 3),
+            "spans": self.spans,
+            "summary": {
+                path: {
+                    "count": e["count"],
+                    "wall": round(e["wall"], 6),
+                    "peak_mb": round(e["peak"] / MB, 3) if self.memory else None,
+                }
+                for path, e in self.summary.items()
+            },
+            "cprofile": prof_path.name if prof_path else None,
+        }
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, indent=2)
+
+        print_summary(trace)
+        if prof_path is not None:
+            import pstats
+            print(f"\ncProfile: top {CPROFILE_TOP} by cumulative time")
+            pstats.Stats(str(prof_path)).sort_stats("cumulative").print_stats(CPROFILE_TOP)
+        print(f"📈 Trace written to {trace_path}")
+
+_profiler = None
+
+def span(name, aggregate=False):
+    """Time a stage when profiling is enabled (no-op otherwise)"""
+    if _profiler is None:
+        return nullcontext()
+    return _profiler.span(name, aggregate)
+
+def setup_profiling(script):
+    """Enable profiling if --profile[=mode] is on the command line (and remove it)"""
+    global _profiler
+    mode = None
+    for arg in list(sys.argv[1:]):
+        if arg == "--profile" or arg.startswith("--profile="):
+            mode = arg.partition("=")[2] or "mem"
+            sys.argv.remove(arg)
+    if mode is None:
+        return None
+    if mode not in ("mem", "time", "cprofile"):
+        print(f"Unknown profile mode: {mode} (expected mem, time or cprofile)")
+        sys.exit(2)
+
+    _profiler = Profiler(script, mode)
+    atexit.register(_profiler.finish)
+    return _profiler
+
+# ============================================================================
+# REPORTS
+# ============================================================================
+
+def format_peak(value):
+    return f"{value:>9.1f}MB" if value is not None else f"{'':>11}"
+
+def summary_order(summary):
+    """Summary paths with each span's children right after it, in start order"""
+    children = {}
+    for path in summary:
+        children.setdefault(path.rpartition("/")[0], []).append(path)
+    ordered = []
+
+    def visit(parent):
+        for path in children.get(parent, []):
+            ordered.append(path)
+            visit(path)
+
+    visit("")
+    return ordered
+
+def print_summary(trace):
+    print(f"\n📈 Profile: {trace['script']} ({trace['mode']}), {trace['wall']:.3f}s total"
+          + (f", peak {trace['peak_mb']:.1f}MB traced" if trace.get("peak_mb") is not None else ""))
+    print(f"  {'span':<36} {'calls':>7} {'wall':>10} {'share':>7} {'peak':>11}")
+    for path in summary_order(trace["summary"]):
+        e = trace["summary"][path]
+        share = e["wall"] / trace["wall"] * 100 if trace["wall"] else 0
+        indent = "  " * path.count("/")
+        print(f"  {indent + path.rsplit('/', 1)[-1]:<36} {e['count']:>7} {e['wall']:>9.3f}s "
+              f"{share:>6.1f}% {format_peak(e['peak_mb'])}")
+
+def compare_traces(old, new):
+    print(f"\n{old['script']}: {old['started']} -> {new['started']}")
+    print(f"  {'span':<36} {'old':>10} {'new':>10} {'change':>9}")
+    paths = summary_order({**old["summary"], **new["summary"]})
+    for path in paths:
+        a = old["summary"].get(path, {}).get("wall")
+        b = new["summary"].get(path, {}).get("wall")
+        change = f"{(b - a) / a * 100:>+8.1f}%" if a and b is not None else f"{'':>9}"
+        fmt = lambda v: f"{v:>9.3f}s" if v is not None else f"{'-':>10}"
+        print(f"  {path:<36} {fmt(a)} {fmt(b)} {change}")
+    print(f"  {'total':<36} {old['wall']:>9.3f}s {new['wall']:>9.3f}s "
+          f"{(new['wall'] - old['wall']) / old['wall'] * 100:>+8.1f}%\n")
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "show" and len(sys.argv) == 3:
+        with open(sys.argv[2], "r", encoding="utf-8") as f:
+            print_summary(json.load(f))
+    elif command == "compare" and len(sys.argv) == 4:
+        with open(sys.argv[2], "r", encoding="utf-8") as f:
+            old = json.load(f)
+        with open(sys.argv[3], "r", encoding="utf-8") as f:
+            new = json.load(f)
+        compare_traces(old, new)
+    else:
+        print(f"Usage: python {os.path.basename(__file__)} show TRACE | compare OLD NEW")
+        sys.exit(2)
+
+if __name__ == "__main__":
+    main()
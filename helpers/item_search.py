@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+item_search.py
+
+Item search engine implementing the item list's query language
+(renderItemsCore in js/items.js) over the generated search indices, plus the
+JSON payload for serve_data.py's /search endpoint and a latency benchmark.
+
+Query language:
+    red potion          items matching every word
+    "red potion"        exact phrase (color codes stripped, case-insensitive)
+    -herb  -"red herb"  exclude a word / phrase
+    501                 all digits: item ID substring match
+Words match any index term that contains them (after stripping non-word
+characters), so "pot" finds "potion". With descriptions enabled, words and
+phrases also match the description index / text.
+
+Instead of scanning every index term per word, each index keeps its terms
+joined into one string: a word's matching terms are found with str.find, the
+union of their postings is cached per word, and include sets are intersected
+smallest first. Results are cached per (query, descriptions).
+
+Results come back in item list order: getAllItems() sorts by name with
+localeCompare. With PyICU installed (pip install PyICU) names are sorted
+with the same ICU root collation; otherwise with a key that compares base
+letters, then accents, then case, with punctuation and symbols in ICU's
+order. The benchmark checks the order against node's localeCompare when
+node is installed, and always against COLLATION_CASES.
+
+The HTTP/JSON endpoint is served by serve_data.py --search
+(GET /search?q=...&desc=1&limit=50&offset=0), next to the data files.
+
+USAGE:
+    python item_search.py "red potion" [--desc] [--limit 20]
+    python item_search.py bench                   # p50/p99 latency + check against the JS port
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import bisect
+import shutil
+import argparse
+import subprocess
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import icu
+except ImportError:
+    icu = None
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ITEMS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_items.json"
+INDEX_NAME_FILE = SCRIPT_DIR / ".." / "data" / "osromr_search_index_name.json"
+INDEX_DESC_FILE = SCRIPT_DIR / ".." / "data" / "osromr_search_index_desc.json"
+
+DEFAULT_LIMIT = 2000  # Same display limit as the item list
+RESULT_CACHE_SIZE = 4096
+TERM_CACHE_SIZE = 16384
+
+PHRASE_RE = re.compile(r'-?"([^"]+)"')
+COLOR_CODE_RE = re.compile(r'\^[0-9A-Fa-f]{6}')
+NON_WORD_RE = re.compile(r'[^\w]', re.ASCII)  # JS \w is ASCII-only
+
+# ASCII in ICU root collation order (what localeCompare uses); letters are
+# compared case-insensitively first, then lowercase before uppercase
+ICU_ASCII_ORDER = " _-,;:!?.'\"()[]{}@*/\\&#%`^+<=>|~$0123456789abcdefghijklmnopqrstuvwxyz"
+ASCII_WEIGHTS = {ch: weight for weight, ch in enumerate(ICU_ASCII_ORDER)}
+COLLATOR = icu.Collator.createInstance(icu.Locale.getRoot()) if icu is not None else None
+
+# Names in the order ["..."].sort((a, b) => a.localeCompare(b)) gives (node 22, ICU 77)
+COLLATION_CASES = [
+    "_x", "-x", "(Rare) Card", "[Event] Box", "+5 Sword", "10 Zeny", "9 Zeny",
+    "a b", "a_b", "a-b", "a.b", "ab", "Ab1", "ab10", "ab2", "apple", "Apple",
+    "äpple", "Äpple", "apple pie", "Apple-Pie", "applepie", "Box", "box 2",
+    "card", "Card", "eclair", "Eclair", "éclair", "x", "X",
+]
+
+# getAllItems() in js/items.js, fed the item database on stdin
+NODE_ITEM_ORDER = """
+let text = "";
+process.stdin.on("data", chunk => text += chunk).on("end", () => {
+  const items = JSON.parse(text);
+  const list = Object.entries(items).map(([id, item]) => ({ id: +id, name: item.name }))
+    .sort((a, b) => (a.name || "").localeCompare(b.name || ""));
+  process.stdout.write(JSON.stringify(list.map(item => item.id)));
+});
+"""
+
+# ============================================================================
+# QUERY PARSING
+# ============================================================================
+
+class Query:
+    __slots__ = ("numeric", "include_words", "include_phrases", "exclude_words", "exclude_phrases")
+
+    def __init__(self):
+        self.numeric = None
+        self.include_words = []
+        self.include_phrases = []
+        self.exclude_words = []
+        self.exclude_phrases = []
+
+def parse_query(text):
+    """Split a search box string the way renderItemsCore does"""
+    query = Query()
+    q = text.strip()
+    if q.isdigit() and q.isascii():
+        query.numeric = q
+        return query
+
+    def take_phrase(match):
+        target = query.exclude_phrases if match.group(0).startswith("-") else query.include_phrases
+        target.append(match.group(1).lower())
+        return ""
+
+    remaining = PHRASE_RE.sub(take_phrase, q)
+    for word in remaining.split():
+        if word.startswith("-"):
+            if len(word) > 1:
+                query.exclude_words.append(word[1:].lower())
+        else:
+            query.include_words.append(word.lower())
+    return query
+
+def clean_word(word):
+    """Strip punctuation for index lookup (word.replace(/[^\\w]/g, ''))"""
+    return NON_WORD_RE.sub("", word)
+
+def strip_color_codes(text):
+    return COLOR_CODE_RE.sub("", text or "")
+
+def collation_key(text):
+    """Sort key matching String.prototype.localeCompare"""
+    if COLLATOR is not None:
+        return COLLATOR.getSortKey(text)
+    primary = []
+    secondary = []
+    tertiary = []
+    for ch in text:
+        base, *marks = unicodedata.normalize("NFD", ch)
+        folded = base.lower()
+        weight = ASCII_WEIGHTS.get(folded)
+        primary.append(weight if weight is not None else len(ICU_ASCII_ORDER) + ord(folded))
+        secondary.append(tuple(ord(mark) for mark in marks))
+        tertiary.append(base != folded)
+    return primary, secondary, tertiary
+
+def item_list_order(items):
+    """Item IDs in getAllItems() order: by name, ties in key (ID) order"""
+    return sorted((int(item_id) for item_id in items),
+                  key=lambda i: (collation_key(items[str(i)].get("name") or ""), i))
+
+def node_item_order(items_path=ITEMS_FILE):
+    """Item IDs in the order the page's getAllItems() gives under node, or None without node"""
+    node = shutil.which("node")
+    if node is None:
+        return None
+    result = subprocess.run([node, "-e", NODE_ITEM_ORDER], input=Path(items_path).read_bytes(),
+                            capture_output=True, check=True)
+    return json.loads(result.stdout)
+
+def split_phrase(phrase):
+    """phrase.split(/\\s+/), including the empty words JS produces at the ends"""
+    return re.split(r"\s+", phrase)
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+class TermIndex:
+    """One search index with substring lookup over its vocabulary"""
+
+    def __init__(self, index):
+        self.terms = list(index)
+        self.postings = [index[term] for term in self.terms]
+        self.starts = []
+        pos = 0
+        for term in self.terms:
+            self.starts.append(pos)
+            pos += len(term) + 1
+        self.joined = "\n".join(self.terms)  # Tokens are \w+, never contain "\n"
+        self.all_ids = frozenset(i for ids in self.postings for i in ids)
+        self.lookup = lru_cache(maxsize=TERM_CACHE_SIZE)(self._lookup)
+
+    def _lookup(self, fragment):
+        """IDs under every term containing fragment"""
+        if not fragment:
+            return self.all_ids
+        ids = set()
+        joined, starts = self.joined, self.starts
+        pos = joined.find(fragment)
+        while pos != -1:
+            term_idx = bisect.bisect_right(starts, pos) - 1
+            ids.update(self.postings[term_idx])
+            if term_idx + 1 >= len(starts):
+                break
+            pos = joined.find(fragment, starts[term_idx + 1])
+        return frozenset(ids)
+
+class ItemSearch:
+    def __init__(self, items, name_index, desc_index):
+        self.items = items
+        self.name_index = TermIndex(name_index)
+        self.desc_index = TermIndex(desc_index)
+
+        self.ids = sorted(int(item_id) for item_id in items)
+        self.names = {}
+        self.descs = {}
+        for item_id, item in items.items():
+            self.names[int(item_id)] = strip_color_codes(item.get("name", "")).lower()
+            self.descs[int(item_id)] = strip_color_codes(item.get("desc", "")).lower()
+
+        # Item list order (getAllItems sorts by name)
+        self.rank = {item_id: pos for pos, item_id in enumerate(item_list_order(items))}
+
+        self.id_starts = []
+        pos = 0
+        for item_id in self.ids:
+            self.id_starts.append(pos)
+            pos += len(str(item_id)) + 1
+        self.id_joined = "\n".join(str(i) for i in self.ids)
+
+        self.search = lru_cache(maxsize=RESULT_CACHE_SIZE)(self._search)
+
+    @classmethod
+    def load(cls):
+        with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        with open(INDEX_NAME_FILE, "r", encoding="utf-8") as f:
+            name_index = json.load(f)
+        with open(INDEX_DESC_FILE, "r", encoding="utf-8") as f:
+            desc_index = json.load(f)
+        return cls(items, name_index, desc_index)
+
+    def clear_cache(self):
+        self.search.cache_clear()
+        self.name_index.lookup.cache_clear()
+        self.desc_index.lookup.cache_clear()
+
+    def word_ids(self, word, descriptions):
+        fragment = clean_word(word)
+        ids = self.name_index.lookup(fragment)
+        if descriptions:
+            ids = ids | self.desc_index.lookup(fragment)
+        return ids
+
+    def phrase_ids(self, phrase, descriptions):
+        """Items containing the exact phrase (candidates from word postings)"""
+        candidates = intersect([self.word_ids(word, descriptions) for word in split_phrase(phrase)])
+        return {
+            item_id for item_id in candidates
+            if item_id in self.names and (
+                phrase in self.names[item_id] or (descriptions and phrase in self.descs[item_id])
+            )
+        }
+
+    def id_substring(self, digits):
+        matches = []
+        joined, starts = self.id_joined, self.id_starts
+        pos = joined.find(digits)
+        while pos != -1:
+            idx = bisect.bisect_right(starts, pos) - 1
+            matches.append(self.ids[idx])
+            if idx + 1 >= len(starts):
+                break
+            pos = joined.find(digits, starts[idx + 1])
+        return matches
+
+    def _search(self, text, descriptions=False):
+        """Tuple of matching item IDs in item list (name) order"""
+        query = parse_query(text)
+        if not text.strip():
+            matches = self.ids
+        elif query.numeric is not None:
+            matches = self.id_substring(query.numeric)
+        else:
+            include = [self.word_ids(w, descriptions) for w in query.include_words]
+            include += [self.phrase_ids(p, descriptions) for p in query.include_phrases]
+            matches = intersect(include) if include else set(self.ids)
+
+            if query.exclude_words or query.exclude_phrases:
+                matches = set(matches)
+                for word in query.exclude_words:
+                    matches -= self.word_ids(word, descriptions)
+                for phrase in query.exclude_phrases:
+                    matches -= self.phrase_ids(phrase, descriptions)
+
+            matches = [item_id for item_id in matches if item_id in self.rank]
+        return tuple(sorted(matches, key=self.rank.__getitem__))
+
+def intersect(sets):
+    """Intersection of ID sets, smallest first"""
+    if not sets:
+        return set()
+    ordered = sorted(sets, key=len)
+    result = set(ordered[0])
+    for s in ordered[1:]:
+        if not result:
+            break
+        result &= s
+    return result
+
+# ============================================================================
+# REFERENCE (direct port of renderItemsCore, for checking)
+# ============================================================================
+
+def reference_search(text, items, name_index, desc_index, descriptions=False, order=None):
+    """
+    Matching IDs, scanning every index term per word like the JS does. Results
+    follow order (item IDs in list order, e.g. node_item_order()), or ID order.
+    """
+    all_ids = order if order is not None else sorted(int(i) for i in items)
+    q = text.strip()
+    if not q:
+        return all_ids
+    if q.isdigit() and q.isascii():
+        return [i for i in all_ids if q in str(i)]
+
+    def ids_for(word):
+        cw = clean_word(word)
+        ids = set()
+        for term, postings in name_index.items():
+            if cw in term:
+                ids.update(postings)
+        if descriptions:
+            for term, postings in desc_index.items():
+                if cw in term:
+                    ids.update(postings)
+        return ids
+
+    def phrase_matches(phrase):
+        word_sets = [ids_for(w) for w in split_phrase(phrase)]
+        matches = set()
+        for item_id in word_sets[0]:
+            if not all(item_id in s for s in word_sets):
+                continue
+            item = items.get(str(item_id))
+            if not item:
+                continue
+            if phrase in strip_color_codes(item.get("name", "")).lower() or (
+                descriptions and phrase in strip_color_codes(item.get("desc", "")).lower()
+            ):
+                matches.add(item_id)
+        return matches
+
+    query = parse_query(text)
+    include_sets = [ids_for(w) for w in query.include_words] + [phrase_matches(p) for p in query.include_phrases]
+    exclude = set()
+    for w in query.exclude_words:
+        exclude |= ids_for(w)
+    for p in query.exclude_phrases:
+        exclude |= phrase_matches(p)
+    return [i for i in all_ids if all(i in s for s in include_sets) and i not in exclude]
+
+# ============================================================================
+# JSON QUERY
+# ============================================================================
+
+def search_response(engine, params):
+    """(status, payload) for a /search request; params is a parse_qs() dict"""
+    text = params.get("q", [""])[0]
+    descriptions = params.get("desc", ["0"])[0] in ("1", "true")
+    try:
+        limit = max(0, int(params.get("limit", [DEFAULT_LIMIT])[0]))
+        offset = max(0, int(params.get("offset", [0])[0]))
+    except ValueError:
+        return 400, {"error": "limit and offset must be integers"}
+
+    ids = engine.search(text, descriptions)
+    page = ids[offset:offset + limit]
+    return 200, {
+        "query": text,
+        "descriptions": descriptions,
+        "total": len(ids),
+        "offset": offset,
+        "items": [{"id": i, "name": engine.items[str(i)].get("name", "")} for i in page],
+    }
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def sample_queries(engine, count=300, seed=42):
+    """Realistic query mix drawn from item names"""
+    rng = random.Random(seed)
+    words = [t for t in engine.name_index.terms if len(t) >= 3 and not t.isdigit()]
+    names = [n for n in engine.names.values() if " " in n]
+    queries = []
+    for _ in range(count):
+        kind = rng.randrange(6)
+        if kind == 0:
+            queries.append(rng.choice(words)[:rng.randint(3, 6)])
+        elif kind == 1:
+            queries.append(f"{rng.choice(words)} {rng.choice(words)[:4]}")
+        elif kind == 2:
+            parts = rng.choice(names).split()
+            queries.append('"' + " ".join(parts[:2]) + '"')
+        elif kind == 3:
+            queries.append(f"{rng.choice(words)[:4]} -{rng.choice(words)[:4]}")
+        elif kind == 4:
+            queries.append(f'{rng.choice(words)[:5]} -"{rng.choice(names).split()[0]}"')
+        else:
+            queries.append(str(rng.choice(engine.ids))[:rng.randint(2, 4)])
+    return queries
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda p: samples[min(len(samples) - 1, int(p / 100 * len(samples)))] * 1000
+    return pick(50), pick(99)
+
+def check_collation(engine):
+    """Compare the engine's sort key with localeCompare; returns the list order to check against (or None)"""
+    got = sorted(COLLATION_CASES, key=collation_key)
+    if got != COLLATION_CASES:
+        print(f"❌ collation_key disagrees with localeCompare on COLLATION_CASES:\n   expected {COLLATION_CASES}\n   got      {got}")
+        sys.exit(1)
+
+    order = node_item_order()
+    if order is None:
+        print("⚠️  node not found - item order checked against COLLATION_CASES only")
+        return None
+    ranked = sorted(engine.rank, key=engine.rank.__getitem__)
+    if ranked != order:
+        first = next(i for i, (a, b) in enumerate(zip(ranked, order)) if a != b)
+        print(f"❌ Item list order differs from node's localeCompare at position {first}: "
+              f"{engine.items[str(ranked[first])].get('name')!r} vs {engine.items[str(order[first])].get('name')!r}")
+        sys.exit(1)
+    print(f"✓ Item list order matches node's localeCompare on {len(order)} items")
+    return order
+
+def run_benchmark(engine, items, name_index, desc_index):
+    queries = sample_queries(engine)
+    print(f"\nItem search benchmark: {len(queries)} queries, {len(engine.ids)} items")
+    order = check_collation(engine)
+    if order is None:
+        # Without node the queries only check membership; order is covered by COLLATION_CASES
+        order = sorted(engine.rank, key=engine.rank.__getitem__)
+    print(f"  {'mode':<36} {'p50':>10} {'p99':>10}")
+
+    for descriptions in (False, True):
+        label = "names+desc" if descriptions else "names"
+
+        # Correctness against the direct port on a subset (the port is slow)
+        mismatches = [q for q in queries[:60]
+                      if list(engine.search(q, descriptions)) != reference_search(q, items, name_index, desc_index, descriptions, order)]
+        if mismatches:
+            print(f"❌ {len(mismatches)} queries differ from the JS port ({label}), e.g. {mismatches[:3]}")
+            sys.exit(1)
+
+        ref_times = []
+        for q in queries[:60]:
+            start = time.perf_counter()
+            reference_search(q, items, name_index, desc_index, descriptions, order)
+            ref_times.append(time.perf_counter() - start)
+
+        engine.clear_cache()
+        cold = []
+        for q in queries:
+            start = time.perf_counter()
+            engine.search(q, descriptions)
+            cold.append(time.perf_counter() - start)
+
+        engine.search.cache_clear()
+        term_warm = []
+        for q in queries:
+            start = time.perf_counter()
+            engine.search(q, descriptions)
+            term_warm.append(time.perf_counter() - start)
+
+        cached = []
+        for q in queries:
+            start = time.perf_counter()
+            engine.search(q, descriptions)
+            cached.append(time.perf_counter() - start)
+
+        for mode, samples in (("JS-style full scan", ref_times), ("engine, cold", cold),
+                              ("engine, term cache warm", term_warm), ("engine, result cached", cached)):
+            p50, p99 = percentiles(samples)
+            print(f"  {f'{label}: {mode}':<36} {p50:>8.3f}ms {p99:>8.3f}ms")
+
+    print(f"\n✓ Results match the JS port on {min(60, len(queries))} queries per mode\n")
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if command == "bench":
+        with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        with open(INDEX_NAME_FILE, "r", encoding="utf-8") as f:
+            name_index = json.load(f)
+        with open(INDEX_DESC_FILE, "r", encoding="utf-8") as f:
+            desc_index = json.load(f)
+        run_benchmark(ItemSearch(items, name_index, desc_index), items, name_index, desc_index)
+        return
+
+    parser = argparse.ArgumentParser(description="Search items with the item list query language")
+    parser.add_argument("query")
+    parser.add_argument("--desc", action="store_true", help="Also search descriptions")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = ItemSearch.load()
+    start = time.perf_counter()
+    ids = engine.search(args.query, args.desc)
+    elapsed = time.perf_counter() - start
+    for item_id in ids[:args.limit]:
+        print(f"  {item_id:>6}  {engine.items[str(item_id)].get('name', '')}")
+    print(f"\n{len(ids)} items ({elapsed * 1000:.2f}ms)")
+
+if __name__ == "__main__":
+    main()
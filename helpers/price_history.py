@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+price_history.py
+
+Append-only, columnar item price history. osromr_item_values.json holds one
+hand-edited value per item; this store keeps every snapshot so quest costs
+can use recent medians instead.
+
+Layout (data/price_history/):
+    ts.q, id.i, value.q               raw rows (unix seconds, item ID, zeny)
+    day.i, rid.i, min.q, max.q,
+    median.q, count.i                 daily rollups, one row per (day, item)
+
+Every column is a flat little-endian binary file. Rows are appended in
+timestamp order, so a time range is two binary searches over the
+memory-mapped ts column. An append only recomputes the rollups for the days
+it touches, which are always at the tail, so it costs the same no matter how
+long the history is.
+
+Columns are appended one after another, so a crash mid-append can leave them
+with different lengths. Opening the store truncates the raw columns to the
+shortest one and rebuilds the tail rollups if they don't match the raw rows.
+
+USAGE:
+    python price_history.py append [values.json] [--ts UNIX]   # default: osromr_item_values.json, now
+    python price_history.py query ID [--days N]
+    python price_history.py daily ID [--days N]
+    python price_history.py medians [--days N] [--out FILE]   # values.json-format recent medians
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import bisect
+import argparse
+from array import array
+from pathlib import Path
+from statistics import median
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+VALUES_FILE = SCRIPT_DIR / ".." / "data" / "osromr_item_values.json"
+HISTORY_DIR = SCRIPT_DIR / ".." / "data" / "price_history"
+
+DAY_SECONDS = 86400
+
+RAW_COLUMNS = [("ts", "q"), ("id", "i"), ("value", "q")]
+ROLLUP_COLUMNS = [("day", "i"), ("rid", "i"), ("min", "q"), ("max", "q"), ("median", "q"), ("count", "i")]
+COLUMN_TYPES = dict(RAW_COLUMNS + ROLLUP_COLUMNS)
+
+def _native(arr):
+    """Convert an array between native and little-endian byte order (in place)"""
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+class PriceHistory:
+    """Columnar price store rooted at a directory"""
+
+    def __init__(self, root=HISTORY_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._recover()
+
+    # ------------------------------------------------------------------------
+    # Column I/O
+    # ------------------------------------------------------------------------
+
+    def _path(self, name):
+        return self.root / f"{name}.{COLUMN_TYPES[name]}"
+
+    def _count(self, name):
+        path = self._path(name)
+        if not path.exists():
+            return 0
+        return path.stat().st_size // array(COLUMN_TYPES[name]).itemsize
+
+    def _map(self, name):
+        """Memory-mapped read-only view of a column (empty sequence if missing)"""
+        path = self._path(name)
+        code = COLUMN_TYPES[name]
+        if not path.exists() or path.stat().st_size == 0:
+            return array(code)
+        if sys.byteorder != "little":
+            return self._read(name, 0, self._count(name))
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mm).cast(code)
+
+    def _read(self, name, start, stop):
+        """Read rows [start, stop) of a column into an array"""
+        code = COLUMN_TYPES[name]
+        arr = array(code)
+        if stop <= start:
+            return arr
+        with open(self._path(name), "rb") as f:
+            f.seek(start * arr.itemsize)
+            arr.fromfile(f, stop - start)
+        return _native(arr)
+
+    def _append(self, name, values):
+        code = COLUMN_TYPES[name]
+        arr = _native(array(code, values))
+        with open(self._path(name), "ab") as f:
+            arr.tofile(f)
+
+    def _truncate(self, name, rows):
+        code = COLUMN_TYPES[name]
+        path = self._path(name)
+        if path.exists():
+            os.truncate(path, rows * array(code).itemsize)
+
+    # ------------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------------
+
+    def _recover(self):
+        """Repair columns left inconsistent by an interrupted append"""
+        raw = min(self._count(name) for name, _ in RAW_COLUMNS)
+        rollups = min(self._count(name) for name, _ in ROLLUP_COLUMNS)
+        uneven = any(self._count(name) != rollups for name, _ in ROLLUP_COLUMNS)
+        # Truncating also drops a partially written trailing value
+        for name, _ in RAW_COLUMNS:
+            self._truncate(name, raw)
+        for name, _ in ROLLUP_COLUMNS:
+            self._truncate(name, rollups)
+
+        if raw == 0:
+            for name, _ in ROLLUP_COLUMNS:
+                self._truncate(name, 0)
+            return
+
+        last_raw_day = self._read("ts", raw - 1, raw)[0] // DAY_SECONDS
+        if rollups == 0:
+            self._rebuild_rollups(self._read("ts", 0, 1)[0] // DAY_SECONDS, raw - 1)
+            return
+
+        # Rollup rows for the last rolled-up day must cover exactly that day's raw rows
+        last_day = self._read("day", rollups - 1, rollups)[0]
+        day_col = self._map("day")
+        day_start = bisect.bisect_left(day_col, last_day)
+        del day_col
+        ts_col = self._map("ts")
+        day_end = bisect.bisect_left(ts_col, (last_day + 1) * DAY_SECONDS)
+        raw_rows = day_end - bisect.bisect_left(ts_col, last_day * DAY_SECONDS)
+        del ts_col
+        rolled_rows = sum(self._read("count", day_start, rollups))
+
+        if uneven or last_day != last_raw_day or rolled_rows != raw_rows:
+            self._rebuild_rollups(min(last_day, last_raw_day), raw - 1)
+
+    def last_timestamp(self):
+        n = self._count("ts")
+        return self._read("ts", n - 1, n)[0] if n else None
+
+    def append(self, snapshot, ts=None):
+        """Append a {item_id: value} snapshot taken at unix time ts (default now)"""
+        ts = int(time.time()) if ts is None else int(ts)
+        last = self.last_timestamp()
+        if last is not None and ts < last:
+            raise ValueError(f"Snapshot at {ts} is older than the last recorded row ({last})")
+
+        rows = sorted((int(item_id), int(value)) for item_id, value in snapshot.items())
+        if not rows:
+            return 0
+
+        start_row = self._count("ts")
+        self._append("ts", [ts] * len(rows))
+        self._append("id", [item_id for item_id, _ in rows])
+        self._append("value", [value for _, value in rows])
+
+        self._rebuild_rollups(ts // DAY_SECONDS, start_row)
+        return len(rows)
+
+    def _rebuild_rollups(self, first_day, hint_row):
+        """Recompute rollups from first_day on, using only the raw tail"""
+        # Drop rollup rows for days being recomputed
+        days = self._map("day")
+        keep = bisect.bisect_left(days, first_day)
+        del days
+        for name, _ in ROLLUP_COLUMNS:
+            self._truncate(name, keep)
+
+        # Raw rows for those days start at or before the rows just appended
+        ts_col = self._map("ts")
+        start = bisect.bisect_left(ts_col, first_day * DAY_SECONDS, 0, hint_row + 1)
+        total = len(ts_col)
+        del ts_col
+
+        ts_vals = self._read("ts", start, total)
+        ids = self._read("id", start, total)
+        values = self._read("value", start, total)
+
+        groups = {}
+        for t, item_id, value in zip(ts_vals, ids, values):
+            groups.setdefault((t // DAY_SECONDS, item_id), []).append(value)
+
+        rollup = {name: [] for name, _ in ROLLUP_COLUMNS}
+        for (day, item_id), vals in sorted(groups.items()):
+            rollup["day"].append(day)
+            rollup["rid"].append(item_id)
+            rollup["min"].append(min(vals))
+            rollup["max"].append(max(vals))
+            rollup["median"].append(round(median(vals)))
+            rollup["count"].append(len(vals))
+        for name, _ in ROLLUP_COLUMNS:
+            self._append(name, rollup[name])
+
+    # ------------------------------------------------------------------------
+    # Reader
+    # ------------------------------------------------------------------------
+
+    def _row_range(self, start_ts, end_ts):
+        ts_col = self._map("ts")
+        lo = 0 if start_ts is None else bisect.bisect_left(ts_col, start_ts)
+        hi = len(ts_col) if end_ts is None else bisect.bisect_left(ts_col, end_ts)
+        return lo, hi
+
+    def query(self, item_id, start_ts=None, end_ts=None):
+        """
+        [(ts, value)] for one item within [start_ts, end_ts). Raw rows are in
+        time order, not grouped by item, so this scans every row in the range
+        (linear in the range size); daily() is the cheap path for long ranges.
+        """
+        lo, hi = self._row_range(start_ts, end_ts)
+        ts_vals = self._read("ts", lo, hi)
+        ids = self._read("id", lo, hi)
+        values = self._read("value", lo, hi)
+        return [(t, v) for t, i, v in zip(ts_vals, ids, values) if i == item_id]
+
+    def daily(self, item_id, start_day=None, end_day=None):
+        """[(day, min, max, median, count)] for one item within [start_day, end_day)"""
+        days = self._map("day")
+        lo = 0 if start_day is None else bisect.bisect_left(days, start_day)
+        hi = len(days) if end_day is None else bisect.bisect_left(days, end_day)
+        del days
+        cols = [self._read(name, lo, hi) for name, _ in ROLLUP_COLUMNS]
+        return [
+            (day, mn, mx, med, count)
+            for day, rid, mn, mx, med, count in zip(*cols)
+            if rid == item_id
+        ]
+
+    def recent_medians(self, days=7, now=None):
+        """{item_id: median of daily medians over the last N days}"""
+        now = int(time.time()) if now is None else int(now)
+        first_day = now // DAY_SECONDS - days + 1
+        day_col = self._map("day")
+        lo = bisect.bisect_left(day_col, first_day)
+        hi = len(day_col)
+        del day_col
+
+        per_item = {}
+        for rid, med in zip(self._read("rid", lo, hi), self._read("median", lo, hi)):
+            per_item.setdefault(rid, []).append(med)
+        return {item_id: round(median(meds)) for item_id, meds in sorted(per_item.items())}
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def format_day(day):
+    return time.strftime("%Y-%m-%d", time.gmtime(day * DAY_SECONDS))
+
+def main():
+    parser = argparse.ArgumentParser(description="Append-only item price history")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_append = sub.add_parser("append", help="Append a values snapshot")
+    p_append.add_argument("file", nargs="?", default=str(VALUES_FILE))
+    p_append.add_argument("--ts", type=int, default=None, help="Snapshot unix time (default: now)")
+
+    p_query = sub.add_parser("query", help="Raw price points for an item")
+    p_query.add_argument("id", type=int)
+    p_query.add_argument("--days", type=int, default=None)
+
+    p_daily = sub.add_parser("daily", help="Daily min/max/median for an item")
+    p_daily.add_argument("id", type=int)
+    p_daily.add_argument("--days", type=int, default=None)
+
+    p_medians = sub.add_parser("medians", help="Recent medians in osromr_item_values.json format")
+    p_medians.add_argument("--days", type=int, default=7)
+    p_medians.add_argument("--out", default=None)
+
+    args = parser.parse_args()
+    history = PriceHistory()
+    now = int(time.time())
+
+    if args.command == "append":
+        with open(args.file, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        count = history.append(snapshot, args.ts)
+        print(f"✓ Appended {count} prices from {Path(args.file).name} "
+              f"({history._count('ts')} rows, {history._count('day')} daily rollups)")
+
+    elif args.command == "query":
+        start = now - args.days * DAY_SECONDS if args.days else None
+        for ts, value in history.query(args.id, start):
+            print(f"  {time.strftime('%Y-%m-%d %H:%M', time.gmtime(ts))}  {value:,}")
+
+    elif args.command == "daily":
+        start = now // DAY_SECONDS - args.days + 1 if args.days else None
+        for day, mn, mx, med, count in history.daily(args.id, start):
+            print(f"  {format_day(day)}  min {mn:,}  max {mx:,}  median {med:,}  ({count} points)")
+
+    elif args.command == "medians":
+        medians = history.recent_medians(args.days, now)
+        values = {str(item_id): value for item_id, value in medians.items() if value > 0}
+        text = json.dumps(values, indent=2)
+        if args.out:
+            Path(args.out).write_text(text, encoding="utf-8")
+            print(f"✓ {len(values)} medians over {args.days} days → {args.out}")
+        else:
+            print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+publish_data.py
+
+Publish stage for data artifacts. Copies every data/*.json file and the item
+sprite into publish/ under content-hashed names (immutable, cache forever),
+writes gzip and brotli variants of each, and writes publish/manifest.json
+mapping the logical keys from FILES in js/config.js to hashed names and sizes.
+
+With USE_PUBLISH_MANIFEST in js/config.js the page reads the manifest and
+loads each file from its hashed URL under PUBLISH_PREFIX. The .gz/.br
+siblings are for hosts that serve precompressed files via Content-Encoding;
+the page always requests the plain hashed name.
+
+GitHub Pages serves this repository as-is, so publish/ is deployed by
+committing it: run this script (then generate_precache_manifest.py, which
+lists the hashed files while the flag is on) and commit publish/ with the
+VERSION bump.
+
+Brotli variants need the 'brotli' package (pip install brotli); without it
+only gzip variants are written.
+
+Artifacts are checked against the size budgets first (check_budgets.py);
+publishing stops if one is over. --no-budgets skips the gate. Each artifact
+is compressed once and the gate measures those same bytes.
+"""
+
+import re
+import sys
+import gzip
+import json
+import shutil
+import hashlib
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from instrument import span, setup_profiling
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = SCRIPT_DIR / ".."
+DATA_DIR = ROOT_DIR / "data"
+CONFIG_FILE = ROOT_DIR / "js" / "config.js"
+SPRITE_FILE = ROOT_DIR / "image" / "item_sprite.png"
+OUTPUT_DIR = ROOT_DIR / "publish"
+MANIFEST_FILE = OUTPUT_DIR / "manifest.json"
+
+HASH_LENGTH = 12
+SPRITE_KEY = "sprite"
+
+# Build outputs in data/ that the page doesn't load (yet); gitignored too
+UNPUBLISHED = {
+    "osromr_items_dict.json",           # desc_dictionary.py
+    "osromr_item_desc_segments.json",   # generate_desc_segments.py
+}
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+VERSION_RE = re.compile(r"^const VERSION\s*=\s*(\d+);", re.MULTILINE)
+FILES_BLOCK_RE = re.compile(r"^const FILES\s*=\s*{(.*?)^};", re.MULTILINE | re.DOTALL)
+FILES_ENTRY_RE = re.compile(r"(\w+)\s*:\s*\"([^\"]+)\"")
+PUBLISH_FLAG_RE = re.compile(r"^const USE_PUBLISH_MANIFEST\s*=\s*(true|false);", re.MULTILINE)
+
+# ============================================================================
+# CONFIG
+# ============================================================================
+
+def read_config():
+    """Return (VERSION, FILES) parsed from js/config.js"""
+    text = CONFIG_FILE.read_text(encoding="utf-8")
+
+    version_match = VERSION_RE.search(text)
+    version = int(version_match.group(1)) if version_match else None
+
+    files = {}
+    block = FILES_BLOCK_RE.search(text)
+    if block:
+        files = dict(FILES_ENTRY_RE.findall(block.group(1)))
+
+    return version, files
+
+def publish_manifest_enabled():
+    """True if USE_PUBLISH_MANIFEST is on in js/config.js"""
+    match = PUBLISH_FLAG_RE.search(CONFIG_FILE.read_text(encoding="utf-8"))
+    return bool(match) and match.group(1) == "true"
+
+def logical_key(path):
+    """Derive a FILES-style key for data files not listed in config.js"""
+    stem = path.stem
+    if stem.startswith("osromr_"):
+        stem = stem[len("osromr_"):]
+    head, *rest = stem.split("_")
+    return head + "".join(part.title() for part in rest)
+
+def is_dev_file(path):
+    """Local preview outputs of watch.py (*.dev.json, *.dev.png), never published"""
+    return path.suffixes[-2:-1] == [".dev"]
+
+def collect_artifacts():
+    """Return {logical key: path} for every publishable artifact"""
+    _, files = read_config()
+    by_name = {name: key for key, name in files.items()}
+
+    artifacts = {}
+    for path in sorted(DATA_DIR.glob("*.json")):
+        if is_dev_file(path) or path.name in UNPUBLISHED:
+            continue
+        artifacts[by_name.get(path.name) or logical_key(path)] = path
+    if SPRITE_FILE.exists():
+        artifacts[SPRITE_KEY] = SPRITE_FILE
+    return artifacts
+
+# ============================================================================
+# HASHING / COMPRESSION
+# ============================================================================
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+def hashed_name(path, digest):
+    return f"{path.stem}.{digest}{path.suffix}"
+
+def compress_gzip(data):
+    # mtime=0 keeps output deterministic for identical input
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=11)
+
+def compress_artifact(path):
+    """(raw bytes, {encoding: compressed bytes}) for one artifact, as published"""
+    with span("read", aggregate=True):
+        data = path.read_bytes()
+    variants = {}
+    with span("compress_gzip", aggregate=True):
+        variants["gzip"] = compress_gzip(data)
+    if brotli is not None:
+        with span("compress_br", aggregate=True):
+            variants["br"] = compress_brotli(data)
+    return data, variants
+
+# ============================================================================
+# PUBLISH
+# ============================================================================
+
+def publish_artifact(path, data, variants):
+    """Write hashed raw/gzip/brotli copies of one file, return its manifest entry"""
+    digest = content_hash(data)
+    name = hashed_name(path, digest)
+
+    entry = {
+        "source": path.name,
+        "file": name,
+        "hash": digest,
+        "size": len(data),
+    }
+
+    (OUTPUT_DIR / name).write_bytes(data)
+
+    for encoding, packed in variants.items():
+        suffix = SUFFIXES[encoding]
+        (OUTPUT_DIR / (name + suffix)).write_bytes(packed)
+        entry[encoding] = {"file": name + suffix, "size": len(packed)}
+
+    return entry
+
+def format_size(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.2f} MB"
+    return f"{size / 1024:.1f} KB"
+
+def main():
+    version, _ = read_config()
+    artifacts = collect_artifacts()
+
+    with span("compress"):
+        packed = {key: compress_artifact(path) for key, path in artifacts.items()}
+
+    if "--no-budgets" in sys.argv[1:]:
+        print("\n⚠️  Skipping budget checks (--no-budgets)")
+    else:
+        from check_budgets import run_checks
+        with span("budgets"):
+            within = run_checks(packed=packed)
+        if not within:
+            print("❌ Not publishing: artifacts over budget (fix them, update helpers/budgets.json, or pass --no-budgets)")
+            sys.exit(1)
+
+    print("\nPublishing data artifacts...")
+
+    if brotli is None:
+        print("⚠️  'brotli' not installed - skipping .br variants (pip install brotli)")
+
+    # Start from a clean directory so stale hashes don't linger
+    if OUTPUT_DIR.exists():
+        shutil.rmtree(OUTPUT_DIR)
+    OUTPUT_DIR.mkdir(parents=True)
+
+    manifest = {"version": version, "files": {}}
+
+    print(f"\n  {'key':<20} {'raw':>10} {'gzip':>10} {'br':>10}  file")
+    totals = {"size": 0, "gzip": 0, "br": 0}
+    for key, path in artifacts.items():
+        with span(f"publish:{key}"):
+            entry = publish_artifact(path, *packed[key])
+        manifest["files"][key] = entry
+
+        totals["size"] += entry["size"]
+        gz = entry["gzip"]["size"]
+        totals["gzip"] += gz
+        br = entry.get("br", {}).get("size")
+        if br is not None:
+            totals["br"] += br
+        br_text = format_size(br) if br is not None else "-"
+        print(f"  {key:<20} {format_size(entry['size']):>10} {format_size(gz):>10} {br_text:>10}  {entry['file']}")
+
+    br_total = format_size(totals["br"]) if brotli is not None else "-"
+    print(f"  {'TOTAL':<20} {format_size(totals['size']):>10} {format_size(totals['gzip']):>10} {br_total:>10}")
+
+    with open(MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"\n✓ {len(artifacts)} artifacts → {OUTPUT_DIR.resolve()}")
+    print(f"✓ Manifest for VERSION {version} → {MANIFEST_FILE.name}\n")
+
+if __name__ == "__main__":
+    setup_profiling("publish_data")
+    main()
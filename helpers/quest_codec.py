@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+quest_codec.py
+
+Compact interned encoding for osromr_quests.json and osromr_shops.json.
+
+The editor's exportQuests/exportShops output (pretty-printed JSON) stays the
+readable source of truth. This codec packs it into a compact form:
+  - every object becomes [shapeIdx, defaultMask, ...values], where the shape
+    is an interned key order and defaultMask marks keys holding their default
+    value (those values are omitted)
+  - repeated strings (names, captions, descriptions) are interned
+  - requirements become typed tuples [typeEnum, amount] or
+    [typeEnum, amount, id], plus a flags int when immune/key order differ
+
+Decoding reproduces the original file byte-for-byte.
+
+USAGE:
+    python quest_codec.py encode      # data/osromr_*.json -> data/osromr_*_packed.json
+    python quest_codec.py decode      # data/osromr_*_packed.json -> data/osromr_*.json
+    python quest_codec.py check       # round-trip both files and compare bytes
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR / ".." / "data"
+DATASETS = {
+    "quests": (DATA_DIR / "osromr_quests.json", DATA_DIR / "osromr_quests_packed.json"),
+    "shops": (DATA_DIR / "osromr_shops.json", DATA_DIR / "osromr_shops_packed.json"),
+}
+
+FORMAT_NAME = "osromr-packed"
+FORMAT_VERSION = 1
+
+# Requirement type enum (order of REQ_TYPE_OPTIONS in js/quests.js, then
+# CURRENCY_NAMES extras). Append only - indices are stored in packed files.
+REQ_TYPES = [
+    "item",
+    "zeny",
+    "gold",
+    "credit",
+    "vote_points",
+    "hourly_points",
+    "activity_points",
+    "instance_points",
+    "monster_arena_points",
+    "otherworld_points",
+    "hall_of_heritage_points",
+    "token_points",
+    "cardo_points",
+    "event_points",
+]
+REQ_TYPE_INDEX = {t: i for i, t in enumerate(REQ_TYPES)}
+
+# Requirement flags
+REQ_IMMUNE = 1          # "immune": true present
+REQ_IMMUNE_FALSE = 2    # "immune": false present
+REQ_AMOUNT_FIRST = 4    # item key order is type, amount, id
+
+# Values omitted from packed records when a key holds them
+DEFAULTS = {
+    "description": "",
+    "accountBound": False,
+    "successRate": 100,
+    "caption": "",
+}
+
+# Keys whose values are interned strings
+STRING_KEYS = {"name", "description", "caption"}
+
+# Keys whose values are lists of nested records
+LIST_KEYS = {"groups", "subgroups", "quests", "shops"}
+
+# ============================================================================
+# REQUIREMENTS
+# ============================================================================
+
+def encode_requirement(req):
+    """Requirement dict -> typed tuple, or the dict itself if it has an unusual shape"""
+    keys = list(req.keys())
+    type_idx = REQ_TYPE_INDEX.get(req.get("type"))
+    if type_idx is None or not isinstance(req.get("amount"), int):
+        return req
+
+    flags = 0
+    base = [k for k in keys if k != "immune"]
+    if "immune" in req:
+        if keys[-1] != "immune" or not isinstance(req["immune"], bool):
+            return req
+        flags |= REQ_IMMUNE if req["immune"] else REQ_IMMUNE_FALSE
+
+    if req["type"] == "item":
+        if not isinstance(req.get("id"), int):
+            return req
+        if base == ["type", "amount", "id"]:
+            flags |= REQ_AMOUNT_FIRST
+        elif base != ["type", "id", "amount"]:
+            return req
+        packed = [type_idx, req["amount"], req["id"]]
+    else:
+        if base != ["type", "amount"]:
+            return req
+        packed = [type_idx, req["amount"]]
+
+    if flags:
+        packed.append(flags)
+    return packed
+
+def decode_requirement(packed):
+    """Typed tuple -> requirement dict (dicts pass through unchanged)"""
+    if isinstance(packed, dict):
+        return packed
+
+    req_type = REQ_TYPES[packed[0]]
+    amount = packed[1]
+    if req_type == "item":
+        flags = packed[3] if len(packed) > 3 else 0
+        if flags & REQ_AMOUNT_FIRST:
+            req = {"type": req_type, "amount": amount, "id": packed[2]}
+        else:
+            req = {"type": req_type, "id": packed[2], "amount": amount}
+    else:
+        flags = packed[2] if len(packed) > 2 else 0
+        req = {"type": req_type, "amount": amount}
+
+    if flags & REQ_IMMUNE:
+        req["immune"] = True
+    elif flags & REQ_IMMUNE_FALSE:
+        req["immune"] = False
+    return req
+
+# ============================================================================
+# RECORDS
+# ============================================================================
+
+class Encoder:
+    """Interns strings and key shapes while packing nested records"""
+
+    def __init__(self):
+        self.strings = []
+        self.string_index = {}
+        self.shapes = []
+        self.shape_index = {}
+
+    def intern_string(self, value):
+        idx = self.string_index.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self.string_index[value] = idx
+            self.strings.append(value)
+        return idx
+
+    def intern_shape(self, keys):
+        keys = tuple(keys)
+        idx = self.shape_index.get(keys)
+        if idx is None:
+            idx = len(self.shapes)
+            self.shape_index[keys] = idx
+            self.shapes.append(list(keys))
+        return idx
+
+    def encode_value(self, key, value):
+        if key in STRING_KEYS:
+            # Non-string values are boxed so they can't be mistaken for indices
+            return self.intern_string(value) if isinstance(value, str) else [value]
+        if key in LIST_KEYS and isinstance(value, list):
+            return [self.encode_record(v) for v in value]
+        if key == "requirements" and isinstance(value, list):
+            return [encode_requirement(r) for r in value]
+        return value
+
+    def encode_record(self, record):
+        """dict -> [shapeIdx, defaultMask, ...non-default values]"""
+        shape = self.intern_shape(record.keys())
+        mask = 0
+        values = []
+        for bit, (key, value) in enumerate(record.items()):
+            # type() check keeps 1 == True and 0 == False from being folded
+            if key in DEFAULTS and type(value) is type(DEFAULTS[key]) and value == DEFAULTS[key]:
+                mask |= 1 << bit
+            else:
+                values.append(self.encode_value(key, value))
+        return [shape, mask] + values
+
+class Decoder:
+    def __init__(self, packed):
+        if packed.get("format") != FORMAT_NAME:
+            raise ValueError(f"Not a packed quest file: format={packed.get('format')!r}")
+        if packed.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported packed version: {packed.get('version')}")
+        self.strings = packed["strings"]
+        self.shapes = packed["shapes"]
+
+    def decode_value(self, key, value):
+        if key in STRING_KEYS:
+            return self.strings[value] if isinstance(value, int) else value[0]
+        if key in LIST_KEYS and isinstance(value, list):
+            return [self.decode_record(v) for v in value]
+        if key == "requirements" and isinstance(value, list):
+            return [decode_requirement(r) for r in value]
+        return value
+
+    def decode_record(self, packed):
+        keys = self.shapes[packed[0]]
+        mask = packed[1]
+        values = iter(packed[2:])
+        record = {}
+        for bit, key in enumerate(keys):
+            if mask & (1 << bit):
+                record[key] = DEFAULTS[key]
+            else:
+                record[key] = self.decode_value(key, next(values))
+        return record
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def encode(data):
+    """Quest/shop export dict -> packed dict"""
+    encoder = Encoder()
+    root = encoder.encode_record(data)
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "reqTypes": REQ_TYPES,
+        "strings": encoder.strings,
+        "shapes": encoder.shapes,
+        "root": root,
+    }
+
+def decode(packed):
+    """Packed dict -> quest/shop export dict"""
+    return Decoder(packed).decode_record(packed["root"])
+
+def dumps_packed(packed):
+    return json.dumps(packed, ensure_ascii=False, separators=(',', ':'))
+
+def dumps_source(data):
+    """Serialize the same way as downloadJSON (JSON.stringify(data, null, 2))"""
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def encode_file(source_path, packed_path):
+    source_text = source_path.read_text(encoding="utf-8")
+    packed_text = dumps_packed(encode(json.loads(source_text)))
+    packed_path.write_text(packed_text, encoding="utf-8")
+    src_kb = len(source_text.encode("utf-8")) / 1024
+    out_kb = len(packed_text.encode("utf-8")) / 1024
+    print(f"✓ {source_path.name} ({src_kb:.1f} KB) → {packed_path.name} ({out_kb:.1f} KB, {out_kb / src_kb * 100:.1f}%)")
+
+def decode_file(packed_path, source_path):
+    packed = json.loads(packed_path.read_text(encoding="utf-8"))
+    source_path.write_text(dumps_source(decode(packed)), encoding="utf-8")
+    print(f"✓ {packed_path.name} → {source_path.name}")
+
+def check_file(source_path):
+    source_bytes = source_path.read_bytes()
+    packed_text = dumps_packed(encode(json.loads(source_bytes.decode("utf-8"))))
+    restored = dumps_source(decode(json.loads(packed_text))).encode("utf-8")
+    if restored == source_bytes:
+        print(f"✓ {source_path.name}: round trip is byte-identical")
+        return True
+    print(f"❌ {source_path.name}: round trip differs ({len(source_bytes)} → {len(restored)} bytes)")
+    return False
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+
+    if command == "encode":
+        for source_path, packed_path in DATASETS.values():
+            encode_file(source_path, packed_path)
+    elif command == "decode":
+        for source_path, packed_path in DATASETS.values():
+            decode_file(packed_path, source_path)
+    elif command == "check":
+        ok = all([check_file(source_path) for source_path, _ in DATASETS.values()])
+        sys.exit(0 if ok else 1)
+    else:
+        print(f"Unknown command: {command} (expected encode, decode or check)")
+        sys.exit(2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+quest_solver.py
+
+"What can I craft?" solver. Takes a player inventory (item ID -> count plus
+currencies) and evaluates every quest and shop entry in one pass over a flat
+requirement matrix. Reports completable entries, missing-material deficits and
+the top-N entries closest to completion.
+
+Inventory file format (JSON):
+    {
+      "items": {"501": 120, "7104": 30},
+      "zeny": 25000000,
+      "gold": 12,
+      "vote_points": 300
+    }
+
+"gold" and "credit" are items (969 / 40001), same as SPECIAL_ITEMS in
+config.js, so they may be given either as currencies or inside "items".
+
+USAGE:
+    python quest_solver.py inventory.json [--top 10]
+"""
+
+import json
+import argparse
+from array import array
+from pathlib import Path
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ITEMS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_items.json"
+QUESTS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_quests.json"
+SHOPS_FILE = SCRIPT_DIR / ".." / "data" / "osromr_shops.json"
+
+# Currencies that are really items (mirrors SPECIAL_ITEMS in js/config.js)
+SPECIAL_ITEMS = {
+    "gold": 969,
+    "credit": 40001,
+}
+
+def requirement_key(req):
+    """Map a requirement to its inventory column key (item ID or currency name)"""
+    req_type = req.get("type")
+    if req_type == "item":
+        return req.get("id")
+    if req_type in SPECIAL_ITEMS:
+        return SPECIAL_ITEMS[req_type]
+    return req_type
+
+def iter_entries(quests_data, shops_data):
+    """Yield (kind, groupIdx, subIdx, idx, group, subgroup, entry) for every quest and shop"""
+    for kind, data, list_key in (("quest", quests_data, "quests"), ("shop", shops_data, "shops")):
+        for group_idx, group in enumerate((data or {}).get("groups", [])):
+            for sub_idx, subgroup in enumerate(group.get("subgroups", [])):
+                for idx, entry in enumerate(subgroup.get(list_key, [])):
+                    yield kind, group_idx, sub_idx, idx, group, subgroup, entry
+
+def load_inventory(raw):
+    """Normalize an inventory dict into {column key: count}"""
+    inventory = {}
+    for item_id, count in (raw.get("items") or {}).items():
+        inventory[int(item_id)] = inventory.get(int(item_id), 0) + int(count)
+    for key, count in raw.items():
+        if key == "items":
+            continue
+        col = SPECIAL_ITEMS.get(key, key)
+        inventory[col] = inventory.get(col, 0) + int(count)
+    return inventory
+
+class QuestSolver:
+    """
+    Requirement matrix over all quests and shops, stored CSR-style:
+    row_start[r]..row_start[r+1] indexes into cols/amounts for entry r.
+    An inverted index (column -> rows) limits re-checks on inventory updates.
+
+    Requirements without an item ID or with a non-positive amount can't be
+    met; they count as permanently missing, so their entries are reported by
+    invalid() and never as completable.
+    """
+
+    def __init__(self, quests_data, shops_data):
+        self.entries = []       # per-row metadata
+        self.columns = []       # column index -> key (item ID or currency)
+        self.col_index = {}     # key -> column index
+        self.row_start = array("l", [0])
+        self.cols = array("l")
+        self.amounts = array("q")
+        self.col_rows = []      # inverted index: column index -> list of rows
+        self.bad = array("l")   # per-row count of unsatisfiable requirements
+
+        for kind, g_idx, s_idx, idx, group, subgroup, entry in iter_entries(quests_data, shops_data):
+            row = len(self.entries)
+            self.entries.append({
+                "kind": kind,
+                "path": (g_idx, s_idx, idx),
+                "name": entry.get("name", ""),
+                "group": group.get("name", ""),
+                "subgroup": subgroup.get("name", ""),
+                "producesId": entry.get("producesId"),
+            })
+
+            # Merge duplicate requirements of the same column within one entry
+            needs = {}
+            bad = 0
+            for req in entry.get("requirements", []):
+                key = requirement_key(req)
+                amount = req.get("amount") or 0
+                if key is None or amount <= 0:
+                    bad += 1
+                    continue
+                needs[key] = needs.get(key, 0) + amount
+            self.bad.append(bad)
+
+            for key, amount in needs.items():
+                col = self.col_index.get(key)
+                if col is None:
+                    col = len(self.columns)
+                    self.col_index[key] = col
+                    self.columns.append(key)
+                    self.col_rows.append([])
+                self.cols.append(col)
+                self.amounts.append(amount)
+                self.col_rows[col].append(row)
+            self.row_start.append(len(self.cols))
+
+        self.have = array("q", [0] * len(self.columns))
+        self.missing_count = array("l", [0] * len(self.entries))
+        self.progress = array("d", [0.0] * len(self.entries))
+
+    # ------------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------------
+
+    def _evaluate_row(self, row):
+        """Recompute missing requirement count and completion ratio for one row"""
+        start, end = self.row_start[row], self.row_start[row + 1]
+        bad = self.bad[row]
+        if start == end and not bad:
+            self.missing_count[row] = 0
+            self.progress[row] = 1.0
+            return
+        missing = bad
+        ratio = 0.0
+        have, cols, amounts = self.have, self.cols, self.amounts
+        for k in range(start, end):
+            got = have[cols[k]]
+            need = amounts[k]
+            if got < need:
+                missing += 1
+                ratio += got / need
+            else:
+                ratio += 1.0
+        self.missing_count[row] = missing
+        self.progress[row] = ratio / (end - start + bad)
+
+    def set_inventory(self, inventory):
+        """Load a full inventory and evaluate every row in one pass"""
+        for col in range(len(self.columns)):
+            self.have[col] = 0
+        for key, count in inventory.items():
+            col = self.col_index.get(key)
+            if col is not None:
+                self.have[col] = count
+        for row in range(len(self.entries)):
+            self._evaluate_row(row)
+
+    def update(self, changes):
+        """
+        Apply {key: new count} changes and re-check only the rows that
+        reference a changed column. Returns the set of re-evaluated rows.
+        """
+        dirty = set()
+        for key, count in changes.items():
+            col = self.col_index.get(key)
+            if col is None or self.have[col] == count:
+                continue
+            self.have[col] = count
+            dirty.update(self.col_rows[col])
+        for row in dirty:
+            self._evaluate_row(row)
+        return dirty
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    def deficits(self, row):
+        """Return [(key, need, have, short)] for every unmet requirement of a row"""
+        result = []
+        for k in range(self.row_start[row], self.row_start[row + 1]):
+            key = self.columns[self.cols[k]]
+            got = self.have[self.cols[k]]
+            need = self.amounts[k]
+            if got < need:
+                result.append((key, need, got, need - got))
+        return result
+
+    def completable(self):
+        """Rows whose requirements are all satisfied"""
+        return [row for row in range(len(self.entries)) if self.missing_count[row] == 0]
+
+    def invalid(self):
+        """Rows with a requirement that can never be met (no item ID or amount <= 0)"""
+        return [row for row in range(len(self.entries)) if self.bad[row]]
+
+    def nearest(self, n=10):
+        """Top-N incomplete rows, closest to completion first (invalid rows excluded)"""
+        rows = [row for row in range(len(self.entries)) if self.missing_count[row] > 0 and not self.bad[row]]
+        rows.sort(key=lambda r: (-self.progress[r], self.missing_count[r], r))
+        return rows[:n]
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def describe_key(key, items):
+    """Human-readable name for a requirement column"""
+    if isinstance(key, int):
+        name = items.get(str(key), {}).get("name")
+        return f"{name} ({key})" if name else f"Item {key}"
+    return key.replace("_", " ").title()
+
+def describe_entry(entry):
+    return f"[{entry['kind']}] {entry['group']} / {entry['subgroup']} / {entry['name']}"
+
+def main():
+    parser = argparse.ArgumentParser(description="List quests and shops completable with an inventory")
+    parser.add_argument("inventory", help="Inventory JSON file")
+    parser.add_argument("--top", type=int, default=10, help="Number of nearest quests to list")
+    args = parser.parse_args()
+
+    with open(args.inventory, "r", encoding="utf-8") as f:
+        inventory = load_inventory(json.load(f))
+
+    with open(QUESTS_FILE, "r", encoding="utf-8") as f:
+        quests_data = json.load(f)
+    with open(SHOPS_FILE, "r", encoding="utf-8") as f:
+        shops_data = json.load(f)
+
+    items = {}
+    if ITEMS_FILE.exists():
+        with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+            items = json.load(f)
+
+    solver = QuestSolver(quests_data, shops_data)
+    print(f"\nLoaded {len(solver.entries)} quests/shops, {len(solver.cols)} requirements, "
+          f"{len(solver.columns)} distinct materials")
+
+    solver.set_inventory(inventory)
+
+    done = solver.completable()
+    print(f"\n✓ Completable now: {len(done)}")
+    for row in done:
+        print(f"  {describe_entry(solver.entries[row])}")
+
+    invalid = solver.invalid()
+    if invalid:
+        print(f"\n⚠️  Invalid requirements (never completable): {len(invalid)}")
+        for row in invalid:
+            print(f"  {describe_entry(solver.entries[row])}")
+
+    print(f"\n→ Nearest {args.top}:")
+    for row in solver.nearest(args.top):
+        entry = solver.entries[row]
+        print(f"  {solver.progress[row] * 100:5.1f}%  {describe_entry(entry)}")
+        for key, need, got, short in solver.deficits(row):
+            print(f"          missing {short:,} x {describe_key(key, items)} ({got:,}/{need:,})")
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+serve_data.py
+
+Local data server for USE_LOCAL_SERVER / LOCAL_PREFIX in js/config.js, plus a
+load test client. Standard library only (brotli is used when installed).
+
+Serves data/ and image/ from the repository root with the caching behavior
+of the production host:
+    - strong ETags (content hash, one per encoding) and Last-Modified
+    - conditional GET (If-None-Match / If-Modified-Since -> 304)
+    - Cache-Control: max-age (GitHub Pages sends 600)
+    - gzip/brotli negotiation via Accept-Encoding; a sibling file.gz / file.br
+      is used when present and at least as new as the source, otherwise the
+      body is compressed like publish_data.py does, off the event loop, and
+      kept in memory until the file changes (data/ is compressed at startup)
+    - single byte ranges (Range / If-Range -> 206, 416), always on the
+      identity encoding
+    - HTTP/1.1 keep-alive
+
+With --search, GET /search?q=...&desc=1&limit=50&offset=0 answers item
+searches (item_search.py) as JSON on the same server, with the same ETag /
+If-None-Match and compression handling. The engine is reloaded when the item
+data or search indices change.
+
+USAGE:
+    python serve_data.py [--port 8298] [--max-age 600] [--search] [--quiet]
+    python serve_data.py bench [--url http://127.0.0.1:8298] [--connections 16]
+                               [--duration 10] [--gzip] [--revalidate] [paths...]
+"""
+
+import sys
+import gzip
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import mimetypes
+from pathlib import Path
+from urllib.parse import unquote, urlsplit, parse_qs
+from email.utils import formatdate, parsedate_to_datetime
+
+from publish_data import brotli, compress_gzip, compress_brotli
+from item_search import ItemSearch, ITEMS_FILE, INDEX_NAME_FILE, INDEX_DESC_FILE, search_response
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = (SCRIPT_DIR / "..").resolve()
+SERVED_DIRS = ("data", "image")
+
+DEFAULT_PORT = 8298
+DEFAULT_MAX_AGE = 600
+IDLE_TIMEOUT = 15
+MAX_DISCARD = 1024 * 1024  # Largest request body drained to keep a connection alive
+MAX_HEADER_BYTES = 16384
+COMPRESSIBLE = {".json", ".js", ".css", ".html", ".txt", ".svg", ".lua"}
+SEARCH_PATH = "/search"
+SEARCH_SOURCES = (ITEMS_FILE, INDEX_NAME_FILE, INDEX_DESC_FILE)
+MIN_DYNAMIC_COMPRESS = 1024  # Search responses smaller than this are sent as-is
+DYNAMIC_GZIP_LEVEL = 6       # Per-response compression: speed over ratio
+DYNAMIC_BROTLI_QUALITY = 5
+
+STATUS_TEXT = {
+    200: "OK", 206: "Partial Content", 304: "Not Modified", 400: "Bad Request",
+    404: "Not Found", 405: "Method Not Allowed", 416: "Range Not Satisfiable",
+}
+
+# ============================================================================
+# FILE CACHE
+# ============================================================================
+
+class Representation:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+
+class CachedFile:
+    """A file's bytes and encoded variants, valid for one (mtime_ns, size)"""
+
+    def __init__(self, path, signature):
+        self.path = path
+        self.signature = signature
+        self.mtime = signature[0] / 1e9
+        self.last_modified = formatdate(int(self.mtime), usegmt=True)
+        self.content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        body = path.read_bytes()
+        self.digest = hashlib.sha256(body).hexdigest()[:20]
+        self.variants = {"identity": Representation(body, f'"{self.digest}"')}
+
+    def build_variant(self, encoding):
+        """Load or compress the representation for an encoding (blocking)"""
+        found = self.variants.get(encoding)
+        if found is not None:
+            return found
+
+        suffix = {"gzip": ".gz", "br": ".br"}[encoding]
+        sibling = self.path.with_name(self.path.name + suffix)
+        if sibling.exists() and sibling.stat().st_mtime_ns >= self.signature[0]:
+            body = sibling.read_bytes()
+        else:
+            identity = self.variants["identity"].body
+            body = compress_gzip(identity) if encoding == "gzip" else compress_brotli(identity)
+
+        found = Representation(body, f'"{self.digest}-{suffix[1:]}"')
+        self.variants[encoding] = found
+        return found
+
+class FileCache:
+    def __init__(self, root=ROOT_DIR, served_dirs=SERVED_DIRS):
+        self.root = Path(root).resolve()
+        self.served = [(self.root / d).resolve() for d in served_dirs]
+        self.files = {}
+        self.pending = {}                  # (path, signature, encoding) -> future
+
+    async def variant(self, cached, encoding):
+        """Representation for an encoding; compression runs in a worker thread"""
+        found = cached.variants.get(encoding)
+        if found is not None:
+            return found
+        key = (cached.path, cached.signature, encoding)
+        future = self.pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(None, cached.build_variant, encoding)
+            self.pending[key] = future
+            future.add_done_callback(lambda _: self.pending.pop(key, None))
+        return await future
+
+    async def warm(self, encodings):
+        """Build compressed variants for every compressible file in data/"""
+        start = time.perf_counter()
+        jobs = []
+        for path in sorted((self.root / "data").glob("*")):
+            if path.suffix in COMPRESSIBLE and path.is_file():
+                cached = self.get(path)
+                jobs.extend(self.variant(cached, encoding) for encoding in encodings)
+        await asyncio.gather(*jobs)
+        print(f"Compressed {len(jobs)} variants in {time.perf_counter() - start:.1f}s")
+
+    def resolve(self, url_path):
+        """Filesystem path for a URL path, or None if outside the served dirs"""
+        path = (self.root / unquote(url_path).lstrip("/")).resolve()
+        if not any(path.is_relative_to(d) for d in self.served):
+            return None
+        return path if path.is_file() else None
+
+    def get(self, path):
+        st = path.stat()
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self.files.get(path)
+        if cached is None or cached.signature != signature:
+            cached = CachedFile(path, signature)
+            self.files[path] = cached
+        return cached
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+class SearchEndpoint:
+    """item_search.py engine for /search, reloaded when its source files change"""
+
+    def __init__(self, sources=SEARCH_SOURCES):
+        self.sources = sources
+        self.signature = None
+        self.engine = None
+        self.lock = asyncio.Lock()
+
+    def source_signature(self):
+        return tuple((st.st_mtime_ns, st.st_size) for st in (path.stat() for path in self.sources))
+
+    async def current(self):
+        """Loaded engine; loading runs in a worker thread"""
+        async with self.lock:
+            signature = self.source_signature()
+            if signature != self.signature:
+                self.engine = await asyncio.get_running_loop().run_in_executor(None, ItemSearch.load)
+                self.signature = signature
+        return self.engine
+
+    async def warm(self):
+        start = time.perf_counter()
+        engine = await self.current()
+        print(f"Loaded item search ({len(engine.ids)} items) in {time.perf_counter() - start:.1f}s")
+
+def compress_dynamic(body, encoding):
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=DYNAMIC_GZIP_LEVEL, mtime=0)
+    return brotli.compress(body, quality=DYNAMIC_BROTLI_QUALITY)
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+def parse_accept_encoding(value):
+    """Set of acceptable encodings (q=0 excluded)"""
+    accepted = set()
+    for part in value.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name and q > 0:
+            accepted.add(name)
+    return accepted
+
+def choose_encoding(path, headers):
+    if path.suffix not in COMPRESSIBLE:
+        return "identity"
+    return negotiate_encoding(headers)
+
+def negotiate_encoding(headers):
+    accepted = parse_accept_encoding(headers.get("accept-encoding", ""))
+    if "br" in accepted and brotli is not None:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return "identity"
+
+def parse_range(value, length):
+    """(start, end) inclusive for a single 'bytes=' range, None to ignore, or 'invalid'"""
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None  # Unsupported units and multiple ranges: serve the whole file
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first == "":
+            suffix = int(last)
+            if suffix == 0:
+                return "invalid"
+            return max(0, length - suffix), length - 1
+        start = int(first)
+        end = int(last) if last else length - 1
+    except ValueError:
+        return None
+    if start >= length or end < start:
+        return "invalid"
+    return start, min(end, length - 1)
+
+def etag_matches(etag, if_none_match):
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+def not_modified(cached, rep, headers):
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(rep.etag, if_none_match)
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(cached.mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+class DataServer:
+    def __init__(self, cache, max_age=DEFAULT_MAX_AGE, quiet=False, search=None):
+        self.cache = cache
+        self.search = search
+        self.max_age = max_age
+        self.quiet = quiet
+        self.requests = 0
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                keep_alive = await self.handle_request(head, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def discard_body(self, reader, headers):
+        """
+        Read and drop a request body so the next request on the connection
+        starts at the right byte. Returns False if the connection can't be
+        reused (chunked or oversized body, or the client went away).
+        """
+        if "transfer-encoding" in headers:
+            return False
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_DISCARD:
+            return False
+        try:
+            if length:
+                await asyncio.wait_for(reader.readexactly(length), IDLE_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+            return False
+        return True
+
+    async def handle_request(self, head, reader, writer):
+        start = time.perf_counter()
+        try:
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, version = lines[0].split(" ", 2)
+            headers = {}
+            for line in lines[1:]:
+                if line:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+            reusable = await self.discard_body(reader, headers)
+        except ValueError:
+            self.send(writer, 400, {}, b"", "HEAD", False)
+            return False
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        keep_alive = keep_alive and reusable
+
+        status, out_headers, body = await self.respond(method, urlsplit(target), headers)
+        self.send(writer, status, out_headers, body, method, keep_alive)
+        self.requests += 1
+
+        if not self.quiet:
+            encoding = out_headers.get("Content-Encoding", "")
+            print(f"{method} {target} {status} {encoding} {len(body)}B "
+                  f"{(time.perf_counter() - start) * 1000:.1f}ms")
+        return keep_alive
+
+    async def respond(self, method, url, headers):
+        """(status, headers, body) for a request; url is a urlsplit() result"""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+
+        if self.search is not None and url.path == SEARCH_PATH:
+            return await self.respond_search(url.query, headers)
+
+        try:
+            path = self.cache.resolve(url.path)
+        except ValueError:
+            # e.g. an embedded NUL (%00) in the path
+            return 400, {"Content-Type": "text/plain"}, b"Bad request path\n"
+        if path is None:
+            return 404, {"Content-Type": "text/plain"}, b"Not found\n"
+        cached = self.cache.get(path)
+
+        range_header = headers.get("range")
+        if range_header and "if-range" in headers:
+            if headers["if-range"] not in (cached.variants["identity"].etag, cached.last_modified):
+                range_header = None  # Stale validator: send the whole file
+
+        encoding = "identity" if range_header else choose_encoding(path, headers)
+        rep = await self.cache.variant(cached, encoding)
+
+        out = {
+            "Content-Type": cached.content_type,
+            "ETag": rep.etag,
+            "Last-Modified": cached.last_modified,
+            "Cache-Control": f"max-age={self.max_age}",
+            "Accept-Ranges": "bytes",
+            "Access-Control-Allow-Origin": "*",
+        }
+        if path.suffix in COMPRESSIBLE:
+            out["Vary"] = "Accept-Encoding"
+        if encoding != "identity":
+            out["Content-Encoding"] = encoding
+
+        if not_modified(cached, rep, headers):
+            return 304, out, b""
+
+        if range_header:
+            length = len(rep.body)
+            byte_range = parse_range(range_header, length)
+            if byte_range == "invalid":
+                return 416, {"Content-Range": f"bytes */{length}"}, b""
+            if byte_range is not None:
+                start, end = byte_range
+                out["Content-Range"] = f"bytes {start}-{end}/{length}"
+                return 206, out, rep.body[start:end + 1]
+
+        return 200, out, rep.body
+
+    async def respond_search(self, query, headers):
+        """(status, headers, body) for a /search query"""
+        start = time.perf_counter()
+        engine = await self.search.current()
+        status, payload = search_response(engine, parse_qs(query))
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+        elapsed = (time.perf_counter() - start) * 1000
+
+        encoding = negotiate_encoding(headers) if len(body) >= MIN_DYNAMIC_COMPRESS else "identity"
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        etag = f'"{digest}{ {"gzip": "-gz", "br": "-br"}.get(encoding, "")}"'
+
+        out = {
+            "Content-Type": "application/json; charset=utf-8",
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+            "Access-Control-Allow-Origin": "*",
+            "Server-Timing": f"search;dur={elapsed:.2f}",
+        }
+        if status == 200 and etag_matches(etag, headers.get("if-none-match", "")):
+            return 304, out, b""
+        if encoding != "identity":
+            out["Content-Encoding"] = encoding
+            body = compress_dynamic(body, encoding)
+        return status, out, body
+
+    def send(self, writer, status, headers, body, method, keep_alive):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+        headers = dict(headers)
+        headers["Date"] = formatdate(usegmt=True)
+        if status != 304:
+            headers["Content-Length"] = str(len(body))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if method != "HEAD" and status != 304:
+            writer.write(body)
+
+async def serve(host, port, max_age, quiet, search=False):
+    cache = FileCache()
+    endpoint = SearchEndpoint() if search else None
+    server = DataServer(cache, max_age=max_age, quiet=quiet, search=endpoint)
+    listener = await asyncio.start_server(server.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+    print(f"Serving {', '.join(d + '/' for d in SERVED_DIRS)} from {ROOT_DIR} on http://{host}:{port}/ "
+          f"(max-age {max_age}, brotli {'on' if brotli else 'off'}, search {'on' if search else 'off'})")
+    # Keep references so the warm-up tasks aren't garbage collected mid-run
+    warm = [asyncio.create_task(cache.warm(["gzip", "br"] if brotli else ["gzip"]))]
+    if endpoint is not None:
+        warm.append(asyncio.create_task(endpoint.warm()))
+    async with listener:
+        await listener.serve_forever()
+
+# ============================================================================
+# LOAD TEST CLIENT
+# ============================================================================
+
+def default_bench_paths():
+    return sorted(f"/data/{p.name}" for p in (ROOT_DIR / "data").glob("*.json"))
+
+async def read_response(reader):
+    """(status, headers, body) for one response on a keep-alive connection"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return status, headers, body
+
+async def bench_worker(host, port, paths, deadline, gzip_enabled, revalidate, stats, offset):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            lines = [f"GET {path} HTTP/1.1", f"Host: {host}:{port}"]
+            if gzip_enabled:
+                lines.append("Accept-Encoding: br, gzip")
+            if revalidate and path in etags:
+                lines.append(f"If-None-Match: {etags[path]}")
+
+            start = time.perf_counter()
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            status, headers, body = await read_response(reader)
+            stats["latencies"].append(time.perf_counter() - start)
+            stats["bytes"] += len(body)
+            stats["status"][status] = stats["status"].get(status, 0) + 1
+            if "etag" in headers:
+                etags[path] = headers["etag"]
+    finally:
+        writer.close()
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+async def run_bench(url, connections, duration, gzip_enabled, revalidate, paths):
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or DEFAULT_PORT
+    paths = paths or default_bench_paths()
+    stats = {"latencies": [], "bytes": 0, "status": {}}
+
+    print(f"\nLoad test: {url}, {connections} connections, {duration}s, {len(paths)} paths, "
+          f"{'compressed' if gzip_enabled else 'identity'}{', revalidating' if revalidate else ''}")
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        bench_worker(host, port, paths, deadline, gzip_enabled, revalidate, stats, n)
+        for n in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(stats["latencies"])
+    count = len(latencies)
+    print(f"  Requests:    {count} ({count / elapsed:,.0f} req/s)")
+    print(f"  Transferred: {stats['bytes'] / (1024 * 1024):,.1f} MB ({stats['bytes'] / elapsed / (1024 * 1024):,.1f} MB/s)")
+    print(f"  Status:      {', '.join(f'{code}: {n}' for code, n in sorted(stats['status'].items()))}")
+    print(f"  Latency:     p50 {percentile(latencies, 50) * 1000:.2f}ms  "
+          f"p90 {percentile(latencies, 90) * 1000:.2f}ms  "
+          f"p99 {percentile(latencies, 99) * 1000:.2f}ms  "
+          f"max {(latencies[-1] if latencies else 0) * 1000:.2f}ms\n")
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        parser = argparse.ArgumentParser(prog="serve_data.py bench", description="Load test a running data server")
+        parser.add_argument("paths", nargs="*", help="URL paths (default: every data/*.json)")
+        parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+        parser.add_argument("--connections", type=int, default=16)
+        parser.add_argument("--duration", type=float, default=10)
+        parser.add_argument("--gzip", action="store_true", help="Send Accept-Encoding: br, gzip")
+        parser.add_argument("--revalidate", action="store_true", help="Send If-None-Match after the first response")
+        args = parser.parse_args(sys.argv[2:])
+        asyncio.run(run_bench(args.url, args.connections, args.duration, args.gzip, args.revalidate, args.paths))
+        return
+
+    parser = argparse.ArgumentParser(description="Serve data/ and image/ for local development")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-age", type=int, default=DEFAULT_MAX_AGE, help="Cache-Control max-age in seconds")
+    parser.add_argument("--search", action="store_true", help=f"Answer item searches at {SEARCH_PATH}")
+    parser.add_argument("--quiet", action="store_true", help="Don't log requests")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_age, args.quiet, args.search))
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,54 @@
 OSRO Quest Helper - Sprite Sheet Verification Tool
 Verifies that the sprite sheet and mapping are correct.
 
+With --pack, source icons are read from image/item_icons.pack (icon_pack.py)
+instead of image/item/*.png, so a pack-only checkout can be verified.
+Run with --profile for per-stage timings of --full.
+
 Place this script in the helpers/ directory alongside generate_item_icons.py
 """
 
 import os
 import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image
 from pathlib import Path
 
+from generate_sprite import fit_icon, paste_icon
+from instrument import span, setup_profiling
+
 # Paths relative to helpers/ directory (where this script lives)
 SCRIPT_DIR = Path(__file__).parent
 SPRITE_PATH = SCRIPT_DIR / ".." / "image" / "item_sprite.png"
 MAP_PATH = SCRIPT_DIR / ".." / "data" / "osromr_sprite_map.json"
 ICON_DIR = SCRIPT_DIR / ".." / "image" / "item"
+PACK_FILE = SCRIPT_DIR / ".." / "image" / "item_icons.pack"
+ITEMS_PATH = SCRIPT_DIR / ".." / "data" / "osromr_items.json"
+QUESTS_PATH = SCRIPT_DIR / ".." / "data" / "osromr_quests.json"
+SHOPS_PATH = SCRIPT_DIR / ".." / "data" / "osromr_shops.json"
+
+# Currencies that are really items (mirrors SPECIAL_ITEMS in js/config.js)
+SPECIAL_ITEMS = {
+    "gold": 969,
+    "credit": 40001,
+}
+
+CHUNK_SIZE = 256  # Cells per worker task
+
+def source_icon_ids(use_pack=False):
+    """Item IDs of the source icons (loose PNGs or the icon pack), or None if there is no source."""
+    if use_pack:
+        if not PACK_FILE.exists():
+            return None
+        from icon_pack import IconPack
+        with IconPack(PACK_FILE) as pack:
+            return set(pack.ids)
+    if not ICON_DIR.exists():
+        return None
+    return {int(f.stem) for f in ICON_DIR.iterdir() if f.suffix == '.png' and f.stem.isdigit()}
 
-def verify_sprite_sheet():
+def verify_sprite_sheet(use_pack=False):
     """Verify sprite sheet integrity."""
     print("🔍 OSRO Sprite Sheet Verification")
     print("=" * 60)
@@ -108,9 +141,9 @@ def verify_sprite_sheet():
     
     # Compare with source icons
     print("\n5. Comparing with source icons...")
-    if ICON_DIR.exists():
-        icon_files = [f for f in ICON_DIR.iterdir() if f.suffix == '.png']
-        icon_count = len(icon_files)
+    source_ids = source_icon_ids(use_pack)
+    if source_ids is not None:
+        icon_count = len(source_ids)
         map_count = len(sprite_map['map'])
         
         print(f"   ℹ️  Source icons: {icon_count}")
@@ -123,7 +156,7 @@ def verify_sprite_sheet():
         else:
             print(f"   ✅ Icon counts match!")
     else:
-        warnings.append(f"⚠️  Source icon directory not found: {ICON_DIR}")
+        warnings.append(f"⚠️  Source icons not found: {PACK_FILE if use_pack else ICON_DIR}")
     
     # Print summary
     print("\n" + "=" * 60)
@@ -152,9 +185,154 @@ def verify_sprite_sheet():
     
     return len(errors) == 0
 
+# ============================================================================
+# FULL VERIFICATION
+# ============================================================================
+
+_worker_sprite = None
+_worker_icon_size = None
+_worker_pack = None
+
+def _init_worker(sprite_path, icon_size, pack_path=None):
+    global _worker_sprite, _worker_icon_size, _worker_pack
+    _worker_sprite = Image.open(sprite_path).convert('RGBA')
+    _worker_icon_size = icon_size
+    if pack_path:
+        from icon_pack import IconPack
+        _worker_pack = IconPack(pack_path)  # closed when the worker process exits
+
+def _open_source_icon(item_id):
+    """Source icon for an item from the pack or image/item/, or None if missing."""
+    if _worker_pack is not None:
+        return _worker_pack.open_image(item_id)
+    icon_path = ICON_DIR / f"{item_id}.png"
+    return Image.open(icon_path) if icon_path.exists() else None
+
+def _compare_cells(cells):
+    """Compare sprite cells with their source icons. Returns [(item_id, problem)]."""
+    size = _worker_icon_size
+    problems = []
+    for item_id, col, row in cells:
+        icon = _open_source_icon(item_id)
+        if icon is None:
+            problems.append((item_id, "source icon missing"))
+            continue
+
+        # Rebuild the cell exactly as generate_sprite.py does
+        expected = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        paste_icon(expected, fit_icon(icon), 0, 0)
+
+        x, y = col * size, row * size
+        actual = _worker_sprite.crop((x, y, x + size, y + size))
+        if actual.tobytes() != expected.tobytes():
+            problems.append((item_id, f"pixels differ at cell ({col}, {row})"))
+    return problems
+
+def collect_referenced_ids():
+    """Item IDs produced or required by any quest or shop."""
+    referenced = set()
+    for path, list_key in ((QUESTS_PATH, "quests"), (SHOPS_PATH, "shops")):
+        if not path.exists():
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for group in data.get("groups", []):
+            for subgroup in group.get("subgroups", []):
+                for entry in subgroup.get(list_key, []):
+                    if entry.get("producesId"):
+                        referenced.add(entry["producesId"])
+                    for req in entry.get("requirements", []):
+                        if req.get("type") == "item" and req.get("id"):
+                            referenced.add(req["id"])
+                        elif req.get("type") in SPECIAL_ITEMS:
+                            referenced.add(SPECIAL_ITEMS[req["type"]])
+    return referenced
+
+def verify_full(workers=None, use_pack=False):
+    """Compare every sprite cell to its source icon and check cross-references."""
+    print("\n🔬 Full verification")
+    print("=" * 60)
+
+    errors = []
+    warnings = []
+
+    with span("load map"):
+        with open(MAP_PATH, 'r') as f:
+            sprite_map = json.load(f)
+        icon_size = sprite_map['iconSize']
+        cells = sorted((int(item_id), col, row) for item_id, (col, row) in sprite_map['map'].items())
+
+    with span("layout"):
+        positions = {}
+        for item_id, col, row in cells:
+            if (col, row) in positions:
+                errors.append(f"❌ Items {positions[(col, row)]} and {item_id} share cell ({col}, {row})")
+            positions[(col, row)] = item_id
+            if col >= sprite_map['iconsPerRow']:
+                errors.append(f"❌ Item {item_id} column {col} exceeds iconsPerRow")
+
+    with span("pixel compare"):
+        chunks = [cells[i:i + CHUNK_SIZE] for i in range(0, len(cells), CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(SPRITE_PATH), icon_size, str(PACK_FILE) if use_pack else None)) as pool:
+            for problems in pool.map(_compare_cells, chunks):
+                for item_id, problem in problems:
+                    errors.append(f"❌ Item {item_id}: {problem}")
+        print(f"   ℹ️  Compared {len(cells)} cells across {len(chunks)} tasks")
+
+    with span("cross-references"):
+        mapped = {item_id for item_id, _, _ in cells}
+        sources = source_icon_ids(use_pack) or set()
+
+        items = {}
+        if ITEMS_PATH.exists():
+            with open(ITEMS_PATH, 'r', encoding='utf-8') as f:
+                items = json.load(f)
+        known = {int(item_id) for item_id in items}
+
+        unmapped_sources = sorted(sources - mapped)
+        orphan_icons = sorted(mapped - known) if known else []
+        missing_icons = sorted(collect_referenced_ids() - mapped)
+
+        if unmapped_sources:
+            warnings.append(f"⚠️  {len(unmapped_sources)} source icons not in sprite: {unmapped_sources[:10]}")
+        if orphan_icons:
+            warnings.append(f"⚠️  {len(orphan_icons)} icons for IDs missing from {ITEMS_PATH.name}: {orphan_icons[:10]}")
+        if missing_icons:
+            warnings.append(f"⚠️  {len(missing_icons)} quest/shop item IDs without icons: {missing_icons[:10]}")
+
+    if errors:
+        print(f"\n❌ FAILED - {len(errors)} error(s) found:")
+        for error in errors[:50]:
+            print(f"   {error}")
+        if len(errors) > 50:
+            print(f"   ... {len(errors) - 50} more")
+    else:
+        print(f"\n✅ All {len(cells)} sprite cells match their source icons!")
+
+    if warnings:
+        print(f"\n⚠️  {len(warnings)} warning(s):")
+        for warning in warnings:
+            print(f"   {warning}")
+
+    return len(errors) == 0
+
 if __name__ == "__main__":
+    setup_profiling("verify_sprite")
+    parser = argparse.ArgumentParser(description="Verify the item sprite sheet")
+    parser.add_argument("--full", action="store_true",
+                        help="Compare every cell to its source icon and check cross-references")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --full")
+    parser.add_argument("--pack", action="store_true", help="Read source icons from the icon pack")
+    args = parser.parse_args()
+
     try:
-        success = verify_sprite_sheet()
+        success = verify_sprite_sheet(args.pack)
+        if success and args.full:
+            if args.pack and not PACK_FILE.exists():
+                print(f"\n❌ Icon pack not found: {PACK_FILE} (run icon_pack.py import)")
+                exit(1)
+            success = verify_full(args.workers, args.pack)
         exit(0 if success else 1)
     except Exception as e:
         print(f"\n❌ FATAL ERROR: {e}")
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+watch.py
+
+Watch mode for content updates: keeps the item database, search indices and
+sprite canvas in memory, polls data/ and image/item/ for changes and
+regenerates only the affected artifacts.
+
+    osromr_items.json changed   -> name/desc search indices (changed items only),
+                                   quest/shop search indices
+    osromr_quests.json changed  -> quest search index
+    osromr_shops.json changed   -> shop search index
+    image/item/*.png changed    -> sprite sheet (changed cells only), sprite map,
+                                   osromr_item_icons.json
+
+Outputs are byte-identical to the batch generators, except the sprite sheet.
+The tracked image/item_sprite.png, sprite map and icon list are only written
+with --optimize, always together so the map describes the sprite the page
+loads. Otherwise the sprite is saved with fast PNG compression to
+image/item_sprite.dev.png, with its map and icon list in
+data/osromr_sprite_map.dev.json and data/osromr_item_icons.dev.json; set
+USE_DEV_SPRITE in js/config.js to preview them (run generate_sprite.py or
+watch.py --optimize to update the real ones).
+
+On startup, artifacts whose content differs from what the current inputs
+produce are regenerated once. Files are compared by content, not mtime, so a
+fresh clone doesn't rewrite anything.
+
+USAGE:
+    python watch.py                   # poll every 0.5s until Ctrl+C
+    python watch.py --interval 1.0
+    python watch.py --optimize        # optimized sprite PNG (slower saves)
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from collections import defaultdict
+
+from PIL import Image
+
+from generate_search_index import tokenize
+from generate_quest_search_index import build_entry_index, source_hash
+from generate_sprite import ICON_SIZE, ICONS_PER_ROW, fit_icon, paste_icon
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR / ".." / "data"
+ICON_DIR = SCRIPT_DIR / ".." / "image" / "item"
+ITEMS_FILE = DATA_DIR / "osromr_items.json"
+QUESTS_FILE = DATA_DIR / "osromr_quests.json"
+SHOPS_FILE = DATA_DIR / "osromr_shops.json"
+OUTPUT_NAME = DATA_DIR / "osromr_search_index_name.json"
+OUTPUT_DESC = DATA_DIR / "osromr_search_index_desc.json"
+OUTPUT_QUESTS = DATA_DIR / "osromr_search_index_quests.json"
+OUTPUT_SHOPS = DATA_DIR / "osromr_search_index_shops.json"
+OUTPUT_ICONS = DATA_DIR / "osromr_item_icons.json"
+OUTPUT_SPRITE = SCRIPT_DIR / ".." / "image" / "item_sprite.png"
+OUTPUT_SPRITE_DEV = SCRIPT_DIR / ".." / "image" / "item_sprite.dev.png"
+OUTPUT_MAP = DATA_DIR / "osromr_sprite_map.json"
+OUTPUT_ICONS_DEV = DATA_DIR / "osromr_item_icons.dev.json"
+OUTPUT_MAP_DEV = DATA_DIR / "osromr_sprite_map.dev.json"
+
+INPUTS = {"items": ITEMS_FILE, "quests": QUESTS_FILE, "shops": SHOPS_FILE}
+
+def file_signature(path):
+    """(mtime_ns, size) or None if the file is missing"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def scan_icons(icon_dir=ICON_DIR):
+    """{item_id: (mtime_ns, size)} for numeric PNGs"""
+    icons = {}
+    with os.scandir(icon_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith(".png") and name[:-4].isdigit():
+                st = entry.stat()
+                icons[int(name[:-4])] = (st.st_mtime_ns, st.st_size)
+    return icons
+
+def write_json(path, data):
+    """
+    Compact JSON, written atomically so the preview never reads a partial
+    file. Skipped if the file already has this content; returns True if written.
+    """
+    text = json.dumps(data, separators=(',', ':'))
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    tmp.replace(path)
+    return True
+
+# ============================================================================
+# ITEM SEARCH INDICES
+# ============================================================================
+
+class TokenIndex:
+    """Inverted index for one item field, updatable one item at a time"""
+
+    def __init__(self, field):
+        self.field = field
+        self.tokens = {}                   # item_id -> token list (in text order)
+        self.postings = defaultdict(set)   # token -> item IDs
+
+    def set_item(self, item_id, item):
+        self.remove_item(item_id)
+        tokens = tokenize(item.get(self.field, ""))
+        self.tokens[item_id] = tokens
+        for token in tokens:
+            self.postings[token].add(item_id)
+
+    def remove_item(self, item_id):
+        for token in set(self.tokens.pop(item_id, ())):
+            ids = self.postings[token]
+            ids.discard(item_id)
+            if not ids:
+                del self.postings[token]
+
+    def export(self, order):
+        """Same dict (and key order) build_name_index/build_desc_index produce"""
+        terms = dict.fromkeys(t for item_id in order for t in self.tokens[item_id])
+        return {term: sorted(self.postings[term]) for term in terms}
+
+# ============================================================================
+# WARM STATE
+# ============================================================================
+
+class WarmState:
+    def __init__(self, optimize=False):
+        self.optimize = optimize
+        # Sprite, map and icon list are always written as one set
+        if optimize:
+            self.sprite_outputs = (OUTPUT_SPRITE, OUTPUT_MAP, OUTPUT_ICONS)
+        else:
+            self.sprite_outputs = (OUTPUT_SPRITE_DEV, OUTPUT_MAP_DEV, OUTPUT_ICONS_DEV)
+        self.items = {}
+        self.order = []                    # item IDs in file order
+        self.name_index = TokenIndex("name")
+        self.desc_index = TokenIndex("desc")
+        self.quests = None
+        self.shops = None
+        self.quests_source = None
+        self.shops_source = None
+
+        self.icon_sigs = {}                # item_id -> (mtime_ns, size)
+        self.icons = {}                    # item_id -> fitted PIL image
+        self.layout = []                   # sorted item IDs, one per sprite cell
+        self.sprite = None
+
+    # ------------------------------------------------------------------------
+    # Data files
+    # ------------------------------------------------------------------------
+
+    def load_items(self):
+        """Reload items, retokenizing only changed entries; returns changed count"""
+        with open(ITEMS_FILE, "r", encoding="utf-8") as f:
+            items = json.load(f)
+
+        changed = 0
+        for item_id in self.items.keys() - items.keys():
+            self.name_index.remove_item(int(item_id))
+            self.desc_index.remove_item(int(item_id))
+            changed += 1
+        for item_id, item in items.items():
+            if self.items.get(item_id) != item:
+                self.name_index.set_item(int(item_id), item)
+                self.desc_index.set_item(int(item_id), item)
+                changed += 1
+
+        self.items = items
+        self.order = [int(item_id) for item_id in items]
+        return changed
+
+    def load_quests(self):
+        raw = QUESTS_FILE.read_bytes()
+        self.quests = json.loads(raw)
+        self.quests_source = source_hash(raw)
+
+    def load_shops(self):
+        raw = SHOPS_FILE.read_bytes()
+        self.shops = json.loads(raw)
+        self.shops_source = source_hash(raw)
+
+    def write_item_indices(self):
+        name = write_json(OUTPUT_NAME, self.name_index.export(self.order))
+        desc = write_json(OUTPUT_DESC, self.desc_index.export(self.order))
+        return name or desc
+
+    def write_quest_index(self):
+        return write_json(OUTPUT_QUESTS, build_entry_index(self.quests, "quests", self.items, self.quests_source))
+
+    def write_shop_index(self):
+        return write_json(OUTPUT_SHOPS, build_entry_index(self.shops, "shops", self.items, self.shops_source))
+
+    # ------------------------------------------------------------------------
+    # Icons / sprite
+    # ------------------------------------------------------------------------
+
+    def _load_icon(self, item_id):
+        icon = Image.open(ICON_DIR / f"{item_id}.png")
+        icon = fit_icon(icon)
+        icon.load()
+        return icon
+
+    def update_icons(self, sigs):
+        """Apply a new icon scan; returns (added, changed, removed) ID lists"""
+        added = sorted(sigs.keys() - self.icon_sigs.keys())
+        removed = sorted(self.icon_sigs.keys() - sigs.keys())
+        changed = sorted(i for i in sigs.keys() & self.icon_sigs.keys() if sigs[i] != self.icon_sigs[i])
+
+        sigs = dict(sigs)
+        failed = set()
+        for item_id in removed:
+            self.icons.pop(item_id, None)
+        for item_id in added + changed:
+            try:
+                self.icons[item_id] = self._load_icon(item_id)
+            except Exception as e:
+                # Half-written file: keep the old state so the next poll retries
+                print(f"⚠️  Icon {item_id}: {e}")
+                failed.add(item_id)
+                if item_id in self.icon_sigs:
+                    sigs[item_id] = self.icon_sigs[item_id]
+                else:
+                    del sigs[item_id]
+
+        self.icon_sigs = sigs
+        added = [i for i in added if i not in failed]
+        changed = [i for i in changed if i not in failed]
+        return added, changed, removed
+
+    def repaint_sprite(self, changed_ids=()):
+        """Bring the canvas in line with the current icon set; returns repainted cell count"""
+        layout = sorted(self.icons)
+        rows = max(1, (len(layout) + ICONS_PER_ROW - 1) // ICONS_PER_ROW)
+        size = (ICONS_PER_ROW * ICON_SIZE, rows * ICON_SIZE)
+
+        if self.sprite is None:
+            self.sprite = Image.new('RGBA', size, (0, 0, 0, 0))
+            first = 0
+        else:
+            # Cells from the first layout difference on have shifted
+            first = next((i for i, (a, b) in enumerate(zip(self.layout, layout)) if a != b),
+                         min(len(self.layout), len(layout)))
+            if self.sprite.size != size:
+                canvas = Image.new('RGBA', size, (0, 0, 0, 0))
+                canvas.paste(self.sprite.crop((0, 0, size[0], min(size[1], self.sprite.size[1]))), (0, 0))
+                self.sprite = canvas
+
+        position = {item_id: idx for idx, item_id in enumerate(layout)}
+        cells = set(range(first, max(len(layout), len(self.layout))))
+        cells.update(position[i] for i in changed_ids if i in position and position[i] < first)
+
+        blank = Image.new('RGBA', (ICON_SIZE, ICON_SIZE), (0, 0, 0, 0))
+        for idx in cells:
+            x = (idx % ICONS_PER_ROW) * ICON_SIZE
+            y = (idx // ICONS_PER_ROW) * ICON_SIZE
+            if y >= size[1]:
+                continue
+            self.sprite.paste(blank, (x, y))
+            if idx < len(layout):
+                paste_icon(self.sprite, self.icons[layout[idx]], x, y)
+
+        self.layout = layout
+        return len(cells)
+
+    def sprite_map(self):
+        """Sprite map for the current layout, as generate_sprite.py writes it"""
+        return {
+            "version": 1,
+            "iconSize": ICON_SIZE,
+            "iconsPerRow": ICONS_PER_ROW,
+            "totalIcons": len(self.layout),
+            "spriteWidth": self.sprite.size[0],
+            "spriteHeight": self.sprite.size[1],
+            "map": {str(item_id): [idx % ICONS_PER_ROW, idx // ICONS_PER_ROW]
+                    for idx, item_id in enumerate(self.layout)},
+        }
+
+    def sprite_outdated(self):
+        """True if the sprite map, icon list or sprite pixels on disk differ from the canvas"""
+        sprite_path, map_path, icons_path = self.sprite_outputs
+        try:
+            with open(map_path, "r", encoding="utf-8") as f:
+                if json.load(f) != self.sprite_map():
+                    return True
+            with open(icons_path, "r", encoding="utf-8") as f:
+                if json.load(f) != self.layout:
+                    return True
+            with Image.open(sprite_path) as img:
+                on_disk = img.convert('RGBA')
+        except (OSError, json.JSONDecodeError):
+            return True
+        return on_disk.size != self.sprite.size or on_disk.tobytes() != self.sprite.tobytes()
+
+    def write_sprite(self, layout_changed):
+        """Save the canvas with its map and icon list (tracked set with --optimize, dev set otherwise)"""
+        target, map_path, icons_path = self.sprite_outputs
+        tmp = target.with_suffix(".png.tmp")
+        if self.optimize:
+            self.sprite.save(tmp, 'PNG', optimize=True)
+        else:
+            self.sprite.save(tmp, 'PNG', compress_level=1)
+        tmp.replace(target)
+
+        # A missing dev map needs writing even if the layout didn't change
+        if layout_changed or not map_path.exists() or not icons_path.exists():
+            write_json(icons_path, self.layout)
+            write_json(map_path, self.sprite_map())
+        return target
+
+# ============================================================================
+# WATCH LOOP
+# ============================================================================
+
+def report(label, start):
+    print(f"✓ {time.strftime('%H:%M:%S')} {label} ({(time.perf_counter() - start) * 1000:.0f}ms)")
+
+def warm_up(state):
+    """Load everything, regenerating artifacts whose content is out of date"""
+    start = time.perf_counter()
+    state.load_items()
+    state.load_quests()
+    state.load_shops()
+    sigs = scan_icons()
+    state.update_icons(sigs)
+    state.repaint_sprite()
+    print(f"Loaded {len(state.items)} items, {len(state.icons)} icons "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    if state.write_item_indices():
+        print("  regenerated item search indices (out of date)")
+    if state.write_quest_index():
+        print("  regenerated quest search index (out of date)")
+    if state.write_shop_index():
+        print("  regenerated shop search index (out of date)")
+    if state.icons and state.sprite_outdated():
+        target = state.write_sprite(layout_changed=True)
+        print(f"  regenerated sprite sheet (out of date) → {target.name}")
+
+def poll_once(state, sigs):
+    """Check inputs once and regenerate what changed; returns updated signatures"""
+    current = {name: file_signature(path) for name, path in INPUTS.items()}
+    changed = {name for name in INPUTS if current[name] != sigs.get(name) and current[name] is not None}
+
+    if changed:
+        start = time.perf_counter()
+        try:
+            if "items" in changed:
+                count = state.load_items()
+            if "quests" in changed:
+                state.load_quests()
+            if "shops" in changed:
+                state.load_shops()
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            # Editor mid-save; keep the old signatures so the next poll retries
+            print(f"⚠️  {', '.join(sorted(changed))}: {e} - waiting for a complete file")
+            current = {name: sigs.get(name) if name in changed else sig for name, sig in current.items()}
+            changed = set()
+
+        if "items" in changed:
+            state.write_item_indices()
+        if changed & {"items", "quests"}:
+            state.write_quest_index()
+        if changed & {"items", "shops"}:
+            state.write_shop_index()
+        if changed:
+            detail = f", {count} items changed" if "items" in changed else ""
+            report(f"{', '.join(sorted(changed))}{detail}", start)
+
+    icon_sigs = scan_icons()
+    if icon_sigs != state.icon_sigs:
+        # A failed icon load leaves its old signature behind, so this retries
+        start = time.perf_counter()
+        added, modified, removed = state.update_icons(icon_sigs)
+        if added or modified or removed:
+            cells = state.repaint_sprite(modified)
+            target = state.write_sprite(layout_changed=bool(added or removed))
+            report(f"icons +{len(added)} ~{len(modified)} -{len(removed)}, {cells} cells repainted → {target.name}", start)
+
+    sigs.update(current)
+    return sigs
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate artifacts as data/ and image/item/ change")
+    parser.add_argument("--interval", type=float, default=0.5, help="Poll interval in seconds")
+    parser.add_argument("--optimize", action="store_true", help="Save the sprite with optimize=True")
+    args = parser.parse_args()
+
+    for path in list(INPUTS.values()) + [ICON_DIR]:
+        if not path.exists():
+            print(f"Error: Not found: {path}")
+            sys.exit(1)
+
+    state = WarmState(optimize=args.optimize)
+    sigs = {name: file_signature(path) for name, path in INPUTS.items()}
+    warm_up(state)
+
+    print(f"\n👀 Watching {DATA_DIR.resolve()} and {ICON_DIR.resolve()} (Ctrl+C to stop)\n")
+    try:
+        while True:
+            time.sleep(args.interval)
+            poll_once(state, sigs)
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,26 @@ const AUTO_IMPORT_URLS = Object.fromEntries(
   Object.entries(FILES).map(([k, f]) => [k, prefix + f])
 );
 
+// Content-hashed publish output (helpers/publish_data.py). When enabled, the
+// page reads publish/manifest.json and loads data and the sprite from their
+// hashed, immutable URLs; if the manifest is missing or for another VERSION
+// the plain URLs above are used. GitHub Pages serves this repository, so
+// publish/ is deployed by committing it: run helpers/publish_data.py, then
+// helpers/generate_precache_manifest.py (with this flag on, so the offline
+// cache holds the hashed files), and commit publish/ with the VERSION bump.
+const USE_PUBLISH_MANIFEST = false;
+const PUBLISH_PREFIX = "https://torrq.github.io/osro-quest-helper/publish/";
+
+// Local preview of helpers/watch.py (run without --optimize): load the dev
+// sprite and the sprite map / icon list written with it instead of the
+// tracked ones, so newly added icons show up with the right artwork.
+const USE_DEV_SPRITE = false;
+const DEV_FILES = {
+  icons:     "osromr_item_icons.dev.json",
+  spriteMap: "osromr_sprite_map.dev.json",
+};
+const DEV_SPRITE = "image/item_sprite.dev.png";
+
 // === SPECIAL ITEM IDS ===
 
 // These items are used as currency in the game
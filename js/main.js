@@ -244,22 +244,26 @@ window.initState = {
   userHasEditedValues: false
 };
 
+// Data URLs in use; replaced by hashed publish URLs in resolveDataUrls()
+let DATA_URLS = AUTO_IMPORT_URLS;
+
 function initializeData() {
   if (!AUTO_IMPORT_ON_FIRST_LOAD) {
     render();
     return;
   }
 
-  Promise.all([
-    fetchJSON(AUTO_IMPORT_URLS.items),
-    fetchJSON(AUTO_IMPORT_URLS.quests),
-    fetchJSON(AUTO_IMPORT_URLS.shops),
-    fetchJSON(AUTO_IMPORT_URLS.icons),
-    fetchJSON(AUTO_IMPORT_URLS.searchIndexName),
-    fetchJSON(AUTO_IMPORT_URLS.searchIndexDesc),
-    fetchJSON(AUTO_IMPORT_URLS.newItems),
-    fetchJSON(AUTO_IMPORT_URLS.spriteMap)
-  ])
+  resolveDataUrls()
+    .then(() => Promise.all([
+      fetchJSON(DATA_URLS.items),
+      fetchJSON(DATA_URLS.quests),
+      fetchJSON(DATA_URLS.shops),
+      fetchJSON(DATA_URLS.icons),
+      fetchJSON(DATA_URLS.searchIndexName),
+      fetchJSON(DATA_URLS.searchIndexDesc),
+      fetchJSON(DATA_URLS.newItems),
+      fetchJSON(DATA_URLS.spriteMap)
+    ]))
     .then(([items, quests, shops, icons, searchName, searchDesc, newItems, spriteMap]) => {
       loadItems(items);
       loadQuests(quests);
@@ -293,6 +297,42 @@ function initializeData() {
     .catch(handleInitError);
 }
 
+/**
+ * Switch DATA_URLS and the sprite to the watch.py dev set (USE_DEV_SPRITE) or
+ * to the content-hashed files listed in publish/manifest.json. The manifest
+ * is revalidated on every load; the files it names never change, so they can
+ * be cached forever.
+ */
+function resolveDataUrls() {
+  if (USE_DEV_SPRITE) {
+    DATA_URLS = { ...AUTO_IMPORT_URLS };
+    for (const [k, f] of Object.entries(DEV_FILES)) DATA_URLS[k] = prefix + f;
+    const sprite = new URL(DEV_SPRITE, USE_LOCAL_SERVER ? new URL("..", LOCAL_PREFIX) : document.baseURI).href;
+    document.documentElement.style.setProperty("--item-sprite", `url("${sprite}")`);
+    console.log("[Init] Using the watch.py dev sprite and sprite map");
+    return Promise.resolve();
+  }
+  if (USE_LOCAL_SERVER || !USE_PUBLISH_MANIFEST) return Promise.resolve();
+
+  return fetch(PUBLISH_PREFIX + "manifest.json", { cache: "no-cache" })
+    .then(r => r.ok ? r.json() : null)
+    .then(manifest => {
+      if (!manifest || manifest.version !== VERSION) {
+        console.warn(`[Init] No publish manifest for v${VERSION}, using plain data URLs`);
+        return;
+      }
+      const files = manifest.files || {};
+      DATA_URLS = Object.fromEntries(
+        Object.entries(AUTO_IMPORT_URLS).map(([k, url]) => [k, files[k] ? PUBLISH_PREFIX + files[k].file : url])
+      );
+      if (files.sprite) {
+        document.documentElement.style.setProperty("--item-sprite", `url("${PUBLISH_PREFIX + files.sprite.file}")`);
+      }
+      console.log(`[Init] Using hashed data URLs from publish manifest v${manifest.version}`);
+    })
+    .catch(err => console.warn("[Init] Publish manifest unavailable, using plain data URLs:", err));
+}
+
 function fetchJSON(url) {
   return fetch(url).then(r => r.ok ? r.json() : null);
 }
@@ -334,7 +374,7 @@ function loadItemValuesFromStorage() {
 }
 
 function loadItemValuesFromRemote() {
-  return fetchJSON(AUTO_IMPORT_URLS.values)
+  return fetchJSON(DATA_URLS.values)
     .then(values => {
       if (values) {
         // Check if user has already edited values during initialization
@@ -1434,8 +1474,24 @@ document.addEventListener("DOMContentLoaded", () => {
   initSettings();
   initializeData();
   initSecretEditorToggle();
+  registerServiceWorker();
 });
 
+// ===== OFFLINE PRECACHE =====
+
+/**
+ * Register the precache service worker. Each release stamps sw.js with its
+ * VERSION and manifest hash, so the browser's update check (which bypasses
+ * the HTTP cache) installs a fresh worker that downloads only changed assets.
+ */
+function registerServiceWorker() {
+  if (USE_LOCAL_SERVER || !('serviceWorker' in navigator)) return;
+
+  navigator.serviceWorker.register('sw.js', { updateViaCache: 'none' })
+    .then(() => console.log(`[SW] Registered for v${VERSION}`))
+    .catch(err => console.warn('[SW] Registration failed:', err));
+}
+
 // ===== SHARED VIEWER HEADER =====
 
 function renderViewerHeader(itemId, item, { meta = '', loc = '', showExtLinks = false, bound = false } = {}) {
@@ -0,0 +1,150 @@
+// ============================================================================
+// OSRO Quest Helper - Offline Precache Service Worker
+// ============================================================================
+//
+// helpers/generate_precache_manifest.py writes precache-manifest.json and
+// stamps its VERSION and hash into this file, so every release changes the
+// worker's bytes and the browser's update check installs a new worker. The
+// new worker fills its own versioned cache (copying unchanged assets from the
+// previous one by hash) while the old worker keeps serving from the old cache.
+//
+// Data and images are served cache-first. The app shell (pages, scripts and
+// styles) and publish/manifest.json, which names the current hashed data
+// files, are served network-first, falling back to the cache when offline.
+
+// Stamped by helpers/generate_precache_manifest.py - do not edit by hand
+const PRECACHE_VERSION = 115;
+const MANIFEST_HASH = '230ad0481fee';
+
+const CACHE_PREFIX = 'osro-precache-';
+const CACHE_NAME = `${CACHE_PREFIX}${PRECACHE_VERSION}-${MANIFEST_HASH}`;
+const MANIFEST_URL = 'precache-manifest.json';
+const HASH_HEADER = 'X-Precache-Hash';
+const SHELL_RE = /\.(html|js|css)$/;
+const PUBLISH_MANIFEST_RE = /\/publish\/manifest\.json$/;
+
+let manifestUrls = null;
+
+function assetUrl(rel) {
+  return new URL(rel, self.registration.scope).href;
+}
+
+async function sha256Prefix(buffer) {
+  const digest = await crypto.subtle.digest('SHA-256', buffer);
+  return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('').slice(0, MANIFEST_HASH.length);
+}
+
+async function fetchManifest() {
+  const res = await fetch(MANIFEST_URL, { cache: 'no-store' });
+  if (!res.ok) throw new Error(`Manifest fetch failed: ${res.status}`);
+  const buffer = await res.arrayBuffer();
+  // A deploy in progress can serve a manifest from another release; fail the
+  // install so the browser retries later instead of caching a mixed release
+  const hash = await sha256Prefix(buffer);
+  if (hash !== MANIFEST_HASH) throw new Error(`Manifest hash ${hash} does not match worker (${MANIFEST_HASH})`);
+  return JSON.parse(new TextDecoder().decode(buffer));
+}
+
+async function loadCachedManifest() {
+  const cache = await caches.open(CACHE_NAME);
+  const res = await cache.match(assetUrl(MANIFEST_URL));
+  return res ? res.json() : null;
+}
+
+async function findPrevious(url, hash) {
+  for (const name of await caches.keys()) {
+    if (!name.startsWith(CACHE_PREFIX) || name === CACHE_NAME) continue;
+    const res = await (await caches.open(name)).match(url);
+    if (res && res.headers.get(HASH_HEADER) === hash) return res;
+  }
+  return null;
+}
+
+async function precache() {
+  const manifest = await fetchManifest();
+  const cache = await caches.open(CACHE_NAME);
+  let fetched = 0;
+
+  await Promise.all(Object.entries(manifest.assets).map(async ([rel, { hash }]) => {
+    const url = assetUrl(rel);
+    const cached = await cache.match(url);
+    if (cached && cached.headers.get(HASH_HEADER) === hash) return;
+
+    const previous = await findPrevious(url, hash);
+    if (previous) {
+      await cache.put(url, previous);
+      return;
+    }
+
+    const res = await fetch(url, { cache: 'no-cache' });
+    if (!res.ok) throw new Error(`Precache of ${rel} failed: ${res.status}`);
+
+    const headers = new Headers(res.headers);
+    headers.set(HASH_HEADER, hash);
+    await cache.put(url, new Response(await res.blob(), { status: 200, headers }));
+    fetched++;
+  }));
+
+  // Store the manifest last so a failed install never leaves a partial release marked current
+  await cache.put(assetUrl(MANIFEST_URL), new Response(JSON.stringify(manifest), {
+    headers: { 'Content-Type': 'application/json' }
+  }));
+  console.log(`[SW] Precached VERSION ${manifest.version}: ${fetched} downloaded of ${Object.keys(manifest.assets).length} assets`);
+}
+
+async function pruneCaches() {
+  const names = await caches.keys();
+  await Promise.all(names.filter(name => name.startsWith(CACHE_PREFIX) && name !== CACHE_NAME)
+    .map(name => caches.delete(name)));
+}
+
+async function getManifestUrls() {
+  if (!manifestUrls) {
+    const manifest = await loadCachedManifest();
+    manifestUrls = new Set(manifest ? Object.keys(manifest.assets).map(assetUrl) : []);
+  }
+  return manifestUrls;
+}
+
+async function fromCache(key) {
+  const urls = await getManifestUrls();
+  if (!urls.has(key)) return null;
+  return caches.match(key, { cacheName: CACHE_NAME });
+}
+
+async function respond(request) {
+  const url = new URL(request.url);
+  url.search = '';
+  url.hash = '';
+
+  // Page navigations (including ?quest=/?item= links) fall back to the cached index.html
+  const key = request.mode === 'navigate' ? assetUrl('index.html') : url.href;
+
+  if (request.mode === 'navigate' || SHELL_RE.test(url.pathname) || PUBLISH_MANIFEST_RE.test(url.pathname)) {
+    try {
+      // Navigation requests can't be re-initialised; the browser revalidates them itself
+      return await fetch(request.mode === 'navigate' ? request : new Request(request, { cache: 'no-cache' }));
+    } catch (err) {
+      const cached = await fromCache(key);
+      if (cached) return cached;
+      throw err;
+    }
+  }
+
+  const cached = await fromCache(key);
+  return cached || fetch(request);
+}
+
+self.addEventListener('install', event => {
+  event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil(pruneCaches().then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+  if (event.request.method !== 'GET') return;
+  if (!event.request.url.startsWith(self.registration.scope)) return;
+  event.respondWith(respond(event.request));
+});